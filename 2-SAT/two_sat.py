@@ -14,11 +14,14 @@ from typing import List, Tuple, Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
 import read_dimacs as dimacs
 from stats import TwoSatStats, StatsAgent
+from budget import Budget, add_budget_arguments, budget_from_arguments
 
 # global instance of the stats agent (const)
 STATS = TwoSatStats()
 # global instance of assignments since solve_input should only return satisfiablity and we somehow need the assignments anyway
 global_assignments = []
+# limits the work of the current call of solve_input
+BUDGET = Budget()
 
 def main():
     parser = argparse.ArgumentParser()
@@ -43,33 +46,47 @@ def main():
         default = False,
         help = 'Show the stats (memory usage, time).'
     )
+    parser.add_argument(
+        '--trace-memory',
+        dest = 'trace_memory',
+        action = 'store_true',
+        default = False,
+        help = 'Measure the memory with tracemalloc instead of the RSS (a lot slower) and show where it was allocated.'
+    )
+    add_budget_arguments(parser)
     args = parser.parse_args()
     global STATS, global_assignments
+    if args.trace_memory:
+        STATS.trace_allocations()
 
-    satisfiable = solve_input(args.input)
+    satisfiable = solve_input(args.input, budget_from_arguments(args))
     # print results
     if satisfiable:
         print("Satisfiable")
         if args.show_assignments:
             print(f"Assignments:\n{global_assignments}")
+    elif satisfiable is None:
+        print("Unknown")
     else:
         print("Unsatisfiable")
     # print stats
     if args.show_stats:
         print(STATS)
 
-def solve_input(input: str) -> bool:
+def solve_input(input: str, budget: Optional[Budget] = None) -> Optional[bool]:
     """Solves SAT for a given input file with a CNF in dimacs and measures stats.
 
     Parameters
     ----------
     input : str
         The dimacs encoded file.
+    budget : Optional[Budget], optional
+        Limits the work of the solver, by default unlimited
 
     Returns
     -------
-    bool
-        True if formula is satisfiable, False otherwise.
+    Optional[bool]
+        True if formula is satisfiable, False otherwise. None if the budget was exhausted.
     """
 
     with open(input, "r") as new_f:
@@ -81,8 +98,10 @@ def solve_input(input: str) -> bool:
             sys.exit(1)
     
     # prepare measuring of stats
-    global STATS, global_assignments
+    global STATS, global_assignments, BUDGET
+    BUDGET = budget if budget is not None else Budget()
     STATS.start()
+    BUDGET.start()
     # now finally do the thing
     satisfiable, assignments = two_sat(formula)
     # stop measuring of stats
@@ -90,7 +109,7 @@ def solve_input(input: str) -> bool:
     global_assignments = assignments
     return satisfiable
 
-def two_sat(f: List[List[int]]) -> (bool, List[Tuple[int, bool]]):
+def two_sat(f: List[List[int]]) -> (Optional[bool], List[Tuple[int, bool]]):
     """Applies the 2-SAT algorithm to the given formula f.
 
     Parameters
@@ -100,28 +119,33 @@ def two_sat(f: List[List[int]]) -> (bool, List[Tuple[int, bool]]):
 
     Returns
     -------
-    bool, List[Tuple[int, bool]]
-        True plus fulfilling assignment if f is satisfiable, False and None if not.
+    Optional[bool], List[Tuple[int, bool]]
+        True plus fulfilling assignment if f is satisfiable, False and None if not. None and None if the budget was exhausted.
     """
 
+    global STATS, BUDGET
     # preprocessing, initates assignments
     f, assignments = unit_propagation(f)  # unit propagation
     if empty_set_contained(f):
+        STATS.conflict()
         return False, None
 
     # loop
-    global STATS
     while var := get_var(f):  # while vars(f) != empty set
+        if BUDGET.exhausted(STATS):
+            return None, None   # we have to stop, nobody knows
         # decision time - gotta count it
         STATS.decide()
         # assign 0 to the var and propagate
         new_f, new_assignments = unit_propagation(apply_assignment(f, (var, False)))
         if empty_set_contained(new_f):  # empty set is contained
+            STATS.conflict()
             # decision time - gotta count it
             STATS.decide()
             # assign 1 to the var
             new_f, new_assignments = unit_propagation(apply_assignment(f, (var, True)))
             if empty_set_contained(new_f):
+                STATS.conflict()
                 return False, None
         f = new_f
         for assignment in new_assignments:
@@ -1,28 +1,26 @@
 #!/bin/python3
 # SHEBANG
 
-import os, sys, argparse
-from copy import deepcopy, copy
-from typing import List, Tuple, Optional
-from collections import deque
+import os, sys, argparse, json
+from typing import List, Tuple, Optional, Iterable
 import random
 
 # add the 2-SAT directory to the path so i can import read_dimacs and more already existing features from it
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
 import read_dimacs as dimacs    # no vscode, you're wrong. This is not an unresolved import. fucker.
 from stats import CDCLStats, StatsAgent
-from data_structures import Clause, Formula, Assignment, Assignments, Trail, VSIDS
+from formula_status import FormulaStatus
+from budget import Budget, add_budget_arguments, budget_from_arguments
+from data_structures import Formula, Assignments, Trail, VSIDS, TRUE, FALSE, UNASSIGNED, HEADER_SIZE, NO_REASON
+from clause_database import ClauseDatabase
+from clause_sharing import ClauseExchange
+from preprocessing import Preprocessor, extend_model
+from restarts import create_restart_policy
+from proof import DRATWriter
 import config
 
-# global variables
-original_formula: Formula
-assignments: Assignments
-vsids: VSIDS
-trail = Trail()
-restart_counter = 0
-conflict_counter_restarts = 0
-# stats
-STATS = CDCLStats()
+# the methods that are timed when the solver is profiled
+PROFILED_PHASES = ["preprocess", "probe", "propagate", "analyse_conflict", "learn", "backtrack_to", "select_variable", "apply_restart_policy", "reduce_clause_database"]
 
 def main():
     parser = argparse.ArgumentParser()
@@ -47,24 +45,76 @@ def main():
         default = False,
         help = 'Show the stats (memory usage, time).'
     )
+    parser.add_argument(
+        '--proof',
+        dest = 'proof',
+        metavar = 'FILE',
+        type = str,
+        default = None,
+        help = 'Write a DRAT proof to FILE, it certifies the result if the formula is unsatisfiable.'
+    )
+    parser.add_argument(
+        '--binary-proof',
+        dest = 'binary_proof',
+        action = 'store_true',
+        default = False,
+        help = 'Write the proof in binary DRAT instead of text DRAT.'
+    )
+    parser.add_argument(
+        '--profile',
+        dest = 'profile',
+        action = 'store_true',
+        default = False,
+        help = 'Measure the time spent in the phases of the solver (propagation, conflict analysis, ...) and show it.'
+    )
+    parser.add_argument(
+        '--profile-dump',
+        dest = 'profile_dump',
+        metavar = 'FILE',
+        type = str,
+        default = None,
+        help = 'Measure the time spent in the phases of the solver and write it to FILE as json.'
+    )
+    parser.add_argument(
+        '--trace-memory',
+        dest = 'trace_memory',
+        action = 'store_true',
+        default = False,
+        help = 'Measure the memory with tracemalloc instead of the RSS (a lot slower) and show where it was allocated.'
+    )
+    add_budget_arguments(parser)
     args = parser.parse_args()
 
-    global STATS
     # solve the thing
-    satisfiable = solve_input(args.input)
+    proof = DRATWriter(args.proof, binary = args.binary_proof) if args.proof is not None else None
+    solver = load_input(args.input, proof = proof)
+    if args.trace_memory:
+        solver.stats.trace_allocations()
+    if args.profile or args.profile_dump is not None:
+        solver.profile()
+    satisfiable = solver.solve(budget = budget_from_arguments(args))
+    if proof is not None:
+        proof.close()
     # print results
     if satisfiable:
         print("Satisfiable")
         if args.show_assignments:
-            print(f"Assignments:\n{assignments}")
+            print(f"Assignments:\n{solver.assignments}")
+    elif satisfiable is None:
+        print("Unknown")
     else:
         print("Unsatisfiable")
     # print stats
     if args.show_stats:
-        print(STATS)
+        print(solver.stats)
+    elif args.profile:
+        print(solver.stats.phase_times.format_value)
+    if args.profile_dump is not None:
+        with open(args.profile_dump, "w") as f:
+            json.dump(solver.stats.phase_times.value, f, indent = 4)
 
 def override_config(new_config):
-    """Overrides the  config.
+    """Overrides the default config that is used by solvers created with load_input and solve_input.
 
     Parameters
     ----------
@@ -75,730 +125,1247 @@ def override_config(new_config):
     global config
     config = new_config
 
-def solve_input(input: str) -> bool:
-    """Solves SAT for a given input file with a CNF in dimacs and measures stats.
+def load_input(input: str, solver_config = None, proof: Optional[DRATWriter] = None) -> 'CDCLSolver':
+    """Creates a solver for a given input file with a CNF in dimacs.
 
     Parameters
     ----------
     input : str
         The dimacs encoded file.
+    solver_config : module, optional
+        The config of the solver (any object with the attributes of config.py), by default the default config
+    proof : Optional[DRATWriter], optional
+        Where the solver writes a DRAT proof, by default None
 
     Returns
     -------
-    bool
-        True if formula is satisfiable, False otherwise.
+    CDCLSolver
+        The solver for the formula in the file.
     """
 
     with open(input, "r") as f:
         lines = f.readlines()
         formula = dimacs.read_cnf(lines)    # still in form List[List[int]]
         n = dimacs.get_variables_in_dimacs(lines)   # number of variables
-    global original_formula, assignments, vsids, STATS, trail, restart_counter, conflict_counter_restarts
-    # initiate stuff
-    trail = Trail()
-    restart_counter = 0
-    conflict_counter_restarts = 0
-    STATS = CDCLStats()
-    # convert to form Formula
-    clauses = [Clause(clause) for clause in formula]
-    original_formula = Formula(clauses)
-    # instantiate assignments and vsids
-    assignments = Assignments(n)
-    vsids = VSIDS(n)
-    # start measuring stuff
-    STATS.start()
-    # do the thing
-    satisfiable = cdcl_solver()
-    # stop measuring stats
-    STATS.stop()
-    return satisfiable
-
-def cdcl_solver() -> bool:
-    """CDCL with preprocessing.
-
-    Returns
-    -------
-    bool
-        True if the global formula is satisfiable, false if not.
-    """
-
-    global original_formula
-    # pre-processing
-    # trivial: empty clause contained?
-    for clause in original_formula:
-        if len(clause) == 0:
-            return False
-    # UP
-    if conflict := propagate():
-        return False
-    # did this already satisfy?
-    if is_empty_formula():
-        return True
-    # the real thing
-    return cdcl_preprocessed()
-
-def is_empty_formula() -> bool:
-    """Determines whether a formula f is empty.
-
-    Returns
-    -------
-    bool
-        True if empty, False if not.
-    """
-
-    global original_formula, assignments  # using global assignments and formula
-    f = copy(original_formula)
-    # remove clauses that were made true by the assignment
-    for assignment in assignments.assignment_view:
-        removes_clause_from_formula = -1 * assignment.var if assignment.value == False else assignment.var    # == False for readability
-        f = [clause for clause in f if not removes_clause_from_formula in clause]   # that's all the clauses that do not contain the literal that removes them from the formula
-    return len(f) == 0
-
-def cdcl_preprocessed() -> bool:
-    """CDCL assuming the formula was preprocessed
-
-    Returns
-    -------
-    bool
-        True if the global formula is satisfiable, false if not.
-    """
-    global assignments, original_formula, trail    # we're using these global variables
-
-    while var := select_variable():  # while we find new variables
-        decide(var) # decide the variable and do all the dirty work that comes with it
-        while conflict_clause := propagate():  # while we find new conflicts (propagate returns conflict clause or None)
-            if trail.decision_level == 0:
-                return False    # UNSAT
-            learned_clause = analyse_conflict(conflict_clause)  # the clause that is supposed to be learned from the derived conflict
-            learn(learned_clause)   # learn the clause
-            backtrack(learned_clause)   # start backtracking, depends on learned clause
-        apply_restart_policy()  # maybe restart
-    return True # SAT
-
-
-
-# =======================================================================================
-# ================================ UP + watched literals ================================
-# =======================================================================================
-
-def propagate() -> Optional[Clause]:
-    """Unit propagation until a conflict is derived.
-
-    Returns
-    -------
-    Optional[Clause]
-        The conflict clause, None if no conflict happened.
-    """
-
-    # only use this method if watched literals are turned on
-    if not config.WATCHED_LITERALS:
-        return basic_propagate()
-    # here the actual method
-    
-    global assignments, trail, STATS
-    highest_decision_level = trail.decision_level
-    latest_assignment = (trail[highest_decision_level]).get_latest_assignment()
-    unit_clauses = get_new_unit_clauses(latest_assignment)
-    # propagate until a conflict is derived or we have no unit clauses left
-    while unit_clauses:
-        unit_clause = random.choice(unit_clauses)   # pick a random unit clause
-        unit_clauses.remove(unit_clause)    # and remove it from the list
-        # figure out the only unassigned literal in the unit clause
-        unit = None
-        for literal in unit_clause.watched_literals:
-            if assignments.value(literal) is None:
-                unit = literal  # unit is the only unassigned literal in the clause
-        # !!! the unit clause could have been satisfied because of another unit clause already !!! (rare tho?)
-        if not unit:    # if the clause doesn't have an unassigned literal anymore (if it was satisfied, because conflicts are caught earlier on, when the assignment is applied)
-            continue    # unit clause was already removed
-        # figure out the assignment to satisfy the unit
-        var = abs(unit)
-        value = True if unit > 0 else False
-        new_assignment = Assignment((var, value), trail.decision_level)
-        # apply the assignment and add it to the trail - the unit clause is the reason for the assignment.
-        assignments.assign(new_assignment, unit_clause)  # apply the assignment
-        trail.add_propagation(new_assignment, unit_clause)  # add it to the trail
-        STATS.propagate()   # gotta count the UP
-        # check if a conflict was derived anywhere (a conflict can only be derived in unit clauses)
-        for possible_conflict_clause in unit_clauses:
-            if is_conflict(possible_conflict_clause):
-                STATS.conflict()    # gotta count these conflicts
-                return possible_conflict_clause
-        # none was found - add the new unit clauses to the list
-        unit_clauses += get_new_unit_clauses(new_assignment)
-        # go again with another unit clause
-    # there are no more unit clauses left and no conflict was derived
-    return None
-
-def get_new_unit_clauses(assignment: Optional[Assignment]) -> List[Clause]: # TODO: we might be able to make this more efficient with 'watched clauses'
-    """Changes the 'watched literals' data structure to fit the new assignment and return the clauses that became unit.
-
-    Parameters
-    ----------
-    assignment : Optional[Assignment]
-        The latest applied assignment.
+    return CDCLSolver(formula, n, solver_config if solver_config is not None else config, proof = proof)
 
-    Returns
-    -------
-    List[Clause]
-        A list of clauses that became unit after the application of the given assignment.
-    """
-
-    global original_formula
-
-    # assignment is None for decision level 0
-    if assignment is None:  # on decision level 0, return all the clauses that are 1 wide
-        return [clause for clause in original_formula if len(clause) == 1]
-    # return all the clauses that become unit
-    return [clause for clause in original_formula if becomes_unit(clause, assignment)]
-
-def is_conflict(clause: Clause) -> bool:
-    """Checks if the given clause is a conflict under the current assignment or not.
-
-    Parameters
-    ----------
-    clause : Clause
-        The given clause.
-
-    Returns
-    -------
-    bool
-        True if the clause is a conflict under the current assignment, False otherwise.
-    """
-
-    global assignments
-    for literal in clause.watched_literals: # the clause is a conflict if and only if both watched literals are false
-        if not assignments.value(literal) is False:
-            return False    # one of the watched literals is not False -> no conflict
-    return True
-
-def becomes_unit(clause: Clause, assignment: Assignment) -> bool:
-    """Checks the invariant and returns if the clause became unit or not. May change the watched literals.
-
-    Parameters
-    ----------
-    clause: Clause
-        The clause that maybe became unit.
-    assignment: Assignment
-        The latest assignment.
-
-    Returns
-    -------
-    bool
-        True if the clause became unit, false otherwise.
-    """
-
-    global assignments  # we need to know about the current assignments
-    # check if clause only has 1 literal in the first place
-    if len(clause) == 1:
-        return False    # TODO: figure out if this is ok
-    # check if assignment changes watched literals
-    if assignment.var not in [abs(literal) for literal in clause.watched_literals]:
-        return False    # assignment variable does not change value of watched literals -> not a new unit clause
-    # check if invariant is maintained:
-    # check if at least one watched literal is true
-    for literal in clause.watched_literals:
-        if assignments.value(literal) is True:
-            return False    # invariant holds -> clause did not become unit
-    # check if both watched literals are unassigned
-    both_unassigned = True
-    for literal in clause.watched_literals:
-        if not assignments.value(literal) is None:
-            both_unassigned = False
-    if both_unassigned:
-        return False    # invariant holds -> clause did not become unit
-    # find out which of the 2 watched literals was falsified
-    for literal in clause.watched_literals:
-        if assignments.value(literal) is False:
-            falsified_literal = literal
-    watched_literal_index = clause.watched_literals.index(falsified_literal)  # is it the first or the second watched literal?
-    # find a new unassigned literal to watch as our currently watched literal is falsified
-    # we start looking just after the one that we currently watch and go one full loop around the whole clause
-    offset = clause.literals.index(falsified_literal) + 1 # index of the falsified literal in the clause + 1
-    for literal in clause.literals_iter(offset):
-        if literal not in clause.watched_literals and not assignments.value(literal) is False: # we found an unassigned (or satisfied) literal that is not already being watched
-            clause.watched_literals[watched_literal_index] = literal  # so we can watch it
-            return False    # that means invariant is maintained and clause not unit
-    # if we didn't find an unassigned (or satisfied), unwatched literal, the invariant is broken and the clause became unit
-    return True
-
-
-
-# ==========================================================================
-# ================================ restarts ================================
-# ==========================================================================
-
-def apply_restart_policy():
-    """Applies the restart policy.
-    """
-
-    global STATS, conflict_counter_restarts, restart_counter, assignments, trail, vsids
-    # restart if the number of conflicts since the last restart has reached the limit
-    # the limit is the luby sequence with index = number of restarts + 1 (so that the first restart has index 1) scaled
-    if conflict_counter_restarts >= luby_sequence(restart_counter + 1) * config.SCALE_LUBY:
-        # count the restart
-        restart_counter -=- 1   # chad += 1
-        STATS.restart()
-        # wipe assignments, trail, vsids counters (basically everything but the learned clauses)
-        n = len(assignments)    # number of variables
-        assignments = Assignments(n)
-        vsids = VSIDS(n)
-        trail = Trail()
-
-def luby_sequence(i: int) -> int:
-    """The luby sequence at a given index i. Simple and recursive.
-    Note: starts at 1.
+def solve_input(input: str, solver_config = None, budget: Optional[Budget] = None) -> Optional[bool]:
+    """Solves SAT for a given input file with a CNF in dimacs and measures stats.
 
     Parameters
     ----------
-    i : int
-        The given index.
+    input : str
+        The dimacs encoded file.
+    solver_config : module, optional
+        The config of the solver (any object with the attributes of config.py), by default the default config
+    budget : Optional[Budget], optional
+        Limits the work of the solver, by default unlimited
 
     Returns
     -------
-    int
-        The element of the luby sequence at index i.
+    Optional[bool]
+        True if formula is satisfiable, False otherwise. None if the budget was exhausted.
     """
 
-    # find out if there is a k so that i = 2**k - 1
-    k = 0
-    while 2**k - 1 < i:
-        k -=- 1 # chad +=
-    # we found out and know k
-    if i == 2**k - 1:
-        return 2**(k - 1)
-    else: # i < 2**k - 1
-        return luby_sequence(i - 2**(k-1) + 1)
-
-
+    return load_input(input, solver_config).solve(budget = budget)
 
-# ==============================================================================
-# ================================ backtracking ================================
-# ==============================================================================
-
-def backtrack(clause: List[int]):
-    """Changes trail and decision level for non-chronological backtracking depending on the learned clause.
-
-    Parameters
-    ----------
-    clause : List[int]
-        The learned clause.
-    """
-
-    global assignments, trail, STATS
-    # find out the asserting level: the max decision level that includes learned literals. The highest decision level is excluded!
-    asserting_level = 0
-    for literal in clause:
-        level = assignments.decision_level(abs(literal))
-        if not level is None and level > asserting_level and level != trail.decision_level:
-            asserting_level = level
-    backtrack_to(asserting_level)
-    # since we learned the an asserting clause and we jumped to the asserting level, we can safely satisfy the learned clause with unit propagation
-    # first of all find out which one of the variables is now going to be propagated
-    unit = 0
-    for literal in clause:
-        if assignments[abs(literal)] is None:
-            unit = literal
-    # satisfy the unit clause
-    # figure out the assignment to satisfy the unit
-    var = abs(unit)
-    value = True if unit > 0 else False
-    # assign the literal on the asserting decision level
-    new_assignment = Assignment((var, value), asserting_level)
-    assignments.assign(new_assignment, clause)  # apply the assignment
-    trail.add_propagation(new_assignment, clause)  # add it to the trail
-    STATS.propagate()
-        
-
-def backtrack_to(level: int):
-    """Changes trail and decision level for backtracking to the given level.
-
-    Parameters
-    ----------
-    level : int
-        The given level.
+class CDCLSolver:
+    """A CDCL solver for one formula. Every solver owns all of its state, so several solvers can live at the same time (in threads or in forked workers).
     """
 
-    global assignments, trail
-
-    # unassign variables
-    for decision_level in trail[level + 1:]:    # includes level + 1 , ... , highest decision level
-        for assignment in decision_level.assignments: # the assignments on the decision level
-            del assignments[assignment.var] # unassign the variable
-    # reset trail
-    trail.backtrack(level)
-
-
-
-# =================================================================================
-# ================================ clause learning ================================
-# =================================================================================
-
-def learn(clause: List[int]):
-    """Learns a given clause.
+    def __init__(self, formula: List[List[int]], n: int, solver_config = config, exchange: Optional[ClauseExchange] = None, worker: int = 0, proof: Optional[DRATWriter] = None):
+        """Creates a solver for a formula.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        solver_config : module, optional
+            The config of the solver (any object with the attributes of config.py), by default the default config
+        exchange : Optional[ClauseExchange], optional
+            Where learned clauses are shared with other solvers of the same formula, by default None
+        worker : int, optional
+            The index of the solver among the solvers that share clauses, by default 0
+        proof : Optional[DRATWriter], optional
+            Where the learned and deleted clauses are written as a DRAT proof, by default None. Only the first call of solve without assumptions is certified, clauses that are added between calls are not in the proof.
+        """
+
+        self.config = solver_config
+        self.n = n
+        self.exchange = exchange
+        self.worker = worker
+        self.proof = proof
+        self.restart_policy = create_restart_policy(self.config)
+        # stats
+        self.stats = CDCLStats()
+        # convert to form Formula, instantiate assignments and stuff
+        self.load_formula(formula)
+        self.vsids = VSIDS(n, self.config.VSIDS_DECAY, self.config.VSIDS_CONFLICTS_UNTIL_DECAY)
+        self.seen = [False] * n  # marks for the variables in the conflict analysis, variable (x) is stored at index (x - 1)
+        # incremental solving
+        self.assumptions: List[int] = []    # the assumptions of the current call of solve, decided in this order before any other variable
+        self.failed_assumptions: List[int] = [] # the assumptions that made the last call of solve unsatisfiable
+        self.solves = 0 # number of calls of solve
+        self.interrupted = False    # set from the outside to stop solving
+        self.budget: Optional[Budget] = None    # the budget of the current call of solve
+        # preprocessing
+        self.frozen = bytearray(n + 1)  # variables that must not be eliminated
+        self.eliminated = bytearray(n + 1)  # variables that were eliminated, they are not part of the formula anymore
+        self.reconstruction: List[Tuple[int, List[int]]] = []   # the stack that extends a model to the eliminated variables
+        if self.config.PROFILE_PHASES:
+            self.profile()
+
+    def load_formula(self, formula: List[List[int]]):
+        """Creates the formula and everything that depends on it, nothing is assigned afterwards.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        """
+
+        self.formula = Formula(formula, self.n)
+        self.assignments = Assignments(self.n)
+        self.trail = Trail()
+        self.clause_database = ClauseDatabase(
+            self.formula,
+            first_reduction = self.config.REDUCE_DB_FIRST,
+            reduction_increment = self.config.REDUCE_DB_INCREMENT,
+            core_lbd = self.config.CORE_LBD,
+            tier2_lbd = self.config.TIER2_LBD,
+            tier2_unused_conflicts = self.config.TIER2_UNUSED_CONFLICTS,
+            activity_decay = self.config.CLAUSE_ACTIVITY_DECAY,
+            proof = self.proof
+        )
+        self.unsatisfiable = False  # the formula is unsatisfiable without any assumptions, nothing can change that anymore
+        self.pending_units: List[int] = []  # unit clauses that propagate still has to assign on decision level 0
+        for reference in self.formula:
+            # trivial: empty clause contained?
+            if self.formula.arena.size(reference) == 0:
+                self.unsatisfiable = True
+            elif self.formula.arena.size(reference) == 1:
+                self.pending_units.append(reference)
+
+    def freeze(self, variables: Iterable[int]):
+        """Protects variables from being eliminated by the preprocessing, so they can be used in assumptions and added clauses later.
+        Only has an effect before the first call of solve, the assumptions of the first call are frozen automatically.
+
+        Parameters
+        ----------
+        variables : Iterable[int]
+            The variables (or literals).
+        """
+
+        for var in variables:
+            self.frozen[abs(var)] = True
+
+    def solve(self, assumptions: Optional[List[int]] = None, budget: Optional[Budget] = None) -> Optional[bool]:
+        """Solves SAT for the formula under the given assumptions and measures stats.
+        Learned clauses, VSIDS counters and saved phases are kept between calls, so the solver can be called again after clauses were added.
+
+        Parameters
+        ----------
+        assumptions : Optional[List[int]], optional
+            Literals that are assumed to be true for this call only, by default None
+        budget : Optional[Budget], optional
+            Limits the work of this call, by default unlimited
+
+        Returns
+        -------
+        Optional[bool]
+            True if the formula is satisfiable under the assumptions, False otherwise. If it is False, failed_assumptions holds the assumptions that made it unsatisfiable (empty if the formula is unsatisfiable without them).
+            None if the solver was interrupted or the budget was exhausted.
+        """
+
+        assumptions = list(assumptions) if assumptions is not None else []
+        for literal in assumptions:
+            self.check_literal(literal)
+        # start from the assignments on decision level 0, everything else might not hold anymore
+        self.backtrack_to(0)
+        self.assumptions = assumptions
+        self.failed_assumptions = []
+        self.budget = budget
+        # start measuring stuff
+        self.stats.start()
+        if budget is not None:
+            budget.start()
+        # do the thing
+        satisfiable = self.cdcl_solver()
+        if satisfiable:
+            self.extend_model()
+        elif satisfiable is False and self.unsatisfiable and self.proof is not None:
+            self.proof.add([])  # the empty clause follows from the clauses in the proof by unit propagation
+        # stop measuring stats
+        self.stats.stop()
+        self.solves -=- 1
+        self.interrupted = False
+        return satisfiable
+
+    def profile(self):
+        """Measures the time and the number of calls of the phases in PROFILED_PHASES from now on, they are shown in the stats.
+        Every call of a phase costs a little more then, solvers that are not profiled don't pay anything.
+        """
+
+        if not self.stats.phase_times.times:
+            self.stats.phase_times.attach(self, PROFILED_PHASES)
+
+    def interrupt(self):
+        """Stops the current call of solve as soon as possible, it returns None then. Can be called from another thread.
+        """
+
+        self.interrupted = True
+
+    def add_clause(self, clause: List[int], learned: bool = False, lbd: int = 0):
+        """Adds a clause to the formula between calls of solve. Its variables have to be part of the formula already.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the clause.
+        learned : bool, optional
+            If the clause is implied by the formula (e.g. learned by another solver), by default False. Learned clauses can be forgotten again.
+        lbd : int, optional
+            The literal block distance of a learned clause, by default 0
+        """
+
+        for literal in clause:
+            self.check_literal(literal)
+        self.backtrack_to(0)
+        if self.unsatisfiable:
+            return  # adding clauses can't change that
+        # literals that are false on decision level 0 can be left out, they will never be true again
+        literals = []
+        for literal in dict.fromkeys(clause):   # removes duplicate literals
+            value = self.assignments.value(literal)
+            if value is True or -literal in literals:
+                return  # satisfied forever or a tautology, no need to add it
+            if value is None:
+                literals.append(literal)
+        if learned:
+            if self.proof is not None:
+                self.proof.add(literals)
+            reference = self.formula.learn(literals, min(lbd, len(literals)))  # watches the first 2 literals, none of them are false
+            self.clause_database.learn(reference, conflict = False)
+        else:
+            reference = self.formula.add_clause(literals)
+            self.formula.original_clauses.append(reference)
+        if len(literals) == 0:
+            self.unsatisfiable = True
+        elif len(literals) == 1:
+            self.pending_units.append(reference)    # assigned on decision level 0 with the next propagation, like the units of the formula
+
+    def check_literal(self, literal: int):
+        """Makes sure that a literal belongs to a variable of the formula.
+
+        Parameters
+        ----------
+        literal : int
+            The given literal.
+
+        Raises
+        ------
+        ValueError
+            If the variable of the literal is not in the formula.
+        """
+
+        if literal == 0 or abs(literal) > self.n:
+            raise ValueError(f"Literal {literal} does not belong to a variable of the formula (1 to {self.n}).")
+        if self.eliminated[abs(literal)]:
+            raise ValueError(f"Variable {abs(literal)} was eliminated by the preprocessing, freeze it before the first call of solve to use it.")
+
+    def cdcl_solver(self) -> Optional[bool]:
+        """CDCL with preprocessing.
+
+        Returns
+        -------
+        Optional[bool]
+            True if the formula is satisfiable, false if not. None if the solver was interrupted or ran out of budget.
+        """
+
+        # pre-processing
+        if self.solves == 0:
+            self.preprocess()
+        # trivial: empty clause contained?
+        if self.unsatisfiable:
+            return False
+        # UP
+        if self.propagate() is not None:
+            self.unsatisfiable = True
+            return False
+        # probing (finds more units on decision level 0)
+        if self.solves == 0 and self.config.PROBE:
+            self.probe()
+            if self.unsatisfiable:
+                return False
+        # did this already satisfy? (only checked once, assumptions have to be decided anyway)
+        if self.solves == 0 and not self.assumptions and self.is_empty_formula():
+            return True
+        # the real thing
+        return self.cdcl_preprocessed()
+
+    def is_empty_formula(self) -> bool:
+        """Determines whether a formula f is empty.
+
+        Returns
+        -------
+        bool
+            True if empty, False if not.
+        """
+
+        status = FormulaStatus([self.formula.literals(reference) for reference in self.formula], self.n)
+        # every assigned literal is true and removes the clauses it occurs in
+        for literal in self.trail:
+            status.assign(literal)
+        return status.all_satisfied
+
+    def cdcl_preprocessed(self) -> Optional[bool]:
+        """CDCL assuming the formula was preprocessed
+
+        Returns
+        -------
+        Optional[bool]
+            True if the formula is satisfiable, false if not. None if the solver was interrupted or ran out of budget.
+        """
+
+        while True:
+            if self.interrupted or (self.budget is not None and self.budget.exhausted(self.stats)):
+                return None # somebody else wants us to stop, or we ran out of budget
+            # the assumptions are decided first, in their order
+            if (assumption := self.next_assumption()) is not None:
+                if self.assignments.value(assumption) is False:
+                    self.failed_assumptions = self.analyse_final(assumption)
+                    return False    # UNSAT under the assumptions
+                self.decide_literal(assumption)
+            elif var := self.select_variable():  # while we find new variables
+                self.decide(var) # decide the variable and do all the dirty work that comes with it
+            else:
+                return True # SAT
+            while (conflict_clause := self.propagate()) is not None:  # while we find new conflicts (propagate returns conflict clause or None)
+                if self.trail.decision_level == 0:
+                    self.unsatisfiable = True
+                    return False    # UNSAT
+                trail_size = len(self.trail)
+                learned_clause = self.analyse_conflict(conflict_clause)  # the clause that is supposed to be learned from the derived conflict
+                reference = self.learn(learned_clause)   # learn the clause
+                if self.restart_policy.conflict(self.formula.arena.lbd(reference), trail_size):
+                    self.stats.block_restart()
+                self.backtrack(reference)   # start backtracking, depends on learned clause
+                self.reduce_clause_database()    # maybe forget some learned clauses
+            self.apply_restart_policy()  # maybe restart
+            # clauses imported at a restart can be unit or falsified on decision level 0
+            if self.trail.decision_level == 0 and (self.unsatisfiable or self.propagate() is not None):
+                self.unsatisfiable = True
+                return False    # UNSAT
 
-    Parameters
-    ----------
-    clause : List[int]
-        The clause that is supposed to be learned.
-    """
 
-    global original_formula
-    original_formula.learn(clause)
-    STATS.learn()   # gotta count those learned clauses
 
-def analyse_conflict(conflict_clause: Clause) -> Clause:
-    """Analyses the current conflict.
+    # =============================================================================
+    # ================================ assumptions ================================
+    # =============================================================================
+
+    def next_assumption(self) -> Optional[int]:
+        """The first assumption that is not satisfied yet.
+
+        Returns
+        -------
+        Optional[int]
+            The assumption, None if all of them are satisfied.
+        """
+
+        for literal in self.assumptions:
+            if self.assignments.value(literal) is not True:
+                return literal
+        return None
+
+    def analyse_final(self, assumption: int) -> List[int]:
+        """Finds the assumptions that imply the negation of a falsified assumption.
+        Only assumptions were decided when this happens, so every decision that the negation depends on is one of them.
+
+        Parameters
+        ----------
+        assumption : int
+            The falsified assumption.
+
+        Returns
+        -------
+        List[int]
+            The falsified assumption and the assumptions that falsified it.
+        """
+
+        decision_levels, reasons, seen, arena = self.assignments.decision_levels, self.assignments.reasons, self.seen, self.formula.arena
+        failed = [assumption]
+        if decision_levels[abs(assumption)] == 0:
+            return failed   # the negation is implied by the formula alone
+        seen[abs(assumption) - 1] = True
+        # walk the trail backwards and follow the reasons of the seen variables
+        for index in range(len(self.trail) - 1, self.trail.level_start(1) - 1, -1):
+            literal = self.trail[index]
+            var = abs(literal)
+            if not seen[var - 1]:
+                continue
+            seen[var - 1] = False
+            if reasons[var] == NO_REASON:
+                failed.append(literal)  # an assumption that was decided
+                continue
+            for reason_literal in arena.literals(reasons[var]):
+                if abs(reason_literal) != var and decision_levels[abs(reason_literal)] > 0:
+                    seen[abs(reason_literal) - 1] = True
+        return failed
+
+
+
+    # ===============================================================================
+    # ================================ preprocessing ================================
+    # ===============================================================================
+
+    def preprocess(self):
+        """Simplifies the formula before the first search. The assumptions of the first call are frozen, learned clauses are treated like original clauses.
+        """
+
+        if not (self.config.SUBSTITUTE or self.config.SUBSUME or self.config.ELIMINATE) or self.unsatisfiable:
+            return
+        self.freeze(self.assumptions)
+        preprocessor = Preprocessor([list(self.formula.literals(reference)) for reference in self.formula], self.n, [var for var in range(1, self.n + 1) if self.frozen[var]], self.proof)
+        substituted, subsumed, strengthened, eliminated = 0, 0, 0, 0
+        if self.config.SUBSTITUTE:
+            substituted = preprocessor.substitute_equivalences()
+        if self.config.SUBSUME:
+            subsumed, strengthened = preprocessor.subsume(self.config.SUBSUMPTION_LIMIT)
+        if self.config.ELIMINATE:
+            eliminated = preprocessor.eliminate_variables(
+                occurrence_limit = self.config.ELIMINATION_OCCURRENCE_LIMIT,
+                resolution_limit = self.config.ELIMINATION_RESOLUTION_LIMIT,
+                clause_size_limit = self.config.ELIMINATION_CLAUSE_SIZE_LIMIT
+            )
+        if self.config.SUBSUME and eliminated > 0:
+            # the resolvents are often subsumed
+            subsumed_resolvents, strengthened_resolvents = preprocessor.subsume(self.config.SUBSUMPTION_LIMIT)
+            subsumed += subsumed_resolvents
+            strengthened += strengthened_resolvents
+        if substituted == 0 and subsumed == 0 and strengthened == 0 and eliminated == 0 and not preprocessor.unsatisfiable:
+            return  # nothing changed
+        self.eliminated = preprocessor.eliminated
+        self.reconstruction = preprocessor.reconstruction
+        self.stats.substitute(substituted)
+        self.stats.subsume(subsumed)
+        self.stats.strengthen(strengthened)
+        self.stats.eliminate(eliminated)
+        # start over with the simplified formula (the units on decision level 0 are propagated again)
+        self.load_formula(preprocessor.formula)
+
+    def extend_model(self):
+        """Assigns the eliminated and substituted variables after the simplified formula was satisfied, so the model satisfies the original formula.
+        They are assigned on a new decision level, so they are unassigned again by the next call of solve.
+        """
+
+        if not self.reconstruction:
+            return
+        values = extend_model(self.reconstruction, self.assignments.value)
+        self.trail.new_level()
+        for var, value in values.items():
+            literal = var if value else -var
+            self.assignments.assign(literal, self.trail.decision_level)
+            self.trail.add_propagation(literal)
+
+
+
+    # =========================================================================
+    # ================================ probing ================================
+    # =========================================================================
+
+    def probe(self):
+        """Failed literal probing on decision level 0: both literals of a variable are assigned on decision level 1 and propagated.
+        - a literal that leads to a conflict is failed, its negation is learned as a unit
+        - literals that are implied by both literals of a variable are learned as units
+        - literals that are propagated by a longer clause get a hyper-binary resolvent, so the next propagation finds them with a binary clause
+        Roots of the binary implication graph are probed first, they imply the most. Stops when the propagation budget is used up.
+        """
+
+        budget = self.config.PROBING_LIMIT
+        for var, first in self.probing_candidates():
+            if budget <= 0 or self.unsatisfiable:
+                return
+            if self.assignments[var] is not None:
+                continue    # became a unit in the meantime
+            implied = []
+            resolvents = []
+            for literal in (first, -first):
+                start = len(self.trail)
+                self.probe_literal(literal)
+                conflict_clause = self.propagate()
+                budget -= len(self.trail) - start
+                if conflict_clause is not None:
+                    self.backtrack_to(0)
+                    self.learn_probed([-literal])   # failed literal
+                    self.stats.fail()
+                    break
+                implied.append(set(self.trail.literals[start + 1:]))
+                resolvents += self.hyper_binary_resolvents(start)
+                self.backtrack_to(0)
+            else:
+                for unit in implied[0] & implied[1]:
+                    if self.proof is not None:
+                        # the unit alone isn't RUP if both implications go through longer clauses, the two binary clauses justify it
+                        self.proof.add([-first, unit])
+                        self.proof.add([first, unit])
+                    self.learn_probed([unit])   # implied either way
+                    if self.proof is not None:
+                        self.proof.delete([-first, unit])
+                        self.proof.delete([first, unit])
+                    self.stats.fail()
+            for resolvent in resolvents:
+                self.learn_probed(resolvent)
+            self.stats.resolve_hyper_binary(len(resolvents))
+
+    def probe_literal(self, literal: int):
+        """Makes a literal true on a new decision level like a decision. It isn't counted as a decision, probing is not part of the search.
+
+        Parameters
+        ----------
+        literal : int
+            The probed literal.
+        """
+
+        self.assignments.assign(literal, self.trail.decision_level + 1)
+        self.trail.decide(literal)
+
+    def probing_candidates(self) -> List[Tuple[int, int]]:
+        """The variables to probe, the roots of the binary implication graph first.
+        A binary clause (a, b) gives the implications (-a) -> b and (-b) -> a, so literal (x) is a root if (-x) occurs in binary clauses and (x) doesn't.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            (variable, literal that is probed first) for every unassigned variable of the formula.
+        """
+
+        binary_occurrences = [0] * (2 * self.n + 1)  # literal (x) is stored at index x, (-x) at index 2n + 1 - x
+        for reference in self.formula:
+            if self.formula.arena.size(reference) == 2:
+                for literal in self.formula.literals(reference):
+                    binary_occurrences[literal] -=- 1
+        candidates = []
+        for var in range(1, self.n + 1):
+            if self.assignments[var] is not None or self.eliminated[var]:
+                continue
+            # the literal with more outgoing implications first
+            first = var if binary_occurrences[-var] >= binary_occurrences[var] else -var
+            is_root = binary_occurrences[first] == 0 and binary_occurrences[-first] > 0
+            candidates.append((not is_root, -binary_occurrences[-first], var, first))
+        candidates.sort()
+        return [(var, first) for _, _, var, first in candidates]
+
+    def hyper_binary_resolvents(self, start: int) -> List[List[int]]:
+        """Hyper-binary resolvents for the literals that were propagated on decision level 1 by clauses with more than 2 literals.
+        Every literal on level 1 gets a parent, so the propagations form a tree below the decision: the other literal of a binary reason, or the dominator of the false literals of a longer reason.
+        The dominator (the closest common ancestor) implies all of them, so it implies the propagated literal by itself.
+
+        Parameters
+        ----------
+        start : int
+            The position of the decision on the trail.
+
+        Returns
+        -------
+        List[List[int]]
+            The resolvents (-dominator, propagated literal).
+        """
+
+        decision = self.trail[start]
+        parents = {decision: None}
+        depths = {decision: 0}
+        resolvents = []
+        for index in range(start + 1, len(self.trail)):
+            literal = self.trail[index]
+            reference = self.assignments.reasons[abs(literal)]
+            # the literals on level 1 that made the other literals of the reason false
+            causes = [-other for other in self.formula.literals(reference) if other != literal and self.assignments.decision_levels[abs(other)] == 1]
+            dominator = causes[0]
+            for cause in causes[1:]:
+                # walk up the tree until the two paths meet
+                while depths[cause] > depths[dominator]:
+                    cause = parents[cause]
+                while depths[dominator] > depths[cause]:
+                    dominator = parents[dominator]
+                while cause != dominator:
+                    cause, dominator = parents[cause], parents[dominator]
+            if self.formula.arena.size(reference) > 2:
+                resolvents.append([-dominator, literal])
+            parents[literal] = dominator
+            depths[literal] = depths[dominator] + 1
+        return resolvents
+
+    def learn_probed(self, clause: List[int]):
+        """Adds a clause that was found by probing and propagates it on decision level 0.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the clause.
+        """
+
+        self.add_clause(clause, learned = True, lbd = len(clause))
+        if self.unsatisfiable or self.propagate() is not None:
+            self.unsatisfiable = True
+
+
+
+    # =======================================================================================
+    # ================================ UP + watched literals ================================
+    # =======================================================================================
+
+    def propagate(self) -> Optional[int]:
+        """Unit propagation until a conflict is derived.
+
+        Returns
+        -------
+        Optional[int]
+            The reference of the conflict clause, None if no conflict happened.
+        """
+
+        # only use this method if watched literals are turned on
+        if not self.config.WATCHED_LITERALS:
+            self.pending_units.clear()  # the basic propagation finds the unit clauses by itself
+            return self.basic_propagate()
+        # here the actual method
+
+        # satisfy the clauses that are 1 wide and were not assigned yet, they are only pending on decision level 0
+        while self.pending_units:
+            reference = self.pending_units.pop()
+            unit = self.formula.arena.data[reference + HEADER_SIZE]
+            if self.assignments.value(unit) is False:
+                self.pending_units.append(reference)    # still falsified if someone propagates again
+                self.stats.conflict()
+                return reference
+            if self.assignments.value(unit) is None:
+                self.assign_propagation(unit, reference)
+        # propagate until a conflict is derived or every assigned literal was looked at. The trail is our queue.
+        trail, literals = self.trail, self.trail.literals
+        values, implications = self.assignments.literal_values, self.formula.implications
+        binary_head = trail.propagation_head   # the binary clauses run ahead of the longer clauses
+        while trail.propagation_head < len(literals):
+            # the binary clauses of every assigned literal first, they are the cheapest: no watches to move, the implied literal is right there
+            while binary_head < len(literals):
+                for implied, reference in implications[literals[binary_head]]:
+                    value = values[implied]
+                    if value == UNASSIGNED:
+                        self.assign_propagation(implied, reference)
+                    elif value == FALSE:
+                        self.stats.conflict()
+                        return reference    # both literals are falsified
+                binary_head -=- 1
+            literal = literals[trail.propagation_head]
+            trail.propagation_head -=- 1
+            conflict_clause = self.propagate_literal(literal)
+            if conflict_clause is not None:
+                self.stats.conflict()    # gotta count these conflicts
+                return conflict_clause
+        # there are no more unit clauses left and no conflict was derived
+        return None
+
+    def propagate_literal(self, literal: int) -> Optional[int]:
+        """Visits the clauses with more than 2 literals watching the negation of a literal that was just made true. Clauses with a true blocker are skipped without looking at them. Watched literals are moved to maintain the invariant, clauses that became unit are propagated.
+
+        Parameters
+        ----------
+        literal : int
+            The literal that was made true.
+
+        Returns
+        -------
+        Optional[int]
+            The reference of the conflict clause, None if no conflict happened.
+        """
+
+        values = self.assignments.literal_values
+        data = self.formula.arena.data
+        watches = self.formula.watches
+        falsified_literal = -literal
+        watchers = watches[falsified_literal]
+        watches[falsified_literal] = kept_watchers = []   # the clauses that keep watching the falsified literal
+        blocked = 0 # number of clauses that were skipped because of their blocker
+        for index, watch in enumerate(watchers):
+            # the clause is satisfied by the blocker -> no need to look at the clause
+            if values[watch[1]] == TRUE:
+                kept_watchers.append(watch)
+                blocked -=- 1
+                continue
+            reference = watch[0]
+            start = reference + HEADER_SIZE # position of the first literal
+            # the watched literals are the first 2 literals, make sure the falsified one is the second one
+            other_literal = data[start]
+            if other_literal == falsified_literal:
+                other_literal = data[start + 1]
+                data[start] = other_literal
+                data[start + 1] = falsified_literal
+            other_value = values[other_literal]
+            # the clause is satisfied by the other watched literal -> invariant holds, it blocks from now on
+            if other_value == TRUE:
+                kept_watchers.append((reference, other_literal) if other_literal != watch[1] else watch)
+                continue
+            # find a new literal to watch that is not falsified
+            for position in range(start + 2, start + data[reference]):  # the size is the first entry of the header
+                new_literal = data[position]
+                if values[new_literal] != FALSE:
+                    # watch it instead of the falsified literal
+                    data[start + 1] = new_literal
+                    data[position] = falsified_literal
+                    watches[new_literal].append((reference, other_literal))
+                    break
+            else:   # we didn't find one, so the clause is either unit or a conflict
+                kept_watchers.append((reference, other_literal))
+                if other_value == UNASSIGNED:  # unit: the other watched literal is the only unassigned literal
+                    self.assign_propagation(other_literal, reference)
+                else:   # conflict: every literal is falsified
+                    self.stats.block(blocked)
+                    kept_watchers.extend(watchers[index + 1:])  # the clauses we didn't look at keep watching
+                    return reference
+        if blocked:
+            self.stats.block(blocked)
+        return None
+
+    def assign_propagation(self, unit: int, reason: int):
+        """Satisfies a unit literal on the current decision level and adds the assignment to the trail.
+
+        Parameters
+        ----------
+        unit : int
+            The unit literal.
+        reason : int
+            The reference of the unit clause that is the reason for the assignment.
+        """
 
-    Parameters
-    ----------
-    conflict_clause : Clause
-        The conflict that was just found.
-
-    Returns
-    -------
-    Clause
-        The clause to be learned.
-    """
+        # apply the assignment and add it to the trail - the unit clause is the reason for the assignment.
+        self.assignments.assign(unit, self.trail.decision_level, reason)  # apply the assignment
+        self.trail.add_propagation(unit)  # add it to the trail
+        self.stats.propagate()   # gotta count the UP
+
+
+
+    # ==========================================================================
+    # ================================ restarts ================================
+    # ==========================================================================
+
+    def apply_restart_policy(self):
+        """Applies the restart policy.
+        """
+
+        if self.restart_policy.restart_due():
+            # count the restart
+            self.restart_policy.restart()
+            self.stats.restart()
+            # only the trail is thrown away, VSIDS scores and saved phases lead the search back to where it was
+            # the assignments on decision level 0 stay, they hold forever (unit clauses are not watched, so they would not be propagated again)
+            self.backtrack_to(0)
+            # learn what the others found out in the meantime
+            self.import_clauses()
+
+
+
+    # ==============================================================================
+    # ================================ backtracking ================================
+    # ==============================================================================
+
+    def backtrack(self, reference: int):
+        """Changes trail and decision level for non-chronological backtracking depending on the learned clause.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the learned clause.
+        """
+
+        clause = self.formula.literals(reference)
+        # find out the asserting level: the max decision level that includes learned literals. The highest decision level is excluded!
+        asserting_level = 0
+        for literal in clause:
+            level = self.assignments.decision_level(abs(literal))
+            if not level is None and level > asserting_level and level != self.trail.decision_level:
+                asserting_level = level
+        self.backtrack_to(asserting_level)
+        # since we learned the an asserting clause and we jumped to the asserting level, we can safely satisfy the learned clause with unit propagation
+        # first of all find out which one of the variables is now going to be propagated
+        unit = 0
+        for literal in clause:
+            if self.assignments[abs(literal)] is None:
+                unit = literal
+        # satisfy the unit clause on the asserting decision level
+        self.assign_propagation(unit, reference)
+
+
+    def backtrack_to(self, level: int):
+        """Changes trail and decision level for backtracking to the given level.
+
+        Parameters
+        ----------
+        level : int
+            The given level.
+        """
+
+
+        if level >= self.trail.decision_level:
+            return  # nothing to do
+        # unassign variables on level + 1 , ... , highest decision level
+        for index in range(self.trail.level_start(level + 1), len(self.trail)):
+            var = abs(self.trail[index])
+            del self.assignments[var] # unassign the variable
+            self.vsids.insert(var)    # and make it selectable again
+        # reset trail
+        self.trail.backtrack(level)
+
+
+
+    # =================================================================================
+    # ================================ clause learning ================================
+    # =================================================================================
+
+    def learn(self, clause: List[int]) -> int:
+        """Learns a given clause.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The clause that is supposed to be learned.
+
+        Returns
+        -------
+        int
+            The reference of the learned clause.
+        """
+
+        # watch the 2 literals that are unassigned last when backtracking, so the invariant holds after the backjump
+        clause = sorted(clause, key = lambda literal: self.assignments.decision_levels[abs(literal)], reverse = True)
+        self.stats.learn()   # gotta count those learned clauses
+        lbd = ClauseDatabase.lbd(clause, self.assignments.decision_levels)
+        if self.proof is not None:
+            self.proof.add(clause)
+        reference = self.formula.learn(clause, lbd)
+        self.clause_database.learn(reference)
+        self.export_clause(clause, lbd)
+        return reference
+
+    def export_clause(self, clause: List[int], lbd: int):
+        """Shares a learned clause with the other solvers if it is short and good enough.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The learned clause.
+        lbd : int
+            The literal block distance of the clause.
+        """
+
+        if self.exchange is None or len(clause) > self.config.SHARE_MAX_SIZE or lbd > self.config.SHARE_MAX_LBD:
+            return
+        self.exchange.export(self.worker, clause, lbd)
+        self.stats.export_clause()
+
+    def import_clauses(self):
+        """Learns the clauses that the other solvers shared since the last call. Must be called on decision level 0.
+        """
+
+        if self.exchange is None:
+            return
+        for literals, lbd in self.exchange.receive(self.worker):
+            if any(self.eliminated[abs(literal)] for literal in literals):
+                continue    # not part of our formula anymore
+            self.add_clause(literals, learned = True, lbd = lbd)
+            self.stats.import_clause()
+
+    def analyse_conflict(self, conflict_clause: int) -> List[int]:
+        """Analyses the current conflict.
+
+        Parameters
+        ----------
+        conflict_clause : int
+            The reference of the conflict that was just found.
+
+        Returns
+        -------
+        List[int]
+            The clause to be learned.
+        """
+
+        # only use this method if UIP learning is turned on
+        if not self.config.LEARN_UIP:
+            return self.basic_analyse_conflict(conflict_clause)
+        # here the actual method
+
+        decision_levels, reasons, arena = self.assignments.decision_levels, self.assignments.reasons, self.formula.arena
+        level = self.trail.decision_level
+        learned_literals = [0]  # the first literal is reserved for the negated UIP
+        open_counter = 0    # number of seen variables on the highest decision level that were not resolved away yet
+        index = len(self.trail)  # position on the trail, we walk it backwards
+        clause = arena.literals(conflict_clause)
+        pivot = 0   # the variable that was resolved last, its literal is in the reason clause as well
+        reference = conflict_clause
+        while True:
+            self.bump_variables(clause)  # every clause in the resolution touches its variables
+            self.bump_clause(reference)  # and is used by the conflict
+            # resolve the clause with the cut: look at every variable that was not seen yet
+            for literal in clause:
+                var = abs(literal)
+                if self.seen[var - 1] or var == pivot:
+                    continue    # already in the cut or resolved away
+                var_level = decision_levels[var]
+                if var_level == 0:
+                    continue    # falsified forever, no need to learn it
+                self.seen[var - 1] = True
+                if var_level == level:
+                    open_counter -=- 1  # resolved later
+                else:
+                    learned_literals.append(literal)    # stays in the learned clause
+            # the next pivot is the latest assigned variable on the highest decision level that is in the cut
+            while True:
+                index -= 1
+                pivot = abs(self.trail[index])
+                if self.seen[pivot - 1]:
+                    break
+            self.seen[pivot - 1] = False
+            open_counter -= 1
+            if open_counter == 0:
+                break   # the pivot is the only variable left on the highest decision level. This is the 1UIP. This is the way.
+            reference = reasons[pivot]
+            clause = arena.literals(reference)  # resolve the reason for the pivot next
+        learned_literals[0] = -self.trail[index]  # the negated literal of the UIP
+        minimized_literals = self.minimize(learned_literals)
+        # clear the seen marks of the variables on lower decision levels
+        for literal in learned_literals[1:]:
+            self.seen[abs(literal) - 1] = False
+        self.vsids_conflict()
+        return minimized_literals
+
+    def minimize(self, clause: List[int]) -> List[int]:
+        """Removes the literals from a learned clause that are implied by the other literals (recursive clause minimization).
+        The variables of the clause have to be marked as seen, the UIP is expected at index 0 and is always kept.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The learned clause.
+
+        Returns
+        -------
+        List[int]
+            The minimized clause.
+        """
+
+        # only minimize if it is turned on
+        if not self.config.MINIMIZE:
+            return clause
+        # here the actual method
+
+        decision_levels, reasons = self.assignments.decision_levels, self.assignments.reasons
+        # the decision levels in the clause as a bitmask. A literal on a level that isn't in there can't be implied by the clause.
+        abstract_levels = 0
+        for literal in clause[1:]:
+            abstract_levels |= 1 << (decision_levels[abs(literal)] & 63)
+        marked = [] # variables that were proven redundant on the way, they are marked as seen until the end
+        minimized_clause = [clause[0]]
+        for literal in clause[1:]:
+            var = abs(literal)
+            if reasons[var] == NO_REASON or not self.is_redundant(var, abstract_levels, marked):
+                minimized_clause.append(literal)
+        for var in marked:
+            self.seen[var - 1] = False
+        self.stats.minimize(len(clause) - len(minimized_clause))
+        return minimized_clause
+
+    def is_redundant(self, variable: int, abstract_levels: int, marked: List[int]) -> bool:
+        """Checks if the literal of a propagated variable in the learned clause is implied by the other literals, by following the reasons depth first.
+        The reasons of a redundant literal only lead to seen variables (in the clause or proven redundant) and variables on decision level 0.
+
+        Parameters
+        ----------
+        variable : int
+            The given variable.
+        abstract_levels : int
+            The decision levels of the literals in the learned clause as a bitmask.
+        marked : List[int]
+            The variables that were marked as seen because they are redundant. Newly proven ones are appended.
+
+        Returns
+        -------
+        bool
+            True if the literal can be removed from the learned clause, False otherwise.
+        """
+
+        decision_levels, reasons, arena = self.assignments.decision_levels, self.assignments.reasons, self.formula.arena
+        stack = [variable]
+        top = len(marked)   # everything marked after this is undone if the literal is not redundant
+        while stack:
+            current = stack.pop()
+            for literal in arena.literals(reasons[current]):
+                var = abs(literal)
+                if var == current or self.seen[var - 1] or decision_levels[var] == 0:
+                    continue    # the propagated literal itself or already known to be implied
+                if reasons[var] != NO_REASON and abstract_levels & (1 << (decision_levels[var] & 63)):
+                    # might be implied as well, follow its reason
+                    self.seen[var - 1] = True
+                    marked.append(var)
+                    stack.append(var)
+                else:
+                    # reached a decision or a level that is not in the clause
+                    for var in marked[top:]:
+                        self.seen[var - 1] = False
+                    del marked[top:]
+                    return False
+        return True
 
-    # only use this method if UIP learning is turned on
-    if not config.LEARN_UIP:
-        return basic_analyse_conflict(conflict_clause)
-    # here the actual method
-
-    global trail
-    assignments_on_decision_level = trail[trail.decision_level].assignments
-    #variables_on_decision_level = [assignment.var for assignment in assignments_on_decision_level]
-    cut = conflict_clause   # initiate the cut with the conflict clause
-    conflict_zone = []  # the variables in the conflict zone of the cut
-    imp_graph = implication_graph_on_decision_level()   # the implication graph only on the highest decision level
-    dec_vars = deque(variables_on_decision_level(cut, trail.decision_level))   # dec_vars is now the list of variables on the last decision level (in the cut)
-    while len(dec_vars) > 1:    # while there is more than 1 literal on the highest decision level in the current clause, keep going
-        pivot = dec_vars.popleft()  # the first variable in the list will be our pivot
-        # now check if the pivot can reach any other variables in the cut
-        # we do this with DF search:
-        others_reachable = False
-        open_list = deque([pivot]) # initiate the open list (nodes to be expanded)
-        while open_list:    # while there are nodes in the open list
-            node = open_list.popleft() # node to be expanded - the first node in the list (we append new nodes at the end)
-            if node in conflict_zone:
-                pass    # node stays removed
-                # we don't need to look past the cut
-            elif not node is pivot and node in dec_vars:    # if a node is in the cut and is not the pivot itself (not node is pivot is actually not needed here, because popleft() removes it from the list, but this makes a bit clearer that this might be needed if we change the implementation)
-                others_reachable = True # then another variable in the cut is reachable
+    def bump_variables(self, clause: List[int]):
+        """Bumps the VSIDS counters of the variables in a clause that takes part in a conflict.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the given clause.
+        """
+
+        if not self.config.VSIDS:
+            return
+        for literal in clause:
+            self.vsids.touch(abs(literal))
+
+    def bump_clause(self, reference: int):
+        """Bumps the activity of a learned clause that takes part in a conflict.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the given clause.
+        """
+
+        if self.config.REDUCE_DB and self.formula.arena.is_learned(reference):
+            self.clause_database.bump(reference, self.assignments.decision_levels)
+
+    def reduce_clause_database(self):
+        """Deletes the subsumed and the worst learned clauses if a reduction of the clause database is due.
+        """
+
+        if self.config.REDUCE_DB and self.clause_database.reduction_due():
+            if self.config.SUBSUME:
+                self.stats.subsume(self.clause_database.subsume(self.assignments.reasons, self.config.SUBSUMPTION_LIMIT))
+            self.stats.delete(self.clause_database.reduce(self.assignments.reasons))
+
+    def vsids_conflict(self):
+        """Lets VSIDS know that a conflict was analysed, so it can decay the counters.
+        """
+
+        if self.config.VSIDS:
+            self.vsids.conflict()
+
+    # ===========================================================================
+    # ================================ decisions ================================
+    # ===========================================================================
+
+    def select_variable(self) -> Optional[int]:
+        """Decides which variable to select for a decision.
+
+        Returns
+        -------
+        Optional[int]
+            The selected variable. None if every variable is assigned.
+        """
+
+        # only use this method if watched literals are turned on
+        if not self.config.VSIDS:
+            return self.basic_selection()
+        # here the actual method
+
+        # the variable with the highest counter is on top of the heap. Assigned variables are only thrown out when they show up there.
+        while (var := self.vsids.pop()) is not None:
+            if self.assignments[var] is None and not self.eliminated[var]:
+                return var
+        return None
+
+    def decide(self, var: int):
+        """Decides the value of a given variable and adds the assignment to the trail.
+
+        Parameters
+        ----------
+        var : int
+            The variable to be decided.
+        """
+
+        value = self.variable_decision_heuristic(var)    # what value should be assigned to the variable
+        self.decide_literal(var if value else -var)
+
+    def decide_literal(self, literal: int):
+        """Makes a given literal true on a new decision level and adds the assignment to the trail.
+
+        Parameters
+        ----------
+        literal : int
+            The literal to be decided.
+        """
+
+        self.assignments.assign(literal, self.trail.decision_level + 1)  # add the assignment to the list of assignments - will be on a new decision level!
+        self.trail.decide(literal)    # add it to the trail
+        self.stats.decide()  # gotta count those decisions
+
+    def variable_decision_heuristic(self, var: int) -> bool:
+        """The suggested value for a given variable.
+
+        Parameters
+        ----------
+        var : int
+            The given variable.
+
+        Returns
+        -------
+        bool
+            The suggested value for the variable assignment.
+        """
+
+        # only use this method if the variable decision heuristic is turned on
+        if not self.config.DECISION_HEURISTIC:
+            return self.basic_decision(var)
+        # here the actual method
+
+        # we want to maintain the last assignment
+        if self.assignments.last_assignment(var) is None:
+            if self.config.DEFAULT_PHASE is None:
+                return random.choice([True, False])
+            return self.config.DEFAULT_PHASE
+        else:
+            return self.assignments.last_assignment(var)
+
+
+
+    # =======================================================================================
+    # ================================ basic implementations ================================
+    # =======================================================================================
+
+    def basic_decision(self, var: int) -> bool:
+        """The suggested value for a given variable. Picks randomly.
+
+        Parameters
+        ----------
+        var : int
+            The given variable.
+
+        Returns
+        -------
+        bool
+            The suggested decision.
+        """
+
+        return random.choice([True, False])
+
+    def basic_selection(self) -> Optional[int]:
+        """Decides which variable to select for a decision. Very basic.
+
+        Returns
+        -------
+        Optional[int]
+            The selected variable. None if every variable is assigned.
+        """
+
+        for var, value in self.assignments.assignment_view:
+            if value is None and not self.eliminated[var]:
+                return var
+        return None
+
+    def basic_propagate(self) -> Optional[int]:
+        """Basic unit propagation until a conflict is derived.
+
+        Returns
+        -------
+        Optional[int]
+            The reference of the conflict clause, None if no conflict happened.
+        """
+
+        # propagate until a conflict is derived or we have no unit clauses left
+        while unit_clauses := self.basic_get_unit_clauses():
+            reference = unit_clauses[0]
+            unit_clause = self.formula.literals(reference)
+            # figure out the only unassigned literal in the unit clause
+            unit = None
+            for literal in unit_clause:
+                if self.assignments.value(literal) is None:
+                    unit = literal  # unit is the only unassigned literal in the clause
+            # apply the assignment and add it to the trail - the unit clause is the reason for the assignment.
+            self.assign_propagation(unit, reference)
+            # check if a conflict was derived anywhere (a conflict can only be derived in unit clauses)
+            for possible_conflict_clause in unit_clauses:
+                if self.basic_is_conflict(self.formula.literals(possible_conflict_clause)):
+                    self.stats.conflict()    # gotta count these conflicts
+                    return possible_conflict_clause
+            # go again with another unit clause
+        # there are no more unit clauses left and no conflict was derived
+        return None
+
+    def basic_get_unit_clauses(self) -> List[int]:
+        """Gets unit clauses in a very basic way without watched literals.
+
+        Returns
+        -------
+        List[int]
+            The references of the clauses that are unit under the current assignment.
+        """
+
+        return [reference for reference in self.formula if self.basic_is_unit(self.formula.literals(reference))]
+
+    def basic_is_unit(self, clause: List[int]) -> bool:
+        """Basic check if the clause is unit under the current assignment.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the given clause.
+
+        Returns
+        -------
+        bool
+            True if the clause is unit, False otherwise.
+        """
+
+        unassigned_literals = [literal for literal in clause if self.assignments.value(literal) is None]
+        has_satisfied_literal = False
+        for literal in clause:
+            if self.assignments.value(literal) is True:
+                has_satisfied_literal = True
                 break
-            else:   # node is not in cut and not in conflict zone -> expand it
-                # node is already removed from the start
-                open_list.extend(imp_graph[node])   # append it's direct successors
-        # we found out if other variables in the cut are reachable from the pivot
-        if others_reachable:
-            # go to the end of the queue!
-            dec_vars.append(pivot)
-            continue    # and look at the next variable - continue is actually not needed here, just for readability
-        else:   # we can't reach any variables outside the cut if we add this to the cut, so let's just do that shall
-            reason = assignments.reason(pivot)  # reason clause for assignment of pivot
-            cut = resolve(cut, reason, pivot)    # resolve the reason with the cut
-            new_decision_variables = variables_on_decision_level(reason, trail.decision_level)  # the new variables that are now in the cut on the highest decision level
-            new_decision_variables = [variable for variable in new_decision_variables if variable not in dec_vars and not variable is pivot]    # only add actually new variables. we do not want duplicates.
-            dec_vars.extendleft(new_decision_variables)  # add the new decision variables on the left (the ones on the right could reach other variables in our cut before and probably still can)
-            conflict_zone.append(pivot) # the pivot is now in the conflict zone
-    # we resolved until there was only 1 literal on the highest decision level left. This is the 1UP. This is the way.
-    return cut
-
-def resolve(a: Clause, b: Clause, pivot: int) -> Clause:
-    """Resolution of clauses a and b with a given pivot.
-
-    Parameters
-    ----------
-    a : Clause
-        The given clause a.
-    b : Clause
-        The given clause b.
-    pivot : int
-        The pivot for the resolution.
-
-    Returns
-    -------
-    Clause
-        Resolution boiiiis. Can't repeat it enough.
-    """
-
-    # every literal from a and b is in there except for the pivoted variable
-    literals = [literal for literal in a.literals + b.literals if abs(literal) != pivot]
-    return Clause(literals)
-
-def implication_graph_on_decision_level() -> dict:
-    """Returns the implication graph on the highest decision level (only the highest decision level!).
-
-    Returns
-    -------
-    dict
-        Adjancency list of the implication graph (a: [b,c]) if a's direct successors are b and c.
-    """
+        return not has_satisfied_literal and len(unassigned_literals) == 1  # if we only have 1 unassigned literal and no satisfied literals, it's unit
 
-    global trail
-    adjacency_list = {}
-    assignments_on_level = trail[trail.decision_level].assignments  # the variables that were assigned on the latest decision level
-    # initialise the list for every variable
-    for assignment in assignments_on_level:
-        adjacency_list[assignment.var] = []
-    # draw the lines
-    propagations = trail[trail.decision_level].propagations # only propagations have predecessors
-    for propagation in propagations:
-        # the direct predecessor of a variable is every variable that's in the reason clause except for the assignment var itself
-        predecessors = variables_on_decision_level(propagation.reason, trail.decision_level) # we only care for variables on the highest decision level
-        predecessors.remove(propagation.assignment.var) # except for the assignment var itself
-        # append assignment var to the lists of the predecessor
-        for predecessor in predecessors:
-            adjacency_list[predecessor].append(propagation.assignment.var)
-    return adjacency_list
-
-def variables_on_decision_level(clause: Clause, level: int) -> List[int]:
-    """Returns the list of variables in given clause that are on the given decision level.
+    def basic_is_conflict(self, clause: List[int]) -> bool:
+        """Checks if the given clause is a conflict under the current assignment or not (without watched literals).
 
-    Parameters
-    ----------
-    clause : Clause
-        The given clause.
-    
-    level : int
-        The given decision level.
-
-    Returns
-    -------
-    List[int]
-        The list of variables in the clause that were assigned on the given decision level.
-    """
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the given clause.
 
-    global trail
-    variables_on_level = [assignment.var for assignment in trail[level].assignments] # the variables that were assigned on the given decision level
-    return [abs(literal) for literal in clause if abs(literal) in variables_on_level]
+        Returns
+        -------
+        bool
+            True if the clause is a conflict under the current assignment, False otherwise.
+        """
 
-
-
-# ===========================================================================
-# ================================ decisions ================================
-# ===========================================================================
-
-def select_variable() -> Optional[int]:
-    """Decides which variable to select for a decision.
-
-    Returns
-    -------
-    Optional[int]
-        The selected variable. None if every variable is assigned.
-    """
-
-    # only use this method if watched literals are turned on
-    if not config.VSIDS:
-        return basic_selection()
-    # here the actual method
-    
-    global vsids, assignments
-    max_indices = []    # indices of the variables with the highest counter
-    max_counter = -1    # max counter
-    for index, counter in enumerate(vsids.counters):
-        # if there's a higher scoring variable that is not assigned yet, we prefer it
-        if assignments[index + 1] is None:  # only look at unassigned variables
-            if counter > max_counter:   # higher counter
-                max_indices = [index]   # all the previous max indices are now not max anymore
-                max_counter = counter   # update counter
-            elif counter == max_counter:    # if there's a variable with the same score, add it to the list of max scoring variables
-                max_indices.append(index)
-    if len(max_indices) != 0:
-        return random.choice(max_indices) + 1   # index (x) -> variable (x + 1)
-    return None
-
-def decide(var: int):
-    """Decides the value of a given variable and adds the assignment to the trail.
-
-    Parameters
-    ----------
-    var : int
-        The variable to be decided.
-    """
-
-    global assignments, trail # we're using these global variables
-    value = variable_decision_heuristic(var)    # what value should be assigned to the variable
-    assignment = Assignment((var, value), trail.decision_level + 1)   # assignment as the type Assignment - will be on a new decision level!
-    assignments.assign(assignment)  # add the assignment to the list of assignments
-    trail.decide(assignment)    # add it to the trail
-    STATS.decide()  # gotta count those decisions
-
-def variable_decision_heuristic(var: int) -> bool:
-    """The suggested value for a given variable.
-
-    Parameters
-    ----------
-    var : int
-        The given variable.
-
-    Returns
-    -------
-    bool
-        The suggested value for the variable assignment.
-    """
-
-    # only use this method if the variable decision heuristic is turned on
-    if not config.DECISION_HEURISTIC:
-        return basic_decision(var)
-    # here the actual method
-    
-    global assignments
-    # we want to maintain the last assignment
-    if assignments.last_assignment(var) is None:
+        for literal in clause: # the clause is a conflict if and only if both watched literals are false
+            if not self.assignments.value(literal) is False:
+                return False    # one of the watched literals is not False -> no conflict
         return True
-    else:
-        return assignments.last_assignment(var)
-
-
 
-# =======================================================================================
-# ================================ basic implementations ================================
-# =======================================================================================
+    def basic_analyse_conflict(self, conflict_clause: int) -> List[int]:
+        """Analyses the current conflict. Very basic.
 
-def basic_decision(var: int) -> bool:
-    """The suggested value for a given variable. Picks randomly.
+        Parameters
+        ----------
+        conflict_clause : int
+            The reference of the conflict that was just found.
 
-    Parameters
-    ----------
-    var : int
-        The given variable.
-
-    Returns
-    -------
-    bool
-        The suggested decision.
-    """
-
-    return random.choice([True, False])
-
-def basic_selection() -> Optional[int]:
-    """Decides which variable to select for a decision. Very basic.
-
-    Returns
-    -------
-    Optional[int]
-        The selected variable. None if every variable is assigned.
-    """
-
-    global assignments
-    for assignment in assignments.assignment_view:
-        if assignment.value is None:
-            return assignment.var
-    return None
-
-def basic_propagate() -> Optional[Clause]:
-    """Basic unit propagation until a conflict is derived.
-
-    Returns
-    -------
-    Optional[Clause]
-        The conflict clause, None if no conflict happened.
-    """
-
-    global assignments, trail, STATS
-    # propagate until a conflict is derived or we have no unit clauses left
-    while unit_clauses := basic_get_unit_clauses():
-        unit_clause = unit_clauses[0]
-        # figure out the only unassigned literal in the unit clause
-        unit = None
-        for literal in unit_clause:
-            if assignments.value(literal) is None:
-                unit = literal  # unit is the only unassigned literal in the clause
-        # figure out the assignment to satisfy the unit
-        var = abs(unit)
-        value = True if unit > 0 else False
-        new_assignment = Assignment((var, value), trail.decision_level)
-        # apply the assignment and add it to the trail - the unit clause is the reason for the assignment.
-        assignments.assign(new_assignment, unit_clause)  # apply the assignment
-        trail.add_propagation(new_assignment, unit_clause)  # add it to the trail
-        STATS.propagate()   # gotta count the UP
-        # check if a conflict was derived anywhere (a conflict can only be derived in unit clauses)
-        for possible_conflict_clause in unit_clauses:
-            if basic_is_conflict(possible_conflict_clause):
-                STATS.conflict()    # gotta count these conflicts
-                return possible_conflict_clause
-        # go again with another unit clause
-    # there are no more unit clauses left and no conflict was derived
-    return None
-
-def basic_get_unit_clauses() -> List[Clause]:
-    """Gets unit clauses in a very basic way without watched literals.
-
-    Returns
-    -------
-    List[Clause]
-        The clauses that are unit under the current assignment.
-    """
-
-    global original_formula
-    return [clause for clause in original_formula if basic_is_unit(clause)]
-
-def basic_is_unit(clause: Clause) -> bool:
-    """Basic check if the clause is unit under the current assignment.
-
-    Parameters
-    ----------
-    clause : Clause
-        The given clause.
-
-    Returns
-    -------
-    bool
-        True if the clause is unit, False otherwise.
-    """
-
-    global assignments
-    unassigned_literals = [literal for literal in clause if assignments.value(literal) is None]
-    has_satisfied_literal = False
-    for literal in clause:
-        if assignments.value(literal) is True:
-            has_satisfied_literal = True
-            break
-    return not has_satisfied_literal and len(unassigned_literals) == 1  # if we only have 1 unassigned literal and no satisfied literals, it's unit
-
-def basic_is_conflict(clause: Clause) -> bool:
-    """Checks if the given clause is a conflict under the current assignment or not (without watched literals).
-
-    Parameters
-    ----------
-    clause : Clause
-        The given clause.
-
-    Returns
-    -------
-    bool
-        True if the clause is a conflict under the current assignment, False otherwise.
-    """
-
-    global assignments
-    for literal in clause: # the clause is a conflict if and only if both watched literals are false
-        if not assignments.value(literal) is False:
-            return False    # one of the watched literals is not False -> no conflict
-    return True
-
-def basic_analyse_conflict(conflict_clause: Clause) -> Clause:
-    """Analyses the current conflict. Very basic.
-
-    Parameters
-    ----------
-    conflict_clause : Clause
-        The conflict that was just found.
-
-    Returns
-    -------
-    Clause
-        The clause to be learned.
-    """
+        Returns
+        -------
+        List[int]
+            The clause to be learned.
+        """
 
-    global trail
-    learned_literals = []
-    for level in trail:
-        if level.decision:  # not 0th decision level
-            literal_learned = -level.decision.var if level.decision.value else level.decision.var
-            learned_literals.append(literal_learned)
-    return Clause(learned_literals)
+        self.bump_variables(self.formula.literals(conflict_clause))
+        self.vsids_conflict()
+        return [-self.trail.decision(level) for level in range(1, self.trail.decision_level + 1)]   # the negated decisions
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
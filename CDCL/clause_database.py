@@ -0,0 +1,265 @@
+from typing import Iterable, Optional
+from array import array
+from data_structures import Formula, HEADER_SIZE, SIZE, FLAGS, LBD, DELETED, CORE, TIER2
+from preprocessing import signature, subsumption
+from proof import DRATWriter
+
+class ClauseDatabase:
+    """Manages the learned clauses of a formula, so they don't grow without bound.
+    Every learned clause is scored with its literal block distance (LBD, number of different decision levels in the clause) and an activity (bumped when the clause takes part in a conflict).
+    Learned clauses are divided into 3 tiers:
+    - core: LBD <= core_lbd, kept forever
+    - tier2: LBD <= tier2_lbd, kept as long as they are used, moved to local otherwise
+    - local: everything else, the worst half is deleted with every reduction
+    """
+
+    def __init__(self, formula: Formula, first_reduction: int = 2000, reduction_increment: int = 300, core_lbd: int = 2, tier2_lbd: int = 6, tier2_unused_conflicts: int = 10000, activity_decay: float = 0.999, proof: Optional[DRATWriter] = None):
+        """Creates a clause database for the learned clauses of a formula.
+
+        Parameters
+        ----------
+        formula : Formula
+            The formula that the clauses are learned in.
+        first_reduction : int, optional
+            Number of conflicts until the first reduction, by default 2000
+        reduction_increment : int, optional
+            The number of conflicts between 2 reductions grows by this with every reduction, by default 300
+        core_lbd : int, optional
+            Learned clauses with an LBD up to this are in the core tier, by default 2
+        tier2_lbd : int, optional
+            Learned clauses with an LBD up to this are in tier 2, by default 6
+        tier2_unused_conflicts : int, optional
+            Clauses in tier 2 that were not used in this many conflicts are moved to the local tier, by default 10000
+        activity_decay : float, optional
+            The activities of all clauses are multiplied by this with every conflict, by default 0.999
+        proof : Optional[DRATWriter], optional
+            Where the deleted clauses are written as DRAT deletions, by default None
+        """
+
+        self.formula = formula
+        self.first_reduction = first_reduction
+        self.reduction_increment = reduction_increment
+        self.core_lbd = core_lbd
+        self.tier2_lbd = tier2_lbd
+        self.tier2_unused_conflicts = tier2_unused_conflicts
+        self.activity_decay = activity_decay
+        self.proof = proof
+        self.activities = {}    # clause reference -> activity
+        self.last_used = {}     # clause reference -> conflict in which the clause was last used
+        self.increment = 1      # the amount that a clause activity is bumped by. Grows instead of decaying all the activities.
+        self.conflicts = 0
+        self.reductions = 0
+        self.next_reduction = first_reduction
+
+    @staticmethod
+    def lbd(literals: Iterable[int], decision_levels: array) -> int:
+        """Computes the literal block distance of a clause whose literals are all assigned.
+
+        Parameters
+        ----------
+        literals : Iterable[int]
+            The literals of the clause.
+        decision_levels : array
+            The decision level of every variable.
+
+        Returns
+        -------
+        int
+            The number of different decision levels of the literals.
+        """
+
+        return len({decision_levels[abs(literal)] for literal in literals})
+
+    def tier(self, lbd: int) -> int:
+        """The tier flag for a clause with the given LBD.
+
+        Parameters
+        ----------
+        lbd : int
+            The literal block distance of the clause.
+
+        Returns
+        -------
+        int
+            CORE, TIER2 or 0 for the local tier.
+        """
+
+        if lbd <= self.core_lbd:
+            return CORE
+        if lbd <= self.tier2_lbd:
+            return TIER2
+        return 0
+
+    def learn(self, reference: int, conflict: bool = True):
+        """Registers a clause that was just learned. Its LBD has to be stored in the arena already.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the learned clause.
+        conflict : bool, optional
+            If the clause was learned from a conflict, by default True. Clauses that were learned somewhere else don't count as conflicts.
+        """
+
+        data = self.formula.arena.data
+        data[reference + FLAGS] |= self.tier(data[reference + LBD])
+        self.activities[reference] = self.increment
+        self.last_used[reference] = self.conflicts
+        if not conflict:
+            return
+        self.conflicts -=- 1
+        # decay all activities by bumping harder in the future
+        self.increment /= self.activity_decay
+        if self.increment > 1e20:   # rescale before the floats overflow
+            for clause in self.activities:
+                self.activities[clause] *= 1e-20
+            self.increment *= 1e-20
+
+    def bump(self, reference: int, decision_levels: array):
+        """Bumps a learned clause that takes part in a conflict. Its LBD is recomputed and the clause is promoted if it improved.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the learned clause.
+        decision_levels : array
+            The decision level of every variable.
+        """
+
+        data = self.formula.arena.data
+        self.activities[reference] += self.increment
+        self.last_used[reference] = self.conflicts
+        flags = data[reference + FLAGS]
+        if flags & CORE:
+            return  # can't get any better
+        lbd = self.lbd(self.formula.literals(reference), decision_levels)
+        if lbd < data[reference + LBD]:
+            data[reference + LBD] = lbd
+            data[reference + FLAGS] = (flags & ~TIER2) | self.tier(lbd)
+
+    def is_locked(self, reference: int, reasons: array) -> bool:
+        """Checks if a clause is the reason of an assignment, it must not be deleted then.
+        Propagated literals are moved to the front of longer clauses, but binary clauses are propagated without touching the arena, so both of their literals are checked.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the clause.
+        reasons : array
+            The references of the reason clauses of the assignments.
+
+        Returns
+        -------
+        bool
+            True if the clause is locked, False otherwise.
+        """
+
+        data = self.formula.arena.data
+        start = reference + HEADER_SIZE
+        return reasons[abs(data[start])] == reference or (data[reference + SIZE] == 2 and reasons[abs(data[start + 1])] == reference)
+
+    def reduction_due(self) -> bool:
+        return self.conflicts >= self.next_reduction
+
+    def subsume(self, reasons: array, limit: int = 100000) -> int:
+        """Deletes the learned clauses that are subsumed by another clause (original or learned). Clauses that are the reason of an assignment are kept.
+        The deleted clauses are only marked, the next reduction throws them out.
+
+        Parameters
+        ----------
+        reasons : array
+            The references of the reason clauses of the assignments.
+        limit : int, optional
+            The number of subset checks that may be done, by default 100000
+
+        Returns
+        -------
+        int
+            The number of deleted clauses.
+        """
+
+        formula = self.formula
+        data = formula.arena.data
+        # occurrence lists and signatures of the learned clauses, they are the ones that can be deleted
+        occurrences = {}
+        signatures = {}
+        for reference in formula.learned_clauses:
+            if data[reference + FLAGS] & DELETED:
+                continue
+            literals = formula.literals(reference)
+            signatures[reference] = signature(literals)
+            for literal in literals:
+                occurrences.setdefault(literal, []).append(reference)
+        deleted = 0
+        # short clauses first, they subsume the most
+        for reference in sorted(formula, key = formula.arena.size):
+            if limit <= 0:
+                break
+            if data[reference + FLAGS] & DELETED or data[reference + SIZE] == 0:
+                continue
+            literals = formula.literals(reference)
+            # only the learned clauses in the shortest occurrence list of a literal of the clause can be subsumed by it
+            pivot = min(literals, key = lambda literal: len(occurrences.get(literal, ())))
+            clause_signature = signatures[reference] if reference in signatures else signature(literals)
+            for other in occurrences.get(pivot, ()):
+                if other == reference or data[other + FLAGS] & DELETED or data[other + SIZE] < len(literals) or clause_signature & ~signatures[other]:
+                    continue
+                limit -= 1
+                if subsumption(literals, formula.literals(other)) != 0:
+                    continue    # not a subset (strengthening is left to the preprocessing)
+                if self.is_locked(other, reasons):
+                    continue
+                if self.proof is not None:
+                    self.proof.delete(formula.literals(other))
+                formula.delete(other)
+                del self.activities[other]
+                del self.last_used[other]
+                deleted -=- 1
+        return deleted
+
+    def reduce(self, reasons: array) -> int:
+        """Demotes the unused clauses in tier 2 and deletes the worst half of the local tier. Clauses that are the reason of an assignment are kept.
+
+        Parameters
+        ----------
+        reasons : array
+            The references of the reason clauses of the assignments. They are updated if the arena is compacted.
+
+        Returns
+        -------
+        int
+            The number of deleted clauses.
+        """
+
+        data = self.formula.arena.data
+        local_clauses = []
+        for reference in self.formula.learned_clauses:
+            flags = data[reference + FLAGS]
+            if flags & (CORE | DELETED):
+                continue
+            if flags & TIER2:
+                if self.conflicts - self.last_used[reference] <= self.tier2_unused_conflicts:
+                    continue
+                data[reference + FLAGS] = flags & ~TIER2  # not used in a while, demote to local
+            local_clauses.append(reference)
+        # worst first: high LBD, then low activity
+        local_clauses.sort(key = lambda reference: (-data[reference + LBD], self.activities[reference]))
+        deleted = 0
+        for reference in local_clauses[:len(local_clauses) // 2]:
+            if self.is_locked(reference, reasons):
+                continue
+            if self.proof is not None:
+                self.proof.delete(self.formula.literals(reference))
+            self.formula.delete(reference)
+            del self.activities[reference]
+            del self.last_used[reference]
+            deleted -=- 1
+        # throw the deleted clauses out and update the references if they moved
+        relocation = self.formula.collect_garbage(reasons)
+        if relocation is not None:
+            self.activities = {relocation[reference]: activity for reference, activity in self.activities.items()}
+            self.last_used = {relocation[reference]: conflict for reference, conflict in self.last_used.items()}
+        # schedule the next reduction
+        self.reductions -=- 1
+        self.next_reduction = self.conflicts + self.first_reduction + self.reduction_increment * self.reductions
+        return deleted
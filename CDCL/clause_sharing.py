@@ -0,0 +1,117 @@
+from typing import List
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+POSITION_SIZE = 8   # bytes of the write position in front of the ring
+RECORD_HEADER_SIZE = 3  # every clause in the ring starts with (worker, lbd, size), followed by its literals
+
+class ClauseExchange:
+    """A ring buffer of ints in shared memory that parallel workers use to share learned clauses.
+    Writers take a lock, so records are never torn. Every reader keeps its own read position and takes the lock only while it copies the new records.
+    Readers that fall behind by more than the capacity skip the clauses they missed.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        """Creates the shared memory for the exchange. It has to be created before the workers are started, they get a copy of the object.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            The number of ints that fit into the ring, by default 1 << 16
+        """
+
+        self.capacity = capacity
+        self.memory = SharedMemory(create = True, size = POSITION_SIZE + 4 * capacity)
+        self.lock = mp.Lock()
+        self.read_position = 0  # the position up to which this process has read, every process has its own
+        self.map_memory()
+
+    def map_memory(self):
+        """Creates the views on the shared memory: the write position (number of ints ever written) and the ring.
+        """
+
+        self.write_position = self.memory.buf[:POSITION_SIZE].cast('q')
+        self.ring = self.memory.buf[POSITION_SIZE:].cast('i')
+
+    def __getstate__(self):
+        # memoryviews can't be sent to other processes, they are mapped again
+        state = self.__dict__.copy()
+        del state["write_position"], state["ring"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.map_memory()
+
+    def export(self, worker: int, literals: List[int], lbd: int):
+        """Writes a clause into the ring.
+
+        Parameters
+        ----------
+        worker : int
+            The worker that learned the clause.
+        literals : List[int]
+            The literals of the clause.
+        lbd : int
+            The literal block distance of the clause.
+        """
+
+        record = [worker, lbd, len(literals)] + list(literals)
+        if len(record) > self.capacity:
+            return  # would overwrite itself
+        with self.lock:
+            position = self.write_position[0]
+            for value in record:
+                self.ring[position % self.capacity] = value
+                position -=- 1
+            self.write_position[0] = position
+
+    def receive(self, worker: int) -> List[tuple]:
+        """Reads the clauses that the other workers wrote since the last call.
+
+        Parameters
+        ----------
+        worker : int
+            The worker that reads, its own clauses are skipped.
+
+        Returns
+        -------
+        List[tuple]
+            The new clauses of the other workers as (literals, lbd).
+        """
+
+        with self.lock:
+            end = self.write_position[0]
+            if end - self.read_position > self.capacity:
+                self.read_position = end    # overwritten already, we can't find the start of a record anymore
+            start = self.read_position % self.capacity
+            length = end - self.read_position
+            if start + length <= self.capacity:
+                data = self.ring[start:start + length].tolist()
+            else:   # wrapped around
+                data = self.ring[start:].tolist() + self.ring[:start + length - self.capacity].tolist()
+        self.read_position = end
+        clauses = []
+        index = 0
+        while index < len(data):
+            writer, lbd, size = data[index:index + RECORD_HEADER_SIZE]
+            index -=- RECORD_HEADER_SIZE
+            if writer != worker:
+                clauses.append((data[index:index + size], lbd))
+            index -=- size
+        return clauses
+
+    def close(self, unlink: bool = False):
+        """Releases the shared memory of this process.
+
+        Parameters
+        ----------
+        unlink : bool, optional
+            If the shared memory should be destroyed (only by the process that created it), by default False
+        """
+
+        self.write_position.release()
+        self.ring.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
@@ -0,0 +1,341 @@
+#!/bin/python3
+# SHEBANG
+
+import os, sys, argparse, threading, queue, time
+import multiprocessing as mp
+from typing import List, Optional, Tuple
+from tabulate import tabulate
+
+# add the global lib directory to the path so i can import read_dimacs and the stats
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
+import read_dimacs as dimacs
+from stats import CDCLStats
+from data_structures import Assignments
+from cdcl import CDCLSolver
+import config
+
+STOP_POLL_INTERVAL = 0.01   # seconds between two looks of a worker at the stop flag
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        metavar = 'input',
+        dest = 'input',
+        type = str,
+        help = 'Input file where DIMACS notation of a formula is stored.'
+    )
+    parser.add_argument(
+        '-d',
+        '--depth',
+        dest = 'depth',
+        type = int,
+        default = 4,
+        help = 'Depth of the lookahead splitting, at most 2^depth cubes are created.'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        dest = 'workers',
+        type = int,
+        default = None,
+        help = 'Number of worker processes (default: one per core).'
+    )
+    parser.add_argument(
+        '--show-assignments',
+        dest = 'show_assignments',
+        action = 'store_true',
+        default = False,
+        help = 'Show the assignments if it is satisfiable.'
+    )
+    parser.add_argument(
+        '-s',
+        '--stats',
+        dest = 'show_stats',
+        action = 'store_true',
+        default = False,
+        help = 'Show the stats of all workers together and the time spent on every cube.'
+    )
+    args = parser.parse_args()
+
+    with open(args.input, "r") as f:
+        lines = f.readlines()
+        formula = dimacs.read_cnf(lines)
+        n = dimacs.get_variables_in_dimacs(lines)
+    # solve the thing
+    solver = CubeAndConquer(formula, n, args.depth, args.workers)
+    satisfiable = solver.solve()
+    # print results
+    if satisfiable:
+        print("Satisfiable")
+        if args.show_assignments:
+            print(f"Assignments:\n{solver.assignments}")
+    elif satisfiable is None:
+        print("Unknown")
+    else:
+        print("Unsatisfiable")
+    # print stats
+    if args.show_stats:
+        print(f"Lookahead Time: {round(solver.lookahead_time, 2)} s")
+        print(solver.format_cube_times())
+        print(solver.stats)
+
+# ===========================================================================
+# ================================ lookahead ================================
+# ===========================================================================
+
+def lookahead(solver: CDCLSolver, candidates: List[int]) -> Optional[int]:
+    """Picks the variable whose assignment propagates the most in both directions. The solver has to be propagated without conflicts.
+
+    Parameters
+    ----------
+    solver : CDCLSolver
+        The solver with the current cube decided.
+    candidates : List[int]
+        The variables that are looked at.
+
+    Returns
+    -------
+    Optional[int]
+        The best variable to split on, None if all candidates are assigned.
+    """
+
+    level = solver.trail.decision_level
+    best_variable, best_score = None, -1
+    for var in candidates:
+        if solver.assignments[var] is not None:
+            continue
+        score = 1
+        for literal in (var, -var):
+            start = len(solver.trail)
+            solver.decide_literal(literal)
+            if solver.propagate() is None:
+                implied = len(solver.trail) - start
+            else:
+                implied = solver.n  # a failed literal: that half of the split is refuted right away
+            solver.backtrack_to(level)
+            score *= implied
+        # the product prefers variables that shrink both halves of the split
+        if score > best_score:
+            best_variable, best_score = var, score
+    return best_variable
+
+def split(solver: CDCLSolver, candidates: List[int], depth: int, cube: List[int], cubes: List[List[int]]):
+    """Splits the search space below a cube on the variables picked by the lookahead. The cube has to be decided and propagated without conflicts.
+
+    Parameters
+    ----------
+    solver : CDCLSolver
+        The solver with the cube decided.
+    candidates : List[int]
+        The variables that the lookahead looks at.
+    depth : int
+        The remaining depth of the splitting.
+    cube : List[int]
+        The decided literals.
+    cubes : List[List[int]]
+        Where the cubes at the leaves are collected. Branches that are refuted by propagation are left out.
+    """
+
+    if depth == 0 or (var := lookahead(solver, candidates)) is None:
+        cubes.append(cube)
+        return
+    level = solver.trail.decision_level
+    for literal in (var, -var):
+        solver.decide_literal(literal)
+        if solver.propagate() is None:
+            split(solver, candidates, depth - 1, cube + [literal], cubes)
+        solver.backtrack_to(level)
+
+def create_cubes(formula: List[List[int]], n: int, depth: int, candidates: int, solver_config = config) -> Optional[List[List[int]]]:
+    """Creates at most 2^depth cubes whose union covers all the models of the formula.
+
+    Parameters
+    ----------
+    formula : List[List[int]]
+        The clauses of the formula.
+    n : int
+        The number of variables.
+    depth : int
+        The depth of the splitting.
+    candidates : int
+        The number of variables that the lookahead looks at (the ones that occur most often).
+    solver_config : module, optional
+        The config of the solver that propagates, by default the default config
+
+    Returns
+    -------
+    Optional[List[List[int]]]
+        The cubes, None if the formula is unsatisfiable by unit propagation.
+    """
+
+    solver = CDCLSolver(formula, n, solver_config)
+    if solver.unsatisfiable or solver.propagate() is not None:
+        return None
+    # the variables that occur most often are the most likely to propagate a lot
+    occurrences = [0] * (n + 1)
+    for clause in formula:
+        for literal in clause:
+            occurrences[abs(literal)] -=- 1
+    variables = sorted(range(1, n + 1), key = lambda var: occurrences[var], reverse = True)
+    cubes = []
+    split(solver, variables[:candidates], depth, [], cubes)
+    return cubes
+
+# =========================================================================
+# ================================ conquer ================================
+# =========================================================================
+
+def run_worker(worker: int, formula: List[List[int]], n: int, solver_config, frozen: List[int], tasks, results, stop):
+    """Solves cubes from the task queue as assumptions in a worker process, until the queue is empty or the stop flag is set.
+    Puts (worker, cube index, satisfiable, model, time, stats) for every cube and (worker, None, ...) at the end.
+    One solver is used for all the cubes, so learned clauses carry over.
+
+    Parameters
+    ----------
+    worker : int
+        The index of the worker.
+    formula : List[List[int]]
+        The clauses of the formula.
+    n : int
+        The number of variables.
+    solver_config : module
+        The config of the solver.
+    frozen : List[int]
+        The variables of the cubes, they must not be eliminated by the preprocessing.
+    tasks : multiprocessing.Queue
+        The cubes as (index, cube), None means there are no more cubes.
+    results : multiprocessing.Queue
+        Where the results are put.
+    stop : multiprocessing.Value
+        Set to 1 when a cube was satisfiable.
+    """
+
+    solver = CDCLSolver(formula, n, solver_config)
+    solver.freeze(frozen)
+    # wait for the stop flag on the side, so the solver doesn't have to look at it all the time
+    def wait_for_stop():
+        while not stop.value:
+            time.sleep(STOP_POLL_INTERVAL)
+        solver.interrupt()
+    threading.Thread(target = wait_for_stop, daemon = True).start()
+    # idle workers take the next cube, so nobody waits for a worker that got the hard cubes
+    while not stop.value and (task := tasks.get()) is not None:
+        index, cube = task
+        satisfiable = solver.solve(cube)
+        model = [literal for literal in solver.trail] if satisfiable else None
+        results.put((worker, index, satisfiable, model, solver.stats.get_measurement_by_name("Process Time").value or 0, solver.stats))
+    results.put((worker, None, None, None, 0, None))
+
+class CubeAndConquer:
+    """Splits a formula into cubes with a lookahead and solves the cubes as assumptions on a pool of CDCL workers.
+    Stops as soon as a cube is satisfiable, the formula is unsatisfiable if all cubes are refuted.
+    """
+
+    def __init__(self, formula: List[List[int]], n: int, depth: int = 4, workers: Optional[int] = None, candidates: int = 50, solver_config = config):
+        """Creates the cube and conquer solver for a formula.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        depth : int, optional
+            The depth of the splitting, at most 2^depth cubes are created, by default 4
+        workers : Optional[int], optional
+            The number of worker processes, by default one per core
+        candidates : int, optional
+            The number of variables that the lookahead looks at, by default 50
+        solver_config : module, optional
+            The config of the solvers, by default the default config
+        """
+
+        self.formula = formula
+        self.n = n
+        self.depth = depth
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.candidates = candidates
+        self.config = solver_config
+        self.cubes: List[List[int]] = []
+        self.cube_times: List[Tuple[List[int], Optional[bool], float]] = []   # (cube, result, process time) for every cube that was worked on
+        self.lookahead_time = 0.0
+        self.assignments = Assignments(n)   # the model if the formula is satisfiable
+        self.stats = CDCLStats()    # stats of all workers together
+
+    def solve(self) -> Optional[bool]:
+        """Creates the cubes and solves them.
+
+        Returns
+        -------
+        Optional[bool]
+            True if the formula is satisfiable, False otherwise, None if a worker died before all cubes were refuted.
+        """
+
+        # cube
+        start = time.process_time()
+        cubes = create_cubes(self.formula, self.n, self.depth, self.candidates, self.config)
+        self.lookahead_time = time.process_time() - start
+        if cubes is None:
+            return False
+        self.cubes = cubes
+        # conquer
+        frozen = sorted({abs(literal) for cube in cubes for literal in cube})    # every cube is assumed by the same solver
+        tasks, results, stop = mp.Queue(), mp.Queue(), mp.Value('b', 0)
+        for task in enumerate(cubes):
+            tasks.put(task)
+        workers = min(self.workers, len(cubes))
+        for _ in range(workers):
+            tasks.put(None) # tells a worker that there are no cubes left
+        processes = [
+            mp.Process(target = run_worker, args = (worker, self.formula, self.n, self.config, frozen, tasks, results, stop), daemon = True)
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        satisfiable = False
+        refuted = 0
+        finished = 0
+        while finished < workers:
+            try:
+                worker, index, cube_satisfiable, model, cube_time, cube_stats = results.get(timeout = STOP_POLL_INTERVAL)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break   # a worker died without finishing, nobody is left to answer
+                continue
+            if index is None:
+                finished -=- 1  # the worker is done
+                continue
+            self.cube_times.append((cubes[index], cube_satisfiable, cube_time))
+            self.stats.merge(cube_stats)
+            if cube_satisfiable is False:
+                refuted -=- 1
+            if cube_satisfiable and not satisfiable:
+                # a model for one cube is a model for the formula, everybody else can stop
+                satisfiable = True
+                for literal in model:
+                    self.assignments.assign(literal, 0)
+                stop.value = 1
+        tasks.cancel_join_thread()  # cubes that nobody took anymore don't have to be delivered
+        for process in processes:
+            process.join()
+        if not satisfiable and refuted < len(cubes):
+            return None # the cubes of a dead worker were never refuted
+        return satisfiable
+
+    def format_cube_times(self) -> str:
+        """The time spent on every cube as a table, so the depth can be tuned.
+
+        Returns
+        -------
+        str
+            The table.
+        """
+
+        results = {True: "SAT", False: "UNSAT", None: "stopped"}
+        return tabulate(
+            [[" ".join(map(str, cube)), results[result], f"{round(cube_time, 3)} s"] for cube, result, cube_time in self.cube_times],
+            headers = ["Cube", "Result", "Process Time"]
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,92 +1,282 @@
 from typing import List, Tuple, Optional
 from collections.abc import Sequence, Collection
-import config
+from array import array
+from itertools import chain
+import random
+
+# values of literals in the assignment
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+VALUES = (None, True, False)    # value as extended boolean, indexed by the values above
+NO_REASON = -1  # clause reference for decisions and unassigned variables
+
+# layout of a clause in the arena: header (size, flags, lbd), then the literals
+HEADER_SIZE = 3
+SIZE = 0    # offset of the size in the header
+FLAGS = 1   # offset of the flags in the header
+LBD = 2     # offset of the literal block distance in the header (only for learned clauses)
+LEARNED = 1 # flag for learned clauses
+DELETED = 2 # flag for deleted clauses
+CORE = 4    # flag for learned clauses in the core tier
+TIER2 = 8   # flag for learned clauses in tier 2 (learned clauses without a tier flag are in the local tier)
+
+class ClauseArena:
+    """Stores all clauses in one contiguous int buffer. A clause is referenced by its offset in the buffer.
+    Every clause starts with a header (size, flags, lbd), followed by its literals.
+    """
 
-def negate(boolean: Optional[bool]):
-    """Negates the given extended boolean (None stays None).
-    This is important as normal negation in python (not boolean) turns None into True.
-    The negation of an unassigned literal would therefore be True, we do not want that.
+    def __init__(self):
+        self.data = array('i')
+        self.wasted = 0 # number of ints in the buffer that belong to deleted clauses
+    
+    def add(self, literals: List[int], learned: bool = False, lbd: int = 0) -> int:
+        """Appends a clause to the buffer.
 
-    Parameters
-    ----------
-    boolean : Optional[bool]
-        The given boolean.
-    """
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+        learned : bool, optional
+            If the clause is learned, by default False
+        lbd : int, optional
+            The literal block distance of the clause, by default 0
 
-    if boolean is None:
-        return None
-    return not boolean
+        Returns
+        -------
+        int
+            The reference (offset) of the clause.
+        """
 
-class Clause(Sequence):
-    def __init__(self, literals: List[int]):
-        self.literals = list(dict.fromkeys(literals))   # same list as literals, just removes duplicates
-        self.watched_literals = self.literals[:2]  # watch the first 2 literals in the clause - only 1 wide if the clause is already unit
+        reference = len(self.data)
+        self.data.append(len(literals))
+        self.data.append(LEARNED if learned else 0)
+        self.data.append(lbd)
+        self.data.extend(literals)
+        return reference
+    
+    def size(self, reference: int) -> int:
+        return self.data[reference + SIZE]
     
-    def literals_iter(self, offset: int):
-        """Iterate over the literals with a given index offset modulo the clause length (one full loop around the clause).
+    def literals(self, reference: int) -> array:
+        """Returns a copy of the literals of a clause.
 
         Parameters
         ----------
-        offset : int
-            The given index offset.
+        reference : int
+            The reference of the clause.
+
+        Returns
+        -------
+        array
+            The literals.
         """
 
-        for index in range(len(self.literals)):
-            yield self.literals[(offset + index) % len(self.literals)]
+        start = reference + HEADER_SIZE
+        return self.data[start:start + self.data[reference + SIZE]]
     
-    def __iter__(self):
-        return iter(self.literals)
+    def is_learned(self, reference: int) -> bool:
+        return bool(self.data[reference + FLAGS] & LEARNED)
     
-    def __getitem__(self, key: int):
-        return self.literals[key]
+    def is_deleted(self, reference: int) -> bool:
+        return bool(self.data[reference + FLAGS] & DELETED)
     
-    def __len__(self):
-        return len(self.literals)
+    def lbd(self, reference: int) -> int:
+        return self.data[reference + LBD]
     
-    def __str__(self):
-        return str(self.literals)
+    def delete(self, reference: int):
+        """Marks a clause as deleted. The memory is freed with the next compaction.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the clause.
+        """
+
+        self.data[reference + FLAGS] |= DELETED
+        self.wasted += HEADER_SIZE + self.data[reference + SIZE]
+    
+    def compact(self) -> dict:
+        """Moves all clauses that are not deleted to the front of the buffer, so the deleted ones are freed.
+
+        Returns
+        -------
+        dict
+            The new reference for every old reference of a clause that is not deleted.
+        """
+
+        data = self.data
+        relocation = {}
+        new_data = array('i')
+        reference = 0
+        while reference < len(data):
+            end = reference + HEADER_SIZE + data[reference + SIZE]
+            if not data[reference + FLAGS] & DELETED:
+                relocation[reference] = len(new_data)
+                new_data.extend(data[reference:end])
+            reference = end
+        self.data = new_data
+        self.wasted = 0
+        return relocation
+    
+    def __len__(self):
+        return len(self.data)
 
 class Formula:
     """The formula is a conjuction of clauses. It can be divided into orginial clauses and learned clause.
+    All clauses are stored in a clause arena and referenced by their offset in it. The first 2 literals of a clause are the watched literals.
+    Every literal has a list of the references to the clauses that watch it (watch lists). Every watch comes with a blocker, a literal of the clause: if it is true, the clause is satisfied and doesn't have to be looked at.
+    Binary clauses are not watched, every literal has a list of the literals it implies through a binary clause instead (implication lists). They never have to move a watch.
     """
 
-    def __init__(self, clauses: List[Clause]):
-        self.original_clauses = clauses
-        self.learned_clauses = []
+    def __init__(self, clauses: List[List[int]], n: int):
+        """Creates a formula and the watch lists for its clauses.
+
+        Parameters
+        ----------
+        clauses : List[List[int]]
+            The original clauses.
+        n : int
+            The number of variables.
+        """
+
+        self.arena = ClauseArena()
+        self.original_clauses: List[int] = []   # references of the original clauses
+        self.learned_clauses: List[int] = []    # references of the learned clauses
+        # (reference, blocker) of the clauses watching literal (x) are stored at index x. Negative literals use python's negative indices, so (-x) is stored at index 2n + 1 - x.
+        self.watches: List[List[Tuple[int, int]]] = [[] for _ in range(2 * n + 1)]
+        # (y, reference) is stored at index x for every binary clause (-x, y): if (x) is true, (y) has to be true as well. Same indexing as the watch lists.
+        self.implications: List[List[Tuple[int, int]]] = [[] for _ in range(2 * n + 1)]
+        for clause in clauses:
+            self.original_clauses.append(self.add_clause(list(dict.fromkeys(clause))))  # removes duplicate literals
+    
+    def add_clause(self, literals: List[int], learned: bool = False, lbd: int = 0) -> int:
+        """Stores the clause in the arena and adds it to the watch lists of its first 2 literals. Binary clauses are added to the implication lists instead.
+        Clauses that are only 1 wide are not watched, they are satisfied on decision level 0.
+
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+        learned : bool, optional
+            If the clause is learned, by default False
+        lbd : int, optional
+            The literal block distance of the clause, by default 0
+
+        Returns
+        -------
+        int
+            The reference of the clause.
+        """
+
+        reference = self.arena.add(literals, learned, lbd)
+        if len(literals) == 2:
+            first, second = literals
+            self.implications[-first].append((second, reference))
+            self.implications[-second].append((first, reference))
+        elif len(literals) > 2:
+            # the other watched literal is the first blocker
+            self.watches[literals[0]].append((reference, literals[1]))
+            self.watches[literals[1]].append((reference, literals[0]))
+        return reference
+    
+    def literals(self, reference: int) -> array:
+        """Returns the literals of a clause.
+
+        Parameters
+        ----------
+        reference : int
+            The reference of the clause.
+
+        Returns
+        -------
+        array
+            The literals.
+        """
+
+        return self.arena.literals(reference)
     
     def __iter__(self):
-        return iter(self.original_clauses + self.learned_clauses)
+        """Iterates over the references of the original and learned clauses.
+        """
+
+        return chain(self.original_clauses, self.learned_clauses)
     
     def __str__(self):
-        return f"original: {str([[literal for literal in clause] for clause in self.original_clauses])}\nlearned: {str([[literal for literal in clause] for clause in self.learned_clauses])}"
+        return f"original: {str([list(self.literals(reference)) for reference in self.original_clauses])}\nlearned: {str([list(self.literals(reference)) for reference in self.learned_clauses])}"
     
-    def learn(self, clause: Clause):
-        self.learned_clauses.append(clause)
+    def learn(self, literals: List[int], lbd: int = 0) -> int:
+        """Learns a clause. The first 2 literals are going to be watched.
 
-class Assignment:
-    """Single variable assignment.
-    """
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the learned clause.
+        lbd : int, optional
+            The literal block distance of the clause, by default 0
 
-    def __init__(self, assignment: Tuple[int, Optional[bool]], decision_level: int):
-        """Creates an assignment.
+        Returns
+        -------
+        int
+            The reference of the learned clause.
+        """
+
+        reference = self.add_clause(literals, learned = True, lbd = lbd)
+        self.learned_clauses.append(reference)
+        return reference
+    
+    def delete(self, reference: int):
+        """Marks a clause as deleted. It must not be the reason of an assignment.
+        It stays in the watch lists and the lists of clauses until collect_garbage is called, which has to happen before the next propagation.
 
         Parameters
         ----------
-        assignment : Tuple[int, Optional[bool]]
-            The actual assignment - the variable and the value assigned.
-        decision_level : int
-            The decision level at which the assignment is applied.
+        reference : int
+            The reference of the clause.
         """
-        
-        self.var = assignment[0]
-        self.value = assignment[1]
-        self.decision_level = decision_level
+
+        self.arena.delete(reference)
     
-    def __str__(self):
-        return str((self.var, self.value))
+    def collect_garbage(self, reasons: array) -> Optional[dict]:
+        """Removes the deleted clauses from the watch lists, the implication lists and the lists of clauses.
+        Compacts the arena if a lot of its memory is wasted by deleted clauses, all references are updated then.
+
+        Parameters
+        ----------
+        reasons : array
+            The references of the reason clauses of the assignments. They are updated as well.
+
+        Returns
+        -------
+        Optional[dict]
+            The new reference for every old reference of a clause that is not deleted, None if the arena was not compacted.
+        """
+
+        data = self.arena.data
+        is_alive = lambda reference: not data[reference + FLAGS] & DELETED
+        if self.arena.wasted * 2 < len(self.arena):   # compaction is not worth it yet, only throw the deleted clauses out
+            self.original_clauses = list(filter(is_alive, self.original_clauses))
+            self.learned_clauses = list(filter(is_alive, self.learned_clauses))
+            for literal, watchers in enumerate(self.watches):
+                self.watches[literal] = [(reference, blocker) for reference, blocker in watchers if is_alive(reference)]
+            for literal, implied_literals in enumerate(self.implications):
+                self.implications[literal] = [(implied, reference) for implied, reference in implied_literals if is_alive(reference)]
+            return None
+        relocation = self.arena.compact()
+        self.original_clauses = [relocation[reference] for reference in self.original_clauses if reference in relocation]
+        self.learned_clauses = [relocation[reference] for reference in self.learned_clauses if reference in relocation]
+        for literal, watchers in enumerate(self.watches):
+            self.watches[literal] = [(relocation[reference], blocker) for reference, blocker in watchers if reference in relocation]
+        for literal, implied_literals in enumerate(self.implications):
+            self.implications[literal] = [(implied, relocation[reference]) for implied, reference in implied_literals if reference in relocation]
+        for var, reference in enumerate(reasons):
+            if reference != NO_REASON:
+                reasons[var] = relocation.get(reference, NO_REASON)    # reasons on decision level 0 might have been deleted, they are never looked at
+        return relocation
 
 class Assignments(Sequence):
     """Partial assignment with fast access times.
+    Values are stored per literal, so looking up a literal doesn't depend on its sign. Everything else is stored per variable.
     """
 
     def __init__(self, n: int):
@@ -98,27 +288,28 @@ class Assignments(Sequence):
             Number of variables to be assigned.
         """
 
-        self.values = [None] * n  # generate 'unassigned' for every variable.
-        self.decision_levels = [None] * n   # generate 'no decision level yet' for every variable.
-        self.reasons = [None] * n   # generate 'no reason clause' for every variable
-        self.last_assignments = [None] * n    # this is for the decision heuristic. This stays even if we unassign variables.
-        # Note that the value for every variable x is stored in self.assignments[x-1] since the variables start at 1 and the array starts/list starts at 0.
+        # the value of literal (x) is stored at index x. Negative literals use python's negative indices, so (-x) is stored at index 2n + 1 - x.
+        self.literal_values = bytearray(2 * n + 1)  # generate 'unassigned' (0) for every literal
+        # variable (x) is stored at index x, index 0 is not used
+        self.decision_levels = array('i', [-1]) * (n + 1)   # generate 'no decision level yet' (-1) for every variable
+        self.reasons = array('i', [NO_REASON]) * (n + 1)   # generate 'no reason clause' for every variable
+        self.last_assignments = array('b', [-1]) * (n + 1)    # this is for the decision heuristic. This stays even if we unassign variables. (-1: never assigned, 0: False, 1: True)
+        self.n = n
     
     @property
-    def assignment_view(self) -> List[Assignment]:
-        """Generates a view of the array in form of assignments (see class Assignment).
+    def assignment_view(self):
+        """Generates a view of the assignments in form of (variable, value) pairs, one after the other.
 
-        Returns
-        -------
-        List[Assignment]
-            The assignment view.
+        Yields
+        ------
+        Tuple[int, Optional[bool]]
+            The variable and its value.
         """
 
-        # for every index: return an assignment with variable i+1, its value stored in self.values, and its decision level stored in self.decision_levels
-        return [Assignment((i + 1, self.values[i]), self.decision_levels[i]) for i in range(len(self.values))] # every index holds the value of the variable (index + 1). Now it is brought into a form that fits the class Assignment
-        # variable (n) is stored at index (n-1)
+        for var in range(1, self.n + 1):
+            yield var, VALUES[self.literal_values[var]]
     
-    def __getitem__(self, variable: int) -> bool:
+    def __getitem__(self, variable: int) -> Optional[bool]:
         """Gets the assignment for a given variable.
 
         Parameters
@@ -128,24 +319,11 @@ class Assignments(Sequence):
 
         Returns
         -------
-        bool
+        Optional[bool]
             The assignment of the given variable.
         """
 
-        return self.values[variable - 1]   # variable (n) is stored at index (n-1)
-    
-    def __setitem__(self, variable: int, value: Optional[bool]):
-        """Sets assigns a given value to a given variable.
-
-        Parameters
-        ----------
-        variable : int
-            The given variable.
-        value : Optional[bool]
-            The given value.
-        """
-
-        self.values[variable - 1] = value  # variable (n) is stored at index (n-1)
+        return VALUES[self.literal_values[variable]]
     
     def value(self, literal: int) -> Optional[bool]:
         """Returns the value of a given literal in the current assignment.
@@ -161,10 +339,7 @@ class Assignments(Sequence):
             True if the literal is satisfied, False if the literal is falsified, None if the variable is not assigned.
         """
 
-        if literal > 0:
-            return self[literal]
-        else:
-            return negate(self[-literal])
+        return VALUES[self.literal_values[literal]]
     
     def decision_level(self, variable: int) -> Optional[int]:
         """Returns the decision level of the assignment of a given variable.
@@ -180,9 +355,10 @@ class Assignments(Sequence):
             The decision level of the variable, None if it's unassigned.
         """
 
-        return self.decision_levels[variable - 1]   # variable (n) is stored at index (n-1)
+        level = self.decision_levels[variable]
+        return None if level == -1 else level
     
-    def reason(self, variable: int) -> Optional[Clause]:
+    def reason(self, variable: int) -> int:
         """Returns the reason of the assignment for a given variable.
 
         Parameters
@@ -192,11 +368,11 @@ class Assignments(Sequence):
 
         Returns
         -------
-        Optional[Clause]
-            The reason for the assignment of the variable. None if unassigned or decision.
+        int
+            The reference of the reason clause for the assignment of the variable. NO_REASON if unassigned or decision.
         """
 
-        return self.reasons[variable - 1]   # variable (n) is stored at index (n-1)
+        return self.reasons[variable]
     
     def last_assignment(self, variable: int) -> Optional[bool]:
         """Returns the last value that the variable was assigned.
@@ -212,23 +388,28 @@ class Assignments(Sequence):
             The last value that the variable was assigned.
         """
 
-        return self.last_assignments[variable - 1]  # variable (n) is stored at index (n-1)
+        phase = self.last_assignments[variable]
+        return None if phase == -1 else phase == 1
     
-    def assign(self, assignment: Assignment, reason: Clause = None):
-        """Applies a given assignment.
+    def assign(self, literal: int, decision_level: int, reason: int = NO_REASON):
+        """Satisfies a given literal.
 
         Parameters
         ----------
-        assignment : Assignment
-            The given assignment.
-        reason : Clause, optional
-            The reason for the given assignment, by default None    (for decisions)
+        literal : int
+            The given literal.
+        decision_level : int
+            The decision level at which the assignment is applied.
+        reason : int, optional
+            The reference of the reason clause for the given assignment, by default NO_REASON    (for decisions)
         """
 
-        self.values[assignment.var - 1] = assignment.value # variable (n) is stored at index (n-1)
-        self.last_assignments[assignment.var - 1] = assignment.value # update last assignment
-        self.decision_levels[assignment.var - 1] = assignment.decision_level
-        self.reasons[assignment.var - 1] = reason
+        self.literal_values[literal] = TRUE
+        self.literal_values[-literal] = FALSE
+        var = abs(literal)
+        self.last_assignments[var] = literal > 0 # update last assignment
+        self.decision_levels[var] = decision_level
+        self.reasons[var] = reason
     
     def __delitem__(self, variable: int):
         """Unassigns a given variable.
@@ -239,18 +420,19 @@ class Assignments(Sequence):
             The given variable.
         """
 
-        self.values[variable - 1] = None   # see note in __init__
-        self.decision_levels[variable - 1] = None
-        self.reasons[variable - 1] = None
+        self.literal_values[variable] = UNASSIGNED
+        self.literal_values[-variable] = UNASSIGNED
+        self.decision_levels[variable] = -1
+        self.reasons[variable] = NO_REASON
     
     def __iter__(self):
-        """Returns iterator over assignment view (See method assignment_view).
+        """Returns iterator over the values of the variables.
         """
         
-        return iter(self.assignment_view)
+        return (VALUES[self.literal_values[var]] for var in range(1, self.n + 1))
     
     def __len__(self):
-        return len(self.values)
+        return self.n
     
     def __str__(self) -> str:
         """String representation of the assignments.
@@ -263,100 +445,99 @@ class Assignments(Sequence):
 
         return str([str(assignment) for assignment in self.assignment_view])
 
-class Propagation:
-    """A propagated assignment. Includes the assignment itself and a reason clause.
-    """
-
-    def __init__(self, assignment: Assignment, reason: Clause):
-        self.assignment = assignment
-        self.reason = reason
-
-class DecisionLevel:
-    """Sequence of assignments made on a specific decision level. Includes a decision assignment and a number of propagations. Propagations consist of an assignment and a clause for a reason.
+class Trail(Sequence):
+    """A trail of the assigned literals in the order of their assignment. Is divided into decision levels.
+    Every decision level starts with its decision (except for decision level 0), the rest of it are propagations.
     """
 
-    def __init__(self, decision: Assignment):
-        self.decision = decision
-        self.propagations = []
-    
-    def add_propagation(self, assignment: Assignment, reason: Clause):
-        self.propagations.append(Propagation(assignment, reason))
+    def __init__(self):
+        self.literals = array('i')  # the assigned literals, in order of assignment
+        self.level_starts = array('i')  # index of the decision of decision level (x) in the literals is stored at index (x - 1)
+        self.propagation_head = 0   # index of the first literal whose consequences were not propagated yet
     
     @property
-    def assignments(self) -> List[Assignment]:
-        """Returns the assignments on this decision level.
+    def decision_level(self) -> int:
+        """Returns current decision level.
 
         Returns
         -------
-        List[Assignment]
-            The list of assignments applied on this decision level (decision + propagations).
+        int
+            The current decision level.
         """
 
-        assignments = [propagation.assignment for propagation in self.propagations]    # propagation is of type (assignment, clause) 
-        if not self.decision is None:
-            assignments.append(self.decision)
-        return assignments
+        return len(self.level_starts)   # every decision level except for 0 has a start
     
-    def get_latest_assignment(self) -> Assignment:
-        """Gets the latest assignment applied on this decision level.
+    def level_start(self, level: int) -> int:
+        """Returns the index of the first literal on the given decision level.
+
+        Parameters
+        ----------
+        level : int
+            The given decision level.
 
         Returns
         -------
-        Assignment
-            The latest applied assignment.
+        int
+            The index of the first literal on the decision level.
         """
 
-        # if there are no propagations, it's the decision
-        if len(self.propagations) == 0:
-            return self.decision
-        # get the last propagation
-        propagation = self.propagations[len(self.propagations) - 1]
-        return propagation.assignment
-
-class Trail(Sequence):
-    """A trail of the decisions. Is divided into decision levels.
-    """
-
-    def __init__(self):
-        self.trail: List[DecisionLevel] = []
-        self.trail.append(DecisionLevel(None))  # decision level 0
+        if level == 0:
+            return 0
+        return self.level_starts[level - 1]
     
-    @property
-    def decision_level(self) -> int:
-        """Returns current decision level.
+    def decision(self, level: int) -> int:
+        """Returns the decided literal of the given decision level.
+
+        Parameters
+        ----------
+        level : int
+            The given decision level, has to be at least 1.
 
         Returns
         -------
         int
-            The current decision level.
+            The decided literal.
         """
 
-        return len(self.trail) - 1  # the decision level is the amount of decision levels n = len(0,1,...,n) - 1
+        return self.literals[self.level_starts[level - 1]]
     
     def __len__(self):
-        return len(self.trail)
+        return len(self.literals)
     
-    def __getitem__(self, key: int) -> DecisionLevel:
-        return self.trail[key]
+    def __getitem__(self, key: int) -> int:
+        return self.literals[key]
     
     def __iter__(self):
-        return iter(self.trail)
+        return iter(self.literals)
     
-    def decide(self, assignment: Assignment):
-        self.trail.append(DecisionLevel(assignment))    # create a new decision level with the decision
+    def decide(self, literal: int):
+        """Opens a new decision level with the given decided literal.
+
+        Parameters
+        ----------
+        literal : int
+            The decided literal.
+        """
+
+        self.level_starts.append(len(self.literals))
+        self.literals.append(literal)
+    
+    def new_level(self):
+        """Opens a new decision level without a decision, for assignments that are not part of the search.
+        """
+
+        self.level_starts.append(len(self.literals))
     
-    def add_propagation(self, assignment: Assignment, reason: Clause):
-        """Adds a propagation to the propagation side of the latest decision level.
+    def add_propagation(self, literal: int):
+        """Adds a propagated literal to the latest decision level.
 
         Parameters
         ----------
-        assignment : Assignment
-            The assignment that was propagated.
-        reason : Clause
-            The reason clause for the propagated assignment.
+        literal : int
+            The propagated literal.
         """
 
-        self.trail[self.decision_level].add_propagation(assignment, reason)
+        self.literals.append(literal)
     
     def backtrack(self, level: int):
         """Backtracking to the given level.
@@ -367,24 +548,44 @@ class Trail(Sequence):
             The given level.
         """
 
-        self.trail = self.trail[:level + 1]   # keeps every decision level before level, removes everything else
+        if level >= self.decision_level:
+            return  # nothing to remove
+        start = self.level_starts[level]    # everything from the decision of level + 1 on is removed
+        del self.literals[start:]
+        del self.level_starts[level:]
+        self.propagation_head = min(self.propagation_head, start)
+
 class VSIDS:
-    """Class that manages VSIDS variable selection.
+    """Class that manages VSIDS variable selection. The variables are kept in an indexed binary max-heap ordered by their counters.
     """
 
-    def __init__(self, n: int):
+    def __init__(self, n: int, decay: float = 0.5, conflicts_until_decay: int = 1000):
         """Initiates the VSIDS data structure for variable selection.
 
         Parameters
         ----------
         n : int
             The number of variables.
+        decay : float, optional
+            The factor that all counters are multiplied by after a number of conflicts, by default 0.5
+        conflicts_until_decay : int, optional
+            The number of conflicts until the counters decay, by default 1000
         """
 
+        self.decay = decay
+        self.conflicts_until_decay = conflicts_until_decay
         self.b = 1.0  # instead of multiplying all counters with c after a while, we'll just divide b by c and add it to the counter all the time instead of 1 (MiniSat approach)
         self.counters = [0.0] * n   # note that every variable (x) is stored at index (x - 1)
         self.conflicts = 0  # number of conflicts
-        # we could now sort a list of variables we want to assign next, but i'm too lazy
+        # the heap holds variables, the counter of every parent is at least as high as the counters of its children
+        self.heap = list(range(1, n + 1))
+        random.shuffle(self.heap)   # all counters are 0 in the beginning, so this breaks the ties randomly
+        self.positions = [0] * n    # position of variable (x) in the heap is stored at index (x - 1), -1 if it's not in the heap
+        for position, variable in enumerate(self.heap):
+            self.positions[variable - 1] = position
+    
+    def __len__(self):
+        return len(self.heap)
     
     def touch(self, variable: int):
         """To be called when a variable is 'touched' in a conflict.
@@ -395,7 +596,10 @@ class VSIDS:
             The touched variable.
         """
 
-        self.counters[variable] -=- self.b  # way cooler than +=, fancy schmancy time
+        self.counters[variable - 1] -=- self.b  # way cooler than +=, fancy schmancy time
+        # the counter only went up, so the variable can only move up in the heap
+        if self.positions[variable - 1] != -1:
+            self.sift_up(self.positions[variable - 1])
     
     def conflict(self):
         """Increment the conflict counter.
@@ -403,11 +607,101 @@ class VSIDS:
 
         self.conflicts -=- 1    # chad town
         # if we reached the max number of conflicts, we crank that boi up
-        if self.conflicts >= config.VSIDS_CONFLICTS_UNTIL_DECAY:
-            self.b /= config.VSIDS_DECAY
+        if self.conflicts >= self.conflicts_until_decay:
+            self.b /= self.decay
             self.conflicts = 0
         # if our b has reached a limit where we might fear overflows (probably not 2**10, but better safe than sorry), we scale the whole thing
+        # scaling every counter by the same factor keeps their order, so the heap stays intact
         if self.b >= 2**10:
             for index, counter in enumerate(self.counters):
-                self.counter[index] = counter / self.b
-                self.b = 1
\ No newline at end of file
+                self.counters[index] = counter / self.b
+            self.b = 1.0
+    
+    def insert(self, variable: int):
+        """Inserts a variable into the heap, if it's not already in there. To be called when a variable is unassigned.
+
+        Parameters
+        ----------
+        variable : int
+            The given variable.
+        """
+
+        if self.positions[variable - 1] != -1:
+            return
+        self.heap.append(variable)
+        self.positions[variable - 1] = len(self.heap) - 1
+        self.sift_up(len(self.heap) - 1)
+    
+    def pop(self) -> Optional[int]:
+        """Removes the variable with the highest counter from the heap and returns it.
+
+        Returns
+        -------
+        Optional[int]
+            The variable with the highest counter, None if the heap is empty.
+        """
+
+        if not self.heap:
+            return None
+        top = self.heap[0]
+        last = self.heap.pop()
+        self.positions[top - 1] = -1
+        if last != top: # move the last variable to the top and let it sink
+            self.heap[0] = last
+            self.positions[last - 1] = 0
+            self.sift_down(0)
+        return top
+    
+    def sift_up(self, position: int):
+        """Moves the variable at the given heap position up until its parent has a higher counter.
+
+        Parameters
+        ----------
+        position : int
+            The given heap position.
+        """
+
+        heap, positions, counters = self.heap, self.positions, self.counters
+        variable = heap[position]
+        counter = counters[variable - 1]
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = heap[parent_position]
+            if counters[parent - 1] >= counter:
+                break
+            # the parent moves down
+            heap[position] = parent
+            positions[parent - 1] = position
+            position = parent_position
+        heap[position] = variable
+        positions[variable - 1] = position
+    
+    def sift_down(self, position: int):
+        """Moves the variable at the given heap position down until both of its children have lower counters.
+
+        Parameters
+        ----------
+        position : int
+            The given heap position.
+        """
+
+        heap, positions, counters = self.heap, self.positions, self.counters
+        size = len(heap)
+        variable = heap[position]
+        counter = counters[variable - 1]
+        while True:
+            child_position = 2 * position + 1
+            if child_position >= size:
+                break
+            # pick the child with the higher counter
+            if child_position + 1 < size and counters[heap[child_position + 1] - 1] > counters[heap[child_position] - 1]:
+                child_position += 1
+            child = heap[child_position]
+            if counters[child - 1] <= counter:
+                break
+            # the child moves up
+            heap[position] = child
+            positions[child - 1] = position
+            position = child_position
+        heap[position] = variable
+        positions[variable - 1] = position
@@ -0,0 +1,229 @@
+#!/bin/python3
+# SHEBANG
+
+import os, sys, argparse
+from typing import List, Tuple, Optional
+
+# add the global lib directory to the path so i can import read_dimacs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
+import read_dimacs as dimacs
+from proof import read_proof
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        metavar = 'input',
+        dest = 'input',
+        type = str,
+        help = 'Input file where DIMACS notation of a formula is stored.'
+    )
+    parser.add_argument(
+        metavar = 'proof',
+        dest = 'proof',
+        type = str,
+        help = 'File where the DRAT proof (text or binary) of the unsatisfiability of the formula is stored.'
+    )
+    args = parser.parse_args()
+
+    with open(args.input, "r") as f:
+        lines = f.readlines()
+        formula = dimacs.read_cnf(lines)
+        n = dimacs.get_variables_in_dimacs(lines)
+    with open(args.proof, "rb") as f:
+        steps = read_proof(f.read())
+    checker = DRATChecker(formula, n)
+    if checker.verify(steps):
+        print("Verified")
+    elif checker.failed_step is not None:
+        print(f"Not verified: step {checker.failed_step + 1} ({steps[checker.failed_step][1]}) is neither RUP nor RAT")
+    else:
+        print("Not verified: the proof doesn't derive the empty clause")
+
+class DRATChecker:
+    """Forward DRAT checker for small proofs: every added clause is checked against the clauses that are alive at that point, in the order of the proof.
+    A clause is accepted if it is RUP (unit propagation of its negation runs into a conflict) or RAT on its first literal.
+    Like other DRAT checkers, deletions of unit clauses are ignored.
+    """
+
+    def __init__(self, formula: List[List[int]], n: int):
+        """Creates a checker for a formula.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        """
+
+        self.n = n
+        self.clauses: List[Optional[List[int]]] = []  # deleted clauses are None
+        self.ids = {}   # frozenset of the literals -> ids of the alive clauses with these literals
+        # the ids of the clauses that watch literal (x) are stored at index x, unit and empty clauses are not watched
+        self.watches: List[List[int]] = [[] for _ in range(2 * n + 1)]
+        self.units = {} # clause_id -> literal of the alive unit clauses
+        self.empty_clauses = 0
+        self.values = bytearray(2 * n + 1)  # 1 if literal (x) is true, stored at index x
+        self.failed_step: Optional[int] = None  # the first step that couldn't be verified
+        for clause in formula:
+            self.add(clause)
+
+    def add(self, literals: List[int]):
+        """Adds a clause without checking it.
+
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+        """
+
+        literals = list(dict.fromkeys(literals))    # removes duplicate literals
+        clause_id = len(self.clauses)
+        self.clauses.append(literals)
+        self.ids.setdefault(frozenset(literals), []).append(clause_id)
+        if len(literals) == 0:
+            self.empty_clauses -=- 1
+        elif len(literals) == 1:
+            self.units[clause_id] = literals[0]
+        else:
+            self.watches[literals[0]].append(clause_id)
+            self.watches[literals[1]].append(clause_id)
+
+    def delete(self, literals: List[int]):
+        """Deletes a clause with the given literals, if there is one.
+
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+        """
+
+        ids = self.ids.get(frozenset(literals))
+        if not ids or len(self.clauses[ids[-1]]) <= 1:
+            return  # not there, or a unit (or empty) clause
+        self.clauses[ids.pop()] = None  # the watches are removed when they are visited
+
+    def is_rup(self, literals: List[int]) -> bool:
+        """Checks if a clause is implied by unit propagation: making all its literals false leads to a conflict.
+
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+
+        Returns
+        -------
+        bool
+            True if it is RUP, False otherwise.
+        """
+
+        if self.empty_clauses > 0:
+            return True
+        values, clauses, watches = self.values, self.clauses, self.watches
+        trail = []
+        conflict = False
+        for literal in list(self.units.values()) + [-literal for literal in literals]:
+            if values[-literal]:
+                conflict = True
+                break
+            if not values[literal]:
+                values[literal] = 1
+                trail.append(literal)
+        head = 0
+        while not conflict and head < len(trail):
+            false_literal = -trail[head]
+            head -=- 1
+            watchers = watches[false_literal]
+            index = 0
+            while index < len(watchers):
+                clause_id = watchers[index]
+                clause = clauses[clause_id]
+                if clause is None:
+                    # deleted, throw the watch out
+                    watchers[index] = watchers[-1]
+                    watchers.pop()
+                    continue
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if values[clause[0]]:
+                    index -=- 1
+                    continue    # satisfied
+                # look for a new literal to watch that isn't false
+                for position in range(2, len(clause)):
+                    if not values[-clause[position]]:
+                        clause[1], clause[position] = clause[position], clause[1]
+                        watches[clause[1]].append(clause_id)
+                        watchers[index] = watchers[-1]
+                        watchers.pop()
+                        break
+                else:
+                    if values[-clause[0]]:
+                        conflict = True
+                        break
+                    values[clause[0]] = 1   # unit
+                    trail.append(clause[0])
+                    index -=- 1
+        for literal in trail:
+            values[literal] = 0
+        return conflict
+
+    def is_rat(self, literals: List[int]) -> bool:
+        """Checks if a clause has the resolution asymmetric tautology property on its first literal: every resolvent with a clause that contains the negation of the literal is RUP.
+
+        Parameters
+        ----------
+        literals : List[int]
+            The literals of the clause.
+
+        Returns
+        -------
+        bool
+            True if it is RAT, False otherwise.
+        """
+
+        if not literals:
+            return False
+        pivot = literals[0]
+        for clause in self.clauses:
+            if clause is None or -pivot not in clause:
+                continue
+            resolvent = literals + [literal for literal in clause if literal != -pivot]
+            if any(-literal in resolvent for literal in resolvent):
+                continue    # tautologies are always satisfied
+            if not self.is_rup(resolvent):
+                return False
+        return True
+
+    def verify(self, steps: List[Tuple[bool, List[int]]]) -> bool:
+        """Checks the steps of a proof in their order until the empty clause is added.
+
+        Parameters
+        ----------
+        steps : List[Tuple[bool, List[int]]]
+            The steps of the proof: (True if it's a deletion, the literals of the clause).
+
+        Returns
+        -------
+        bool
+            True if every step up to the empty clause is correct, False otherwise. failed_step is set if a step isn't correct.
+        """
+
+        if self.empty_clauses > 0:
+            return True
+        for index, (deletion, literals) in enumerate(steps):
+            if max(map(abs, literals), default = 0) > self.n:
+                self.failed_step = index
+                return False    # new variables aren't supported
+            if deletion:
+                self.delete(literals)
+                continue
+            if not self.is_rup(literals) and not self.is_rat(literals):
+                self.failed_step = index
+                return False
+            self.add(literals)
+            if not literals:
+                return True
+        return False
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/bin/python3
+# SHEBANG
+
+import os, sys, argparse, threading, random, queue, time
+import multiprocessing as mp
+from types import SimpleNamespace
+from typing import List, Optional
+
+# add the global lib directory to the path so i can import read_dimacs and the stats
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
+import read_dimacs as dimacs
+from stats import CDCLStats
+from data_structures import Assignments
+from cdcl import CDCLSolver
+from clause_sharing import ClauseExchange
+from budget import Budget, add_budget_arguments, budget_from_arguments
+import config
+
+# the settings the workers are diversified with, worker (i) takes entry (i mod length) of each of them
+RESTART_POLICIES = [None, "luby", "glucose", "geometric"]  # None keeps the restart policy of the config
+SCALES_LUBY = [1, 0.5, 2, 0.25, 4]    # factors for the restart scale
+VSIDS_DECAYS = [None, 0.75, 0.9, 0.6, 0.95] # None keeps the decay of the config
+DEFAULT_PHASES = [True, False, None]  # None picks the phases randomly
+STOP_POLL_INTERVAL = 0.01   # seconds between two looks of a worker at the stop flag
+
+def diversify(solver_config, worker: int) -> SimpleNamespace:
+    """Creates a copy of a config with a different restart policy, restart scale, VSIDS decay and phase policy for every worker.
+
+    Parameters
+    ----------
+    solver_config : module
+        The config that the workers are based on.
+    worker : int
+        The index of the worker.
+
+    Returns
+    -------
+    SimpleNamespace
+        The config of the worker.
+    """
+
+    # modules can't be sent to other processes, so copy the settings
+    worker_config = SimpleNamespace(**{name: value for name, value in vars(solver_config).items() if name.isupper()})
+    if (policy := RESTART_POLICIES[worker % len(RESTART_POLICIES)]) is not None:
+        worker_config.RESTART_POLICY = policy
+    worker_config.SCALE_LUBY = max(1, int(solver_config.SCALE_LUBY * SCALES_LUBY[worker % len(SCALES_LUBY)]))
+    if (decay := VSIDS_DECAYS[worker % len(VSIDS_DECAYS)]) is not None:
+        worker_config.VSIDS_DECAY = decay
+    worker_config.DEFAULT_PHASE = DEFAULT_PHASES[worker % len(DEFAULT_PHASES)]
+    return worker_config
+
+def run_worker(worker: int, formula: List[List[int]], n: int, worker_config: SimpleNamespace, seed: int, stop, results, exchange: Optional[ClauseExchange] = None, budget: Optional[Budget] = None):
+    """Solves the formula in a worker process and puts (worker, satisfiable, model, stats) into the results.
+    The worker is interrupted as soon as the stop flag is set.
+
+    Parameters
+    ----------
+    worker : int
+        The index of the worker.
+    formula : List[List[int]]
+        The clauses of the formula.
+    n : int
+        The number of variables.
+    worker_config : SimpleNamespace
+        The config of the worker.
+    seed : int
+        The seed of the worker.
+    stop : multiprocessing.Value
+        Set to 1 when one of the workers found the answer.
+    results : multiprocessing.Queue
+        Where the result is put.
+    exchange : Optional[ClauseExchange], optional
+        Where the workers share their learned clauses, by default None
+    budget : Optional[Budget], optional
+        Limits the work of the worker, by default unlimited
+    """
+
+    random.seed(seed)
+    solver = CDCLSolver(formula, n, worker_config, exchange, worker)
+    # wait for the stop flag on the side, so the solver doesn't have to look at it all the time
+    # (not an Event: workers that exit while waiting on it would block setting it forever)
+    def wait_for_stop():
+        while not stop.value:
+            time.sleep(STOP_POLL_INTERVAL)
+        solver.interrupt()
+    threading.Thread(target = wait_for_stop, daemon = True).start()
+    satisfiable = solver.solve(budget = budget)
+    model = [literal for literal in solver.trail] if satisfiable else None
+    results.put((worker, satisfiable, model, solver.stats))
+    if exchange is not None:
+        exchange.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        metavar = 'input',
+        dest = 'input',
+        type = str,
+        help = 'Input file where DIMACS notation of a formula is stored.'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        dest = 'workers',
+        type = int,
+        default = None,
+        help = 'Number of worker processes (default: one per core).'
+    )
+    parser.add_argument(
+        '--show-assignments',
+        dest = 'show_assignments',
+        action = 'store_true',
+        default = False,
+        help = 'Show the assignments if it is satisfiable.'
+    )
+    parser.add_argument(
+        '-s',
+        '--stats',
+        dest = 'show_stats',
+        action = 'store_true',
+        default = False,
+        help = 'Show the stats of all workers together (memory usage, time).'
+    )
+    add_budget_arguments(parser)
+    args = parser.parse_args()
+
+    with open(args.input, "r") as f:
+        lines = f.readlines()
+        formula = dimacs.read_cnf(lines)
+        n = dimacs.get_variables_in_dimacs(lines)
+    # solve the thing
+    portfolio = PortfolioSolver(formula, n, args.workers)
+    satisfiable = portfolio.solve(budget_from_arguments(args))
+    # print results
+    if satisfiable:
+        print("Satisfiable")
+        if args.show_assignments:
+            print(f"Assignments:\n{portfolio.assignments}")
+    elif satisfiable is None:
+        print("Unknown")
+    else:
+        print("Unsatisfiable")
+    # print stats
+    if args.show_stats:
+        print(f"Winner: worker {portfolio.winner}")
+        print(portfolio.stats)
+
+class PortfolioSolver:
+    """Solves one formula with several diversified CDCL solvers in parallel processes. The first answer wins, the other workers are interrupted.
+    """
+
+    def __init__(self, formula: List[List[int]], n: int, workers: Optional[int] = None, solver_config = config, seed: int = 0):
+        """Creates a portfolio for a formula.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        workers : Optional[int], optional
+            The number of worker processes, by default one per core
+        solver_config : module, optional
+            The config that the workers are based on, by default the default config
+        seed : int, optional
+            Worker (i) is seeded with seed + i, by default 0
+        """
+
+        self.formula = formula
+        self.n = n
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.config = solver_config
+        self.seed = seed
+        self.winner: Optional[int] = None   # the worker that found the answer
+        self.assignments = Assignments(n)   # the model of the winner if the formula is satisfiable
+        self.stats = CDCLStats()    # stats of all workers together
+        self.worker_stats: List[Optional[CDCLStats]] = [None] * self.workers
+
+    def solve(self, budget: Optional[Budget] = None) -> Optional[bool]:
+        """Solves SAT for the formula in all the workers.
+
+        Parameters
+        ----------
+        budget : Optional[Budget], optional
+            Limits the work of every worker, by default unlimited. Interrupting it stops all workers.
+
+        Returns
+        -------
+        Optional[bool]
+            True if the formula is satisfiable, False otherwise. None if all workers ran out of budget or were interrupted.
+        """
+
+        stop = mp.Value('b', 0)
+        results = mp.Queue()
+        exchange = ClauseExchange(self.config.SHARE_BUFFER_SIZE) if self.config.SHARE_CLAUSES and self.workers > 1 else None
+        processes = [
+            mp.Process(target = run_worker, args = (worker, self.formula, self.n, diversify(self.config, worker), self.seed + worker, stop, results, exchange, budget), daemon = True)
+            for worker in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        satisfiable = None
+        # every worker answers exactly once: with the result, or with None after it was interrupted
+        answers = 0
+        while answers < len(processes):
+            if budget is not None and budget.interrupted:
+                stop.value = 1  # the workers have their own copies of the budget, they have to be told
+            try:
+                worker, worker_satisfiable, model, worker_stats = results.get(timeout = STOP_POLL_INTERVAL)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break   # a worker died without answering, nobody is left to answer
+                continue
+            answers -=- 1
+            self.worker_stats[worker] = worker_stats
+            self.stats.merge(worker_stats)
+            if worker_satisfiable is not None and satisfiable is None:
+                # first answer wins, the others can stop
+                satisfiable = worker_satisfiable
+                self.winner = worker
+                if satisfiable:
+                    for literal in model:
+                        self.assignments.assign(literal, 0)
+                stop.value = 1
+        for process in processes:
+            process.join()
+        if exchange is not None:
+            exchange.close(unlink = True)
+        return satisfiable
+
+if __name__ == "__main__":
+    main()
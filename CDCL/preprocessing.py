@@ -0,0 +1,470 @@
+from typing import List, Tuple, Dict, Iterable, Callable, Optional
+from collections import deque
+from itertools import chain
+from proof import DRATWriter
+
+class Preprocessor:
+    """Simplifies a formula before the search. The clauses are kept in a list with occurrence lists for every literal.
+    Clauses that are removed in a way that doesn't keep the models (e.g. by variable elimination) are put on a reconstruction stack, so a model of the simplified formula can be extended to a model of the original formula.
+    """
+
+    def __init__(self, clauses: List[List[int]], n: int, frozen: Iterable[int] = (), proof: Optional[DRATWriter] = None):
+        """Creates a preprocessor for a formula.
+
+        Parameters
+        ----------
+        clauses : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        frozen : Iterable[int], optional
+            Variables that must not be removed from the formula (e.g. because they are used in assumptions later), by default ()
+        proof : Optional[DRATWriter], optional
+            Where the added and removed clauses are written as a DRAT proof, by default None
+        """
+
+        self.n = n
+        self.clauses: List[Optional[List[int]]] = []  # removed clauses are None, so the indices in the occurrence lists stay valid
+        self.signatures: List[int] = [] # the signature of every clause, see signature
+        # the indices of the clauses containing literal (x) are stored at index x. Negative literals use python's negative indices, so (-x) is stored at index 2n + 1 - x.
+        self.occurrences: List[set] = [set() for _ in range(2 * n + 1)]
+        self.frozen = bytearray(n + 1)
+        for var in frozen:
+            self.frozen[abs(var)] = True
+        self.eliminated = bytearray(n + 1)
+        self.reconstruction: List[Tuple[int, List[int]]] = []   # (pivot literal, clause), the pivot is made true if the clause is not satisfied
+        self.proof = None   # the clauses of the formula are not part of the proof
+        for clause in clauses:
+            literals = list(dict.fromkeys(clause))  # removes duplicate literals
+            if not any(-literal in literals for literal in literals):   # tautologies are always satisfied
+                self.add(literals)
+        self.proof = proof
+
+    def add(self, clause: List[int]) -> int:
+        """Adds a clause to the formula.
+
+        Parameters
+        ----------
+        clause : List[int]
+            The literals of the clause.
+
+        Returns
+        -------
+        int
+            The index of the clause.
+        """
+
+        if self.proof is not None:
+            self.proof.add(clause)
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.signatures.append(signature(clause))
+        for literal in clause:
+            self.occurrences[literal].add(index)
+        return index
+
+    def remove(self, index: int):
+        """Removes a clause from the formula.
+
+        Parameters
+        ----------
+        index : int
+            The index of the clause.
+        """
+
+        if self.proof is not None:
+            self.proof.delete(self.clauses[index])
+        for literal in self.clauses[index]:
+            self.occurrences[literal].discard(index)
+        self.clauses[index] = None
+
+    def strengthen(self, index: int, literal: int):
+        """Removes a literal from a clause.
+
+        Parameters
+        ----------
+        index : int
+            The index of the clause.
+        literal : int
+            The literal that is removed.
+        """
+
+        if self.proof is not None:
+            # the shorter clause is implied by the clause and the clause that strengthens it, so it is added before the old one is deleted
+            self.proof.add([other for other in self.clauses[index] if other != literal])
+            self.proof.delete(self.clauses[index])
+        self.clauses[index].remove(literal)
+        self.occurrences[literal].discard(index)
+        self.signatures[index] = signature(self.clauses[index])
+
+    @property
+    def unsatisfiable(self) -> bool:
+        """If the empty clause was derived.
+
+        Returns
+        -------
+        bool
+            True if the formula contains the empty clause, False otherwise.
+        """
+
+        return [] in self.clauses
+
+    @property
+    def formula(self) -> List[List[int]]:
+        """The simplified formula.
+
+        Returns
+        -------
+        List[List[int]]
+            The clauses that were not removed.
+        """
+
+        return [clause for clause in self.clauses if clause is not None]
+
+    # =====================================================================================
+    # ================================ equivalent literals ================================
+    # =====================================================================================
+
+    def substitute_equivalences(self) -> int:
+        """Equivalent literal substitution: the literals in a strongly connected component of the binary implication graph are all equivalent.
+        Every literal is replaced by the representative of its component, the replaced variables are put on the reconstruction stack.
+        If (x) and (-x) are in the same component, the formula is unsatisfiable and the empty clause is added.
+
+        Returns
+        -------
+        int
+            The number of substituted variables.
+        """
+
+        representatives = [0] * (2 * self.n + 1)    # the representative of literal (x) is stored at index x, 0 if it has none
+        for component in self.binary_components():
+            if len(component) == 1 or representatives[component[0]] != 0:
+                continue    # nothing to substitute, or the component of the negations was handled already
+            if -component[0] in component:
+                # (x) implies (-x) and (-x) implies (x)
+                if self.proof is not None:
+                    self.proof.add([-component[0]]) # the proof needs the step in between
+                self.add([])
+                return 0
+            # frozen variables have to stay, so they are preferred as representatives
+            representative = min(component, key = lambda literal: (not self.frozen[abs(literal)], abs(literal)))
+            for literal in component:
+                representatives[literal] = representative
+                representatives[-literal] = -representative
+        substitute = lambda literal: representatives[literal] if representatives[literal] != 0 and not self.frozen[abs(literal)] else literal
+        substituted = 0
+        # the old clauses are removed after all substituted clauses were added, a substituted clause follows from the old one and the binary clauses of the component
+        replaced = set()
+        for var in range(1, self.n + 1):
+            if substitute(var) == var:
+                continue
+            for index in list(self.occurrences[var]) + list(self.occurrences[-var]):
+                if index in replaced:
+                    continue    # had another substituted variable
+                replaced.add(index)
+                clause = list(dict.fromkeys(substitute(literal) for literal in self.clauses[index]))    # removes duplicate literals
+                if not any(-literal in clause for literal in clause):   # tautologies are always satisfied
+                    self.add(clause)
+            # var = representative: var is false unless the representative is true
+            self.reconstruction.append((var, [var, -representatives[var]]))
+            self.reconstruction.append((-var, [-var]))
+            self.eliminated[var] = True
+            substituted -=- 1
+        for index in replaced:
+            self.remove(index)
+        return substituted
+
+    def binary_components(self) -> List[List[int]]:
+        """The strongly connected components of the binary implication graph: a binary clause (a, b) gives the edges (-a) -> b and (-b) -> a.
+        Tarjan's algorithm with an explicit stack, so long implication chains don't hit the recursion limit.
+
+        Returns
+        -------
+        List[List[int]]
+            The literals of every component.
+        """
+
+        n = self.n
+        # the successors of literal (x) are stored at index x
+        edges: List[List[int]] = [[] for _ in range(2 * n + 1)]
+        for clause in self.clauses:
+            if clause is not None and len(clause) == 2:
+                first, second = clause
+                edges[-first].append(second)
+                edges[-second].append(first)
+        indices = [0] * (2 * n + 1)   # the order in which the literals were visited, 0 if not visited yet
+        lowlinks = [0] * (2 * n + 1)  # the smallest index that is reachable from the search tree below the literal
+        on_stack = bytearray(2 * n + 1)
+        stack = []
+        components = []
+        counter = 1
+        for root in chain(range(1, n + 1), range(-1, -n - 1, -1)):
+            if indices[root] or self.eliminated[abs(root)]:
+                continue
+            indices[root] = lowlinks[root] = counter
+            counter -=- 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(edges[root]))]
+            while work:
+                literal, successors = work[-1]
+                for successor in successors:
+                    if not indices[successor]:
+                        # go deeper, continue with this literal afterwards
+                        indices[successor] = lowlinks[successor] = counter
+                        counter -=- 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, iter(edges[successor])))
+                        break
+                    if on_stack[successor]:
+                        lowlinks[literal] = min(lowlinks[literal], indices[successor])
+                else:
+                    # all successors are done
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlinks[parent] = min(lowlinks[parent], lowlinks[literal])
+                    if lowlinks[literal] == indices[literal]:
+                        # literal is the root of a component, the component is everything above it on the stack
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == literal:
+                                break
+                        components.append(component)
+        return components
+
+    # =============================================================================
+    # ================================ subsumption ================================
+    # =============================================================================
+
+    def subsume(self, limit: int = 100000) -> Tuple[int, int]:
+        """Removes the clauses that are subsumed by another clause and strengthens clauses by self-subsuming resolution.
+        A clause C subsumes D if C is a subset of D. If C is a subset of D except for one literal l with (-l) in D, the resolvent of C and D subsumes D, so (-l) can be removed from D.
+        Only the clauses in the shortest occurrence list of a literal of C (in both polarities) can be subsumed or strengthened by C, the others are filtered by their signatures.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The number of subset checks that may be done, by default 100000
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of removed and the number of strengthened clauses.
+        """
+
+        occurrences, signatures = self.occurrences, self.signatures
+        # short clauses first, they subsume the most
+        queue = deque(sorted((index for index, clause in enumerate(self.clauses) if clause is not None), key = lambda index: len(self.clauses[index])))
+        queued = set(queue)
+        subsumed, strengthened = 0, 0
+        while queue and limit > 0:
+            index = queue.popleft()
+            queued.discard(index)
+            clause = self.clauses[index]
+            if clause is None:
+                continue    # was subsumed itself
+            if len(clause) == 0:
+                break   # the formula is unsatisfiable, nothing left to simplify
+            pivot = min(clause, key = lambda literal: len(occurrences[literal]) + len(occurrences[-literal]))
+            for other in list(occurrences[pivot]) + list(occurrences[-pivot]):
+                other_clause = self.clauses[other]
+                if other == index or other_clause is None or len(other_clause) < len(clause) or signatures[index] & ~signatures[other]:
+                    continue
+                limit -= 1
+                flipped = subsumption(clause, other_clause)
+                if flipped is None:
+                    continue
+                if flipped == 0:
+                    self.remove(other)
+                    subsumed -=- 1
+                else:
+                    self.strengthen(other, -flipped)
+                    strengthened -=- 1
+                    # the shorter clause might subsume others now
+                    if other not in queued:
+                        queue.append(other)
+                        queued.add(other)
+        return subsumed, strengthened
+
+    # ======================================================================================
+    # ================================ variable elimination ================================
+    # ======================================================================================
+
+    def eliminate_variables(self, occurrence_limit: int = 16, resolution_limit: int = 100000, clause_size_limit: int = 20) -> int:
+        """Bounded variable elimination (SatELite): a variable is replaced by all the resolvents of its clauses if that doesn't increase the number of clauses.
+        Variables are tried in the order of the number of resolvents they could produce, the cheapest first.
+
+        Parameters
+        ----------
+        occurrence_limit : int, optional
+            Variables that occur more often than this (in both polarities together) are not tried, by default 16
+        resolution_limit : int, optional
+            The number of resolutions that may be tried over the whole pass, by default 100000
+        clause_size_limit : int, optional
+            Variables that would produce a resolvent longer than this are not eliminated, by default 20
+
+        Returns
+        -------
+        int
+            The number of eliminated variables.
+        """
+
+        occurrences = self.occurrences
+        candidates = [var for var in range(1, self.n + 1) if not self.frozen[var] and 0 < len(occurrences[var]) + len(occurrences[-var]) <= occurrence_limit]
+        candidates.sort(key = lambda var: len(occurrences[var]) * len(occurrences[-var]))
+        eliminated = 0
+        for var in candidates:
+            positive, negative = occurrences[var], occurrences[-var]
+            if len(positive) + len(negative) > occurrence_limit:
+                continue    # grew through resolvents of other variables
+            if resolution_limit < len(positive) * len(negative):
+                break   # out of budget
+            resolution_limit -= len(positive) * len(negative)
+            resolvents = self.resolvents(var, len(positive) + len(negative), clause_size_limit)
+            if resolvents is None:
+                continue    # elimination would make the formula bigger
+            self.eliminate(var, resolvents)
+            eliminated -=- 1
+            if [] in resolvents:
+                break   # the formula is unsatisfiable, nothing left to simplify
+        return eliminated
+
+    def resolvents(self, variable: int, limit: int, clause_size_limit: int) -> Optional[List[List[int]]]:
+        """All the non-tautological resolvents of the clauses with a variable, if there are not too many of them.
+
+        Parameters
+        ----------
+        variable : int
+            The variable that is resolved on.
+        limit : int
+            The maximal number of resolvents.
+        clause_size_limit : int
+            The maximal size of a resolvent.
+
+        Returns
+        -------
+        Optional[List[List[int]]]
+            The resolvents, None if there are more than limit or one of them is too long.
+        """
+
+        resolvents = []
+        for positive_index in self.occurrences[variable]:
+            positive_clause = [literal for literal in self.clauses[positive_index] if literal != variable]
+            for negative_index in self.occurrences[-variable]:
+                resolvent = list(positive_clause)
+                for literal in self.clauses[negative_index]:
+                    if literal == -variable or literal in resolvent:
+                        continue
+                    if -literal in resolvent:
+                        break   # tautology
+                    resolvent.append(literal)
+                else:
+                    if len(resolvents) == limit or len(resolvent) > clause_size_limit:
+                        return None
+                    resolvents.append(resolvent)
+        return resolvents
+
+    def eliminate(self, variable: int, resolvents: List[List[int]]):
+        """Replaces the clauses with a variable by their resolvents. The clauses of the smaller side are put on the reconstruction stack.
+
+        Parameters
+        ----------
+        variable : int
+            The eliminated variable.
+        resolvents : List[List[int]]
+            The resolvents of the clauses with the variable.
+        """
+
+        # like MiniSat: default the variable to satisfy the bigger side, the clauses of the smaller side flip it if they need it
+        pivot = variable if len(self.occurrences[variable]) <= len(self.occurrences[-variable]) else -variable
+        for index in self.occurrences[pivot]:
+            self.reconstruction.append((pivot, self.clauses[index]))
+        self.reconstruction.append((-pivot, [-pivot]))
+        # the resolvents are added first, they follow from the clauses with the variable
+        for resolvent in resolvents:
+            self.add(resolvent)
+        for index in list(self.occurrences[variable]) + list(self.occurrences[-variable]):
+            self.remove(index)
+        self.eliminated[variable] = True
+
+def signature(literals: Iterable[int]) -> int:
+    """A 64 bit fingerprint of the variables of a clause: bit (x mod 64) is set for every variable (x).
+    If the signature of C has a bit that the signature of D doesn't have, C can't be a subset of D (not even with a flipped literal).
+
+    Parameters
+    ----------
+    literals : Iterable[int]
+        The literals of the clause.
+
+    Returns
+    -------
+    int
+        The signature.
+    """
+
+    bits = 0
+    for literal in literals:
+        bits |= 1 << (abs(literal) & 63)
+    return bits
+
+def subsumption(clause: Iterable[int], other: Iterable[int]) -> Optional[int]:
+    """Checks if a clause subsumes another clause, or strengthens it by self-subsuming resolution.
+
+    Parameters
+    ----------
+    clause : Iterable[int]
+        The possibly subsuming clause.
+    other : Iterable[int]
+        The possibly subsumed clause.
+
+    Returns
+    -------
+    Optional[int]
+        0 if the clause is a subset of the other clause. A literal l of the clause if it is a subset with l flipped, (-l) can be removed from the other clause then. None otherwise.
+    """
+
+    other_literals = set(other)
+    flipped = 0
+    for literal in clause:
+        if literal in other_literals:
+            continue
+        if flipped == 0 and -literal in other_literals:
+            flipped = literal
+            continue
+        return None
+    return flipped
+
+def extend_model(reconstruction: List[Tuple[int, List[int]]], value: Callable[[int], Optional[bool]]) -> Dict[int, bool]:
+    """Finds values for the variables on the reconstruction stack, so that a model of the simplified formula becomes a model of the original formula.
+
+    Parameters
+    ----------
+    reconstruction : List[Tuple[int, List[int]]]
+        The reconstruction stack of the preprocessor.
+    value : Callable[[int], Optional[bool]]
+        The value of a literal in the model of the simplified formula, None if it is unassigned.
+
+    Returns
+    -------
+    Dict[int, bool]
+        The value of every variable on the stack. Variables that are unassigned in the model get a value too, if the stack depends on them.
+    """
+
+    values = {}
+    def literal_value(literal: int) -> bool:
+        var = abs(literal)
+        if var not in values:
+            if (model_value := value(literal)) is not None:
+                return model_value
+            values[var] = False # any value works for the simplified formula, but the decisions below depend on it
+        return values[var] == (literal > 0)
+    # the latest removed clauses first, their pivots were removed when these clauses were still there
+    for pivot, clause in reversed(reconstruction):
+        if not any(literal_value(literal) for literal in clause):
+            values[abs(pivot)] = pivot > 0
+    return values
@@ -0,0 +1,179 @@
+from typing import List, Tuple, Iterable
+from array import array
+
+DELETION = 2**31 - 1    # marks a deletion in the buffer, no literal is that big
+ADDITION_BYTE = 0x61    # 'a', starts an addition in binary DRAT
+DELETION_BYTE = 0x64    # 'd', starts a deletion in binary DRAT
+
+class DRATWriter:
+    """Writes a DRAT proof (text or binary) of the clauses that the solver adds and deletes.
+    Clauses are only copied into a flat buffer of ints (0 ends a clause, like in DIMACS), the buffer is encoded and written in one go when it is full.
+    So there is no formatting and no system call for a single clause.
+    """
+
+    def __init__(self, path: str, binary: bool = False, buffer_size: int = 1 << 20):
+        """Creates the proof file.
+
+        Parameters
+        ----------
+        path : str
+            The file the proof is written to.
+        binary : bool, optional
+            If the proof is written in binary DRAT instead of text DRAT, by default False
+        buffer_size : int, optional
+            The number of ints that are buffered before they are written, by default 1 << 20
+        """
+
+        self.file = open(path, "wb")
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self.buffer = array('i')
+
+    def add(self, literals: Iterable[int]):
+        """Adds a clause to the proof. It has to be implied by the formula and the clauses added before (RUP).
+
+        Parameters
+        ----------
+        literals : Iterable[int]
+            The literals of the clause.
+        """
+
+        self.buffer.extend(literals)
+        self.buffer.append(0)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def delete(self, literals: Iterable[int]):
+        """Deletes a clause in the proof.
+
+        Parameters
+        ----------
+        literals : Iterable[int]
+            The literals of the clause.
+        """
+
+        self.buffer.append(DELETION)
+        self.buffer.extend(literals)
+        self.buffer.append(0)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Encodes the buffered clauses and writes them to the file.
+        """
+
+        if self.binary:
+            self.file.write(encode_binary(self.buffer))
+        else:
+            self.file.write(encode_text(self.buffer))
+        self.buffer = array('i')
+
+    def close(self):
+        """Writes the rest of the proof and closes the file.
+        """
+
+        self.flush()
+        self.file.close()
+
+def encode_text(buffer: array) -> bytes:
+    """Encodes buffered clauses in text DRAT: one clause per line, ended by 0, deletions start with d.
+
+    Parameters
+    ----------
+    buffer : array
+        The buffered clauses, see DRATWriter.
+
+    Returns
+    -------
+    bytes
+        The encoded clauses.
+    """
+
+    return "".join(["0\n" if value == 0 else "d " if value == DELETION else f"{value} " for value in buffer]).encode()
+
+def encode_binary(buffer: array) -> bytes:
+    """Encodes buffered clauses in binary DRAT: every clause starts with a for an addition or d for a deletion and is ended by a 0 byte.
+    Literal (x) is mapped to 2x, (-x) to 2x + 1, and the result is written in 7 bit chunks, the lowest first. The highest bit is set in every chunk but the last.
+
+    Parameters
+    ----------
+    buffer : array
+        The buffered clauses, see DRATWriter.
+
+    Returns
+    -------
+    bytes
+        The encoded clauses.
+    """
+
+    encoded = bytearray()
+    starts_clause = True
+    for value in buffer:
+        if starts_clause:
+            starts_clause = False
+            if value == DELETION:
+                encoded.append(DELETION_BYTE)
+                continue
+            encoded.append(ADDITION_BYTE)
+        if value == 0:
+            encoded.append(0)
+            starts_clause = True
+            continue
+        value = 2 * value if value > 0 else -2 * value + 1
+        while value > 127:
+            encoded.append(value & 127 | 128)
+            value >>= 7
+        encoded.append(value)
+    return bytes(encoded)
+
+def read_proof(data: bytes) -> List[Tuple[bool, List[int]]]:
+    """Reads a DRAT proof, text or binary. Binary proofs are recognized by their 0 bytes, text proofs don't have any.
+
+    Parameters
+    ----------
+    data : bytes
+        The content of the proof file.
+
+    Returns
+    -------
+    List[Tuple[bool, List[int]]]
+        The steps of the proof: (True if it's a deletion, the literals of the clause).
+
+    Raises
+    ------
+    ValueError
+        If a binary clause starts with something else than a or d.
+    """
+
+    steps = []
+    if b"\0" not in data:
+        for line in data.decode().splitlines():
+            tokens = line.split()
+            if not tokens or tokens[0] == "c":
+                continue    # empty line or comment
+            deletion = tokens[0] == "d"
+            literals = [int(token) for token in tokens[deletion:]]
+            steps.append((deletion, literals[:literals.index(0)]))
+        return steps
+    position = 0
+    while position < len(data):
+        kind = data[position]
+        if kind not in (ADDITION_BYTE, DELETION_BYTE):
+            raise ValueError(f"Binary proof has an unknown clause type {kind} at byte {position}.")
+        position -=- 1
+        literals = []
+        while True:
+            # read 7 bit chunks until the highest bit isn't set
+            value, shift = 0, 0
+            while True:
+                chunk = data[position]
+                position -=- 1
+                value |= (chunk & 127) << shift
+                shift += 7
+                if chunk < 128:
+                    break
+            if value == 0:
+                break
+            literals.append(value >> 1 if value & 1 == 0 else -(value >> 1))
+        steps.append((kind == DELETION_BYTE, literals))
+    return steps
@@ -0,0 +1,230 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+class RestartPolicy(ABC):
+    """Decides when the solver restarts. The solver reports every conflict and asks after every conflict loop if a restart is due.
+    Restarts only backtrack to decision level 0, VSIDS scores and saved phases are kept.
+    """
+
+    def __init__(self):
+        self.conflicts = 0  # conflicts since the last restart
+        self.restarts = 0
+
+    def conflict(self, lbd: int, trail_size: int) -> bool:
+        """Lets the policy know about a conflict.
+
+        Parameters
+        ----------
+        lbd : int
+            The literal block distance of the learned clause.
+        trail_size : int
+            The number of assigned variables when the conflict happened.
+
+        Returns
+        -------
+        bool
+            True if the conflict blocked a restart, False otherwise.
+        """
+
+        self.conflicts -=- 1
+        return False
+
+    @abstractmethod
+    def restart_due(self) -> bool:
+        """Whether the solver should restart now.
+
+        Returns
+        -------
+        bool
+            True if a restart is due, False otherwise.
+        """
+        pass
+
+    def restart(self):
+        """Lets the policy know that the solver restarted.
+        """
+
+        self.conflicts = 0
+        self.restarts -=- 1
+
+class LubyRestarts(RestartPolicy):
+    """Restarts after luby(i) * scale conflicts for the i-th restart: 1, 1, 2, 1, 1, 2, 4, 1, ...
+    """
+
+    sequence: List[int] = [1]   # the luby sequence up to index 2^k - 1, shared by all instances
+
+    def __init__(self, scale: int = 1000):
+        """Creates a luby restart policy.
+
+        Parameters
+        ----------
+        scale : int, optional
+            The number of conflicts for a 1 in the sequence, by default 1000
+        """
+
+        super().__init__()
+        self.scale = scale
+
+    @classmethod
+    def sequence_up_to(cls, i: int) -> List[int]:
+        """The luby sequence with at least i elements.
+        The first 2^(k+1) - 1 elements are the first 2^k - 1 elements twice, followed by 2^k. So the table doubles until it is long enough.
+
+        Parameters
+        ----------
+        i : int
+            The number of elements that are needed.
+
+        Returns
+        -------
+        List[int]
+            The table of the sequence.
+        """
+
+        while len(cls.sequence) < i:
+            cls.sequence = cls.sequence + cls.sequence + [cls.sequence[-1] * 2]
+        return cls.sequence
+
+    def restart_due(self) -> bool:
+        # the first restart has index 1
+        return self.conflicts >= self.sequence_up_to(self.restarts + 1)[self.restarts] * self.scale
+
+class GeometricRestarts(RestartPolicy):
+    """Restarts after first * factor^i conflicts for the i-th restart.
+    """
+
+    def __init__(self, first: int = 100, factor: float = 1.5):
+        """Creates a geometric restart policy.
+
+        Parameters
+        ----------
+        first : int, optional
+            The number of conflicts until the first restart, by default 100
+        factor : float, optional
+            The interval grows by this factor with every restart, by default 1.5
+        """
+
+        super().__init__()
+        self.interval = first
+        self.factor = factor
+
+    def restart_due(self) -> bool:
+        return self.conflicts >= self.interval
+
+    def restart(self):
+        super().restart()
+        self.interval *= self.factor
+
+class MovingAverage:
+    """Exponential moving average with bias correction, so it is meaningful from the first value on.
+    """
+
+    def __init__(self, alpha: float):
+        """Creates a moving average.
+
+        Parameters
+        ----------
+        alpha : float
+            The weight of a new value, the average reacts to roughly the last 1 / alpha values.
+        """
+
+        self.alpha = alpha
+        self.biased = 0.0
+        self.remaining = 1.0  # (1 - alpha)^number of values: the weight of the initial 0 in the biased average
+
+    def update(self, value: float):
+        self.biased += self.alpha * (value - self.biased)
+        self.remaining *= 1 - self.alpha
+
+    @property
+    def value(self) -> float:
+        if self.remaining == 1.0:
+            return 0.0
+        return self.biased / (1 - self.remaining)
+
+class GlucoseRestarts(RestartPolicy):
+    """Glucose-style dynamic restarts: restart when the LBD of the recent learned clauses (fast moving average) is a lot worse than the long term average (slow moving average).
+    Restarts are blocked when the trail is a lot larger than usual, the solver might be close to a model then.
+    """
+
+    def __init__(self, fast_alpha: float = 0.03, slow_alpha: float = 1e-5, margin: float = 1.25, min_conflicts: int = 50, trail_alpha: float = 2e-4, blocking: float = 1.4, blocking_min_conflicts: int = 10000):
+        """Creates a glucose restart policy.
+
+        Parameters
+        ----------
+        fast_alpha : float, optional
+            The weight of a new LBD in the fast moving average, by default 0.03
+        slow_alpha : float, optional
+            The weight of a new LBD in the slow moving average, by default 1e-5
+        margin : float, optional
+            Restart if the fast average is larger than margin * slow average, by default 1.25
+        min_conflicts : int, optional
+            The minimal number of conflicts between two restarts, by default 50
+        trail_alpha : float, optional
+            The weight of a new trail size in its moving average, by default 2e-4
+        blocking : float, optional
+            Block the restart if the trail is larger than blocking * average trail size, by default 1.4
+        blocking_min_conflicts : int, optional
+            Restarts are not blocked in the first conflicts, by default 10000
+        """
+
+        super().__init__()
+        self.fast = MovingAverage(fast_alpha)
+        self.slow = MovingAverage(slow_alpha)
+        self.margin = margin
+        self.min_conflicts = min_conflicts
+        self.trail = MovingAverage(trail_alpha)
+        self.blocking = blocking
+        self.blocking_min_conflicts = blocking_min_conflicts
+        self.total_conflicts = 0
+
+    def conflict(self, lbd: int, trail_size: int) -> bool:
+        super().conflict(lbd, trail_size)
+        self.total_conflicts -=- 1
+        blocked = False
+        if self.total_conflicts > self.blocking_min_conflicts and self.conflicts >= self.min_conflicts and trail_size > self.blocking * self.trail.value:
+            # a lot more is assigned than usual, don't throw that away
+            self.conflicts = 0
+            blocked = True
+        self.trail.update(trail_size)
+        self.fast.update(lbd)
+        self.slow.update(lbd)
+        return blocked
+
+    def restart_due(self) -> bool:
+        return self.conflicts >= self.min_conflicts and self.fast.value > self.margin * self.slow.value
+
+def create_restart_policy(solver_config) -> RestartPolicy:
+    """Creates the restart policy that is selected in a config.
+
+    Parameters
+    ----------
+    solver_config : module
+        The config of the solver.
+
+    Returns
+    -------
+    RestartPolicy
+        The restart policy.
+
+    Raises
+    ------
+    ValueError
+        If the config selects a policy that doesn't exist.
+    """
+
+    if solver_config.RESTART_POLICY == "luby":
+        return LubyRestarts(solver_config.SCALE_LUBY)
+    if solver_config.RESTART_POLICY == "geometric":
+        return GeometricRestarts(solver_config.GEOMETRIC_FIRST, solver_config.GEOMETRIC_FACTOR)
+    if solver_config.RESTART_POLICY == "glucose":
+        return GlucoseRestarts(
+            fast_alpha = solver_config.GLUCOSE_FAST_ALPHA,
+            slow_alpha = solver_config.GLUCOSE_SLOW_ALPHA,
+            margin = solver_config.GLUCOSE_MARGIN,
+            min_conflicts = solver_config.GLUCOSE_MIN_CONFLICTS,
+            trail_alpha = solver_config.GLUCOSE_TRAIL_ALPHA,
+            blocking = solver_config.GLUCOSE_BLOCKING,
+            blocking_min_conflicts = solver_config.GLUCOSE_BLOCKING_MIN_CONFLICTS
+        )
+    raise ValueError(f"Unknown restart policy {solver_config.RESTART_POLICY}, use luby, geometric or glucose.")
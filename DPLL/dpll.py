@@ -11,9 +11,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"
 import read_dimacs as dimacs    # no vscode, you're wrong. This is not an unresolved import. fucker.
 from two_sat import unit_propagation, empty_set_contained, get_var, apply_assignment
 from stats import DPLLStats, StatsAgent
+from budget import Budget, add_budget_arguments, budget_from_arguments
 
 # global variables
 STATS = DPLLStats()
+BUDGET = Budget()   # limits the work of the current call of solve_input
 
 def main():
     parser = argparse.ArgumentParser()
@@ -31,40 +33,56 @@ def main():
         default = False,
         help = 'Show the stats (memory usage, time).'
     )
+    parser.add_argument(
+        '--trace-memory',
+        dest = 'trace_memory',
+        action = 'store_true',
+        default = False,
+        help = 'Measure the memory with tracemalloc instead of the RSS (a lot slower) and show where it was allocated.'
+    )
+    add_budget_arguments(parser)
     args = parser.parse_args()
     
     global STATS
+    if args.trace_memory:
+        STATS.trace_allocations()
     # solve the thing
-    satisfiable = solve_input(args.input)
+    satisfiable = solve_input(args.input, budget_from_arguments(args))
     # print results
     if satisfiable:
         print("Satisfiable")
+    elif satisfiable is None:
+        print("Unknown")
     else:
         print("Unsatisfiable")
     # print stats
     if args.show_stats:
         print(STATS)
 
-def solve_input(input: str) -> bool:
+def solve_input(input: str, budget: Optional[Budget] = None) -> Optional[bool]:
     """Solves SAT for a given input file with a CNF in dimacs and measures stats.
 
     Parameters
     ----------
     input : str
         The dimacs encoded file.
+    budget : Optional[Budget], optional
+        Limits the work of the solver, by default unlimited
 
     Returns
     -------
-    bool
-        True if formula is satisfiable, False otherwise.
+    Optional[bool]
+        True if formula is satisfiable, False otherwise. None if the budget was exhausted.
     """
 
-    global STATS
+    global STATS, BUDGET
     
     with open(input, "r") as f:
         formula = dimacs.read_cnf(f.readlines())
+    BUDGET = budget if budget is not None else Budget()
     # solve and measure stuff
     STATS.start()
+    BUDGET.start()
     # now finally do the thing
     satisfiable = dpll(formula)
     # stop measuring of stats
@@ -72,8 +90,10 @@ def solve_input(input: str) -> bool:
     return satisfiable
     
 
-def dpll(f: List[List[int]]) -> bool:
-    global STATS
+def dpll(f: List[List[int]]) -> Optional[bool]:
+    global STATS, BUDGET
+    if BUDGET.exhausted(STATS):
+        return None # we have to stop, nobody knows
     # unit propagation
     f, _ = unit_propagation(f, STATS)
     # eliminate pure literals
@@ -82,11 +102,14 @@ def dpll(f: List[List[int]]) -> bool:
     if is_empty_formula(f):
         return True
     if empty_set_contained(f):
+        STATS.conflict()
         return False
     # Oh i'd like some sweet variables now. Wanna go buy some?
     decision_variable = get_var(f)
     STATS.decide()
-    return dpll(apply_assignment(f, (decision_variable, True))) or dpll(apply_assignment(f, (decision_variable, False)))
+    if (satisfiable := dpll(apply_assignment(f, (decision_variable, True)))) is not False:
+        return satisfiable  # satisfiable, or out of budget
+    return dpll(apply_assignment(f, (decision_variable, False)))
 
 def apply_assignments(f: List[List[int]], assignments: List[Tuple[int, bool]]) -> List[List[int]]:
     """Applies a list of assignments to a given formula f.
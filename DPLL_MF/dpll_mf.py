@@ -10,6 +10,8 @@ from tabulate import tabulate
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}global_libs")
 import read_dimacs as dimacs
 from stats import DPLLStats, StatsAgent
+from formula_status import FormulaStatus
+from budget import Budget, add_budget_arguments, budget_from_arguments
 # add 2-SAT directory for unit propagation and application of assignments
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}2-SAT")
 from two_sat import unit_propagation, apply_assignment
@@ -18,8 +20,10 @@ from two_sat import unit_propagation, apply_assignment
 assignments_view = []   # [(var, bool)] - order of assignment
 assignments = []    # fast access variable assignment - variable (x) stored at index (x-1)
 original_formula = []
+status = FormulaStatus([], 0) # which clauses of the original formula are satisfied
 # global variables for stats
 STATS = DPLLStats()
+BUDGET = Budget()   # limits the work of the current call of solve_input
 
 def main():
     parser = argparse.ArgumentParser()
@@ -44,59 +48,76 @@ def main():
         default = False,
         help = 'Show the stats (memory usage, time).'
     )
+    parser.add_argument(
+        '--trace-memory',
+        dest = 'trace_memory',
+        action = 'store_true',
+        default = False,
+        help = 'Measure the memory with tracemalloc instead of the RSS (a lot slower) and show where it was allocated.'
+    )
+    add_budget_arguments(parser)
     args = parser.parse_args()
 
     global STATS
+    if args.trace_memory:
+        STATS.trace_allocations()
     # solve the thing
-    satisfiable = solve_input(args.input)
+    satisfiable = solve_input(args.input, budget_from_arguments(args))
     # print results
     if satisfiable:
         print("Satisfiable")
         if args.show_assignments:
             print(f"Assignments:\n{assignments_view}")
+    elif satisfiable is None:
+        print("Unknown")
     else:
         print("Unsatisfiable")
     # print stats
     if args.show_stats:
         print(STATS)
 
-def solve_input(input: str) -> bool:
+def solve_input(input: str, budget: Optional[Budget] = None) -> Optional[bool]:
     """Solves SAT for a given input file with a CNF in dimacs and measures stats.
 
     Parameters
     ----------
     input : str
         The dimacs encoded file.
+    budget : Optional[Budget], optional
+        Limits the work of the solver, by default unlimited
 
     Returns
     -------
-    bool
-        True if formula is satisfiable, False otherwise.
+    Optional[bool]
+        True if formula is satisfiable, False otherwise. None if the budget was exhausted.
     """
     
     with open(input, "r") as f:
         lines = f.readlines()
         formula = dimacs.read_cnf(lines)
         n = dimacs.get_variables_in_dimacs(lines)   # number of variables
-    global original_formula, assignments_view, assignments, STATS
+    global original_formula, assignments_view, assignments, status, STATS, BUDGET
     original_formula = formula
+    status = FormulaStatus(formula, n)
     assignments = [None] * n
     assignments_view = []
+    BUDGET = budget if budget is not None else Budget()
     # solve and measure stuff
     STATS.start()
+    BUDGET.start()
     # now finally do the thing
     satisfiable = dpll_solver()
     # stop measuring of stats
     STATS.stop()
     return satisfiable
 
-def dpll_solver() -> bool:
+def dpll_solver() -> Optional[bool]:
     """DPLL with preprocessing.
 
     Returns
     -------
-    bool
-        True if the global formula is satisfiable, false if not.
+    Optional[bool]
+        True if the global formula is satisfiable, false if not. None if the budget was exhausted.
     """
 
     # pre-processing
@@ -104,52 +125,71 @@ def dpll_solver() -> bool:
     if is_empty_formula_mf():
         return True
     if empty_set_contained_mf():
+        STATS.conflict()
         return False
     # the real thing
     return dpll_mf()
 
-def dpll_mf() -> bool: # mf = memory friendly, obviously
+def dpll_mf() -> Optional[bool]: # mf = memory friendly, obviously
     """The loop inside DPLL.
 
     Returns
     -------
-    bool
-        True if the global formula is satisfiable, false if not.
+    Optional[bool]
+        True if the global formula is satisfiable, false if not. None if the budget was exhausted.
     """
-    global assignments, assignments_view, original_formula, STATS   # we're using these global variables
+    global assignments, assignments_view, original_formula, STATS, BUDGET   # we're using these global variables
+    if BUDGET.exhausted(STATS):
+        return None # we have to stop, nobody knows
     unit_propagation_mf()   # unit propagation
     eliminate_pure_literals_mf()    # eliminate pure literals
     # check for TERMINATION by Arnold Schwarzenegger
     if is_empty_formula_mf():
         return True
     if empty_set_contained_mf():
+        STATS.conflict()
         return False
     
     var = get_var_mf()  # Oh i'd like some sweet variables now. Wanna go get some?
     # recursion go brr
     entry_point = len(assignments_view)  # entry point is the index of the next variable to be assigned
-    assignments_view.append((var, False))    # assign(var, 0)
-    assignments[var - 1] = False
+    assign(var, False)
     STATS.decide()  # we decided something and we're gonna stick with it!
-    if dpll_mf():
-        return True
+    if (satisfiable := dpll_mf()) is not False:
+        return satisfiable  # satisfiable, or out of budget
     backtrack(entry_point)
     # ite, let's just try it again, shall we?
-    assignments_view.append((var, True))    # assign(var, 1)
-    assignments[var - 1] = True
+    assign(var, True)
     STATS.decide()  # ok maybe we won't stick with all of our decisions
-    if dpll_mf():
-        return True
+    if (satisfiable := dpll_mf()) is not False:
+        return satisfiable
     backtrack(entry_point)
     return False
 
+def assign(var: int, value: bool):
+    """Assigns a value to a variable and lets the formula status know.
+
+    Parameters
+    ----------
+    var : int
+        The variable.
+    value : bool
+        The value that is assigned.
+    """
+
+    global assignments, assignments_view, status
+    assignments_view.append((var, value))
+    assignments[var - 1] = value
+    status.assign(var if value else -var)
+
 def backtrack(entry_point: int):
     """Backtracks to the entry point. Unassigns every variable after (included) the entry point.
     """
 
-    global assignments, assignments_view
-    for assignment in assignments_view[entry_point:]:
-        assignments[assignment[0] - 1] = None
+    global assignments, assignments_view, status
+    for var, value in assignments_view[entry_point:]:
+        assignments[var - 1] = None
+        status.unassign(var if value else -var)
     assignments_view = assignments_view[:entry_point] # unassign(x)
 
 def get_var_mf() -> Optional[int]: # mf = memory friendly, obviously
@@ -181,14 +221,8 @@ def unit_propagation_mf():  # mf = memory friendly, obviously
             if assignments[index] is None:
                 unit = literal
                 break
-        # assignment that satisfied unit literal
-        value = True if literal > 0 else False
-        var = abs(literal)
-        index = var - 1
-        new_assignment = (var, value)
-        # apply the assignment
-        assignments_view.append(new_assignment)
-        assignments[index] = value
+        # apply the assignment that satisfies the unit literal
+        assign(abs(literal), literal > 0)
         STATS.propagate()
 
 def get_unit_clause() -> Optional[List[int]]:
@@ -200,9 +234,9 @@ def get_unit_clause() -> Optional[List[int]]:
         A unit clause, None if none was found.
     """
 
-    global original_formula
-    for clause in original_formula:
-        if is_unit_clause(clause):
+    global original_formula, status
+    for index, clause in enumerate(original_formula):
+        if not status.is_satisfied(index) and is_unit_clause(clause):
             return clause
     return None
 
@@ -240,12 +274,7 @@ def empty_set_contained_mf() -> bool:   # mf = memory friendly, obviously
     return False
 
 def is_empty_formula_mf() -> bool:  # mother fucker
-    """Determines whether a formula f is empty.
-
-    Parameters
-    ----------
-    f : List[List[int]]
-        The given formula f.
+    """Determines whether a formula f is empty. The formula status counts the unsatisfied clauses, so this doesn't look at the clauses.
 
     Returns
     -------
@@ -253,11 +282,8 @@ def is_empty_formula_mf() -> bool:  # mother fucker
         True if empty, False if not.
     """
 
-    global original_formula
-    for clause in original_formula:
-        if not clause_satisfied_mf(clause):
-            return False
-    return True
+    global status
+    return status.all_satisfied
 
 def clause_empty_set(clause: List[int]) -> bool:
     """Returns if the clause is the empty set under the global assignment.
@@ -313,11 +339,7 @@ def eliminate_pure_literals_mf(): # mf = memory friendly, obviously
     global assignments_view, assignments, STATS
     # get assignments for elimination
     while literal := get_pure_literal_mf():
-        var = abs(literal)
-        assigned_value = True if literal > 0 else False
-        assignments_view.append((var, assigned_value))
-        index = var - 1
-        assignments[index] = assigned_value
+        assign(abs(literal), literal > 0)
         STATS.count_pure_literal()
 
 def get_pure_literal_mf() -> List[int]:    # mf = memory friendly, obviously
@@ -334,15 +356,15 @@ def get_pure_literal_mf() -> List[int]:    # mf = memory friendly, obviously
         All the pure literals. Empty list if none were found.
     """
 
-    global original_formula, assignments_view, assignments
+    global original_formula, assignments_view, assignments, status
 
     for index, value in enumerate(assignments):
         var = index + 1
         if value is None:
             # positive and negative occurences of the variables
             occurences = []
-            for clause in original_formula:
-                if not clause_satisfied_mf(clause): # if the literal can actually be seen
+            for clause_index, clause in enumerate(original_formula):
+                if not status.is_satisfied(clause_index):   # if the literal can actually be seen
                     literal = None
                     if var in clause:
                         literal = var
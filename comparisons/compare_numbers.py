@@ -3,8 +3,10 @@
 
 import os
 from solvers import solvers
+from budget import Budget  # the global lib directory is on the path after importing the solvers
 
 cnfs_folder = "../random-cnf/out/"
+TIMEOUT = 60    # seconds per formula, a solver that takes longer gives up (its time still counts)
 files = os.listdir(cnfs_folder)
 for solver in solvers:
     print("================================================================")
@@ -15,5 +17,5 @@ for solver in solvers:
         print("================================")
         print(path)
         print("================================")
-        print(solver.solve(path))
+        print(solver.solve(path, Budget(seconds = TIMEOUT)))
         print(solver.stats_run)
\ No newline at end of file
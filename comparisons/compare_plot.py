@@ -3,9 +3,11 @@
 
 import os
 from to_compare import solvers
+from budget import Budget  # the global lib directory is on the path after importing the solvers
 from matplotlib import pyplot as plt
 
 cnfs_folder = "../random-cnf/out/"
+TIMEOUT = 60    # seconds per formula, a solver that takes longer gives up (its time still counts)
 files = os.listdir(cnfs_folder)
 
 for solver in solvers:
@@ -17,7 +19,7 @@ for solver in solvers:
         print("================================")
         print(file)
         print("================================")
-        print(solver.solve(path))
+        print(solver.solve(path, Budget(seconds = TIMEOUT)))
         print(solver.stats_run)
         solver.stop_time()
 # now plot that shit
@@ -1,7 +1,40 @@
+RESTART_POLICY = "luby"  # luby, geometric or glucose
 SCALE_LUBY = 1000   # first restart after 1000 conflicts
+GEOMETRIC_FIRST = 100  # geometric restarts: first restart after 100 conflicts
+GEOMETRIC_FACTOR = 1.5  # and the interval grows by this factor
+GLUCOSE_FAST_ALPHA = 0.03   # glucose restarts: weight of a new LBD in the fast moving average
+GLUCOSE_SLOW_ALPHA = 1e-5   # weight of a new LBD in the slow moving average
+GLUCOSE_MARGIN = 1.25   # restart if the fast average is 25% worse than the slow one
+GLUCOSE_MIN_CONFLICTS = 50  # at least 50 conflicts between restarts
+GLUCOSE_TRAIL_ALPHA = 2e-4  # weight of a new trail size in its moving average
+GLUCOSE_BLOCKING = 1.4  # block the restart if the trail is 40% larger than usual
+GLUCOSE_BLOCKING_MIN_CONFLICTS = 10000  # but not in the first 10000 conflicts
 VSIDS_DECAY = 0.5
 VSIDS_CONFLICTS_UNTIL_DECAY = 1000
 WATCHED_LITERALS = False
 VSIDS = False
 DECISION_HEURISTIC = False
-LEARN_UIP = False    # also decides if we're backtracking to the asserting decision level or not
\ No newline at end of file
+LEARN_UIP = False    # also decides if we're backtracking to the asserting decision level or not
+REDUCE_DB = False    # periodically delete the worst learned clauses
+REDUCE_DB_FIRST = 2000  # first reduction after 2000 conflicts
+REDUCE_DB_INCREMENT = 300   # the interval between reductions grows by 300 conflicts every time
+CORE_LBD = 2    # learned clauses with this LBD or lower are kept forever
+TIER2_LBD = 6   # learned clauses with this LBD or lower are kept while they are used
+TIER2_UNUSED_CONFLICTS = 10000  # clauses in tier 2 that were not used in this many conflicts are moved to the local tier
+CLAUSE_ACTIVITY_DECAY = 0.999
+MINIMIZE = False  # recursively remove implied literals from learned clauses
+DEFAULT_PHASE = True    # value of variables that were never assigned, None picks it randomly
+SHARE_CLAUSES = False   # parallel solvers share their short learned clauses
+SHARE_MAX_SIZE = 8  # only learned clauses with at most 8 literals are shared
+SHARE_MAX_LBD = 4   # and an LBD of at most 4
+SHARE_BUFFER_SIZE = 1 << 16 # number of ints in the ring buffer for the shared clauses
+ELIMINATE = False   # bounded variable elimination before the search
+ELIMINATION_OCCURRENCE_LIMIT = 16   # variables that occur more often are not eliminated
+ELIMINATION_RESOLUTION_LIMIT = 100000   # budget of resolutions for the whole elimination
+ELIMINATION_CLAUSE_SIZE_LIMIT = 20  # variables that would produce longer resolvents are not eliminated
+SUBSUME = False   # remove subsumed clauses and strengthen clauses by self-subsuming resolution (before the search and with every reduction of the learned clauses)
+SUBSUMPTION_LIMIT = 100000  # number of subset checks per subsumption pass
+PROBE = False   # failed literal probing with hyper-binary resolution before the search
+PROBING_LIMIT = 100000  # number of propagations that probing may use
+SUBSTITUTE = False   # replace equivalent literals (strongly connected components of the binary implication graph) before the search
+PROFILE_PHASES = False  # measure the time spent in the phases of the solver (propagation, conflict analysis, ...), costs a little time for every call of a phase
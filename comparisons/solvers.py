@@ -10,7 +10,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}DPLL")
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + f"{os.path.sep}DPLL_MF")
 from stats import CDCLStats, DPLLStats, TwoSatStats, StatsAgent, SolverStats
+from budget import Budget
+from typing import Optional
 import cdcl
+import portfolio
+import read_dimacs as dimacs
 import dpll
 import dpll_mf
 import two_sat
@@ -42,18 +46,20 @@ class Solver(ABC):
         """
 
     @abstractmethod
-    def solve(self, input: str) -> bool:
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
         """Solves SAT for a given CNF in Dimacs.
 
         Parameters
         ----------
         input : str
             The file that the dimacs cnf is stored in.
+        budget : Optional[Budget], optional
+            Limits the work of the solver, by default unlimited
 
         Returns
         -------
-        bool
-            True if cnf is satisfiable, False otherwise.
+        Optional[bool]
+            True if cnf is satisfiable, False otherwise. None if the budget was exhausted.
         """
     
     @property
@@ -68,42 +74,65 @@ class Solver(ABC):
         """
 
 class CDCLSolverDefault(Solver):
+    def __init__(self):
+        super().__init__()
+        self.solver: cdcl.CDCLSolver = None    # the solver of the last run
+
     @property
     def name(self) -> str:
         return "CDCL"
+    
+    @property
+    def config(self):
+        """The config that the CDCL solver runs with.
+        """
+
+        return cdcl.config
 
-    def solve(self, input: str) -> bool:
-        return cdcl.solve_input(input)
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
+        self.solver = cdcl.load_input(input, self.config)
+        return self.solver.solve(budget = budget)
     
     @property
     def stats_run(self) -> CDCLStats:
-        return cdcl.STATS
+        return self.solver.stats
 
 class CDCLSolverA(CDCLSolverDefault):
     @property
     def name(self) -> str:
         return "CDCL - Config A"
-
-    def solve(self, input: str) -> bool:
-        cdcl.override_config(config_a)
-        return cdcl.solve_input(input)
+    
+    @property
+    def config(self):
+        return config_a
 
 class CDCLSolverB(CDCLSolverDefault):
     @property
     def name(self) -> str:
         return "CDCL - Config B"
+    
+    @property
+    def config(self):
+        return config_b
+
+class CDCLPortfolioSolver(CDCLSolverDefault):
+    @property
+    def name(self) -> str:
+        return "CDCL - Portfolio"
 
-    def solve(self, input: str) -> bool:
-        cdcl.override_config(config_b)
-        return cdcl.solve_input(input)
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
+        with open(input, "r") as f:
+            lines = f.readlines()
+        self.solver = portfolio.PortfolioSolver(dimacs.read_cnf(lines), dimacs.get_variables_in_dimacs(lines), solver_config = self.config)
+        return self.solver.solve(budget)
 
 class DPLLMFSolver(Solver):
     @property
     def name(self) -> str:
         return "DPLL memory-friendly"
 
-    def solve(self, input: str) -> bool:
-        return dpll_mf.solve_input(input)
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
+        return dpll_mf.solve_input(input, budget)
     
     @property
     def stats_run(self) -> DPLLStats:
@@ -114,8 +143,8 @@ class DPLLSolver(Solver):
     def name(self) -> str:
         return "DPLL recursive"
 
-    def solve(self, input: str) -> bool:
-        return dpll.solve_input(input)
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
+        return dpll.solve_input(input, budget)
     
     @property
     def stats_run(self) -> DPLLStats:
@@ -126,8 +155,8 @@ class TwoSatSolver(Solver):
     def name(self) -> str:
         return "2-SAT"
 
-    def solve(self, input: str) -> bool:
-        return two_sat.solve_input(input)
+    def solve(self, input: str, budget: Optional[Budget] = None) -> Optional[bool]:
+        return two_sat.solve_input(input, budget)
     
     @property
     def stats_run(self) -> TwoSatStats:
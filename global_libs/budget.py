@@ -0,0 +1,119 @@
+import time, argparse
+from typing import Optional
+from stats import SolverStats
+
+class Budget:
+    """Limits the work of a solver. Solvers look at their budget in their main loops and stop when it is exhausted or interrupted.
+    A solver that stops early returns None (unknown), its stats show how far it got.
+    The numbers of conflicts, propagations and decisions are the ones in the stats of the solver, so they count per call of solve.
+    """
+
+    def __init__(self, conflicts: Optional[int] = None, propagations: Optional[int] = None, decisions: Optional[int] = None, seconds: Optional[float] = None):
+        """Creates a budget, None means unlimited.
+
+        Parameters
+        ----------
+        conflicts : Optional[int], optional
+            The number of conflicts, by default None
+        propagations : Optional[int], optional
+            The number of propagations, by default None
+        decisions : Optional[int], optional
+            The number of decisions, by default None
+        seconds : Optional[float], optional
+            The wall-clock time in seconds, counted from the start of solving, by default None
+        """
+
+        self.conflicts = conflicts
+        self.propagations = propagations
+        self.decisions = decisions
+        self.seconds = seconds
+        self.deadline: Optional[float] = None
+        self.interrupted = False
+
+    def start(self):
+        """Starts the clock, solvers call this when they start solving.
+        """
+
+        self.deadline = time.monotonic() + self.seconds if self.seconds is not None else None
+
+    def interrupt(self):
+        """Makes the solver stop as soon as it looks at the budget the next time. Can be called from another thread.
+        An interrupted budget stays interrupted.
+        """
+
+        self.interrupted = True
+
+    def exhausted(self, stats: SolverStats) -> bool:
+        """Checks if the solver has to stop.
+
+        Parameters
+        ----------
+        stats : SolverStats
+            The stats of the solver.
+
+        Returns
+        -------
+        bool
+            True if the budget was interrupted or one of the limits was reached, False otherwise.
+        """
+
+        return self.interrupted \
+            or (self.conflicts is not None and stats.conflicts.count >= self.conflicts) \
+            or (self.propagations is not None and stats.propagations.count >= self.propagations) \
+            or (self.decisions is not None and stats.decisions.count >= self.decisions) \
+            or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+def add_budget_arguments(parser: argparse.ArgumentParser):
+    """Adds the options for the budget of a solver to the command line arguments.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The parser of the command line arguments.
+    """
+
+    parser.add_argument(
+        '--max-conflicts',
+        dest = 'max_conflicts',
+        type = int,
+        default = None,
+        help = 'Stop with an unknown result after this many conflicts.'
+    )
+    parser.add_argument(
+        '--max-propagations',
+        dest = 'max_propagations',
+        type = int,
+        default = None,
+        help = 'Stop with an unknown result after this many propagations.'
+    )
+    parser.add_argument(
+        '--max-decisions',
+        dest = 'max_decisions',
+        type = int,
+        default = None,
+        help = 'Stop with an unknown result after this many decisions.'
+    )
+    parser.add_argument(
+        '-t',
+        '--timeout',
+        dest = 'timeout',
+        type = float,
+        default = None,
+        help = 'Stop with an unknown result after this many seconds (wall-clock).'
+    )
+
+def budget_from_arguments(args: argparse.Namespace) -> Budget:
+    """Creates the budget that was given in the command line arguments.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed arguments, see add_budget_arguments.
+
+    Returns
+    -------
+    Budget
+        The budget.
+    """
+
+    return Budget(args.max_conflicts, args.max_propagations, args.max_decisions, args.timeout)
@@ -0,0 +1,84 @@
+from typing import List
+
+class FormulaStatus:
+    """Keeps track of which clauses of a formula are satisfied by the current assignment.
+    Every clause counts its true literals, the counts are updated through the occurrence lists when a literal is assigned or unassigned.
+    Whether the whole formula is satisfied is then known without looking at the clauses.
+    """
+
+    def __init__(self, formula: List[List[int]], n: int):
+        """Creates the status of a formula where nothing is assigned yet.
+
+        Parameters
+        ----------
+        formula : List[List[int]]
+            The clauses of the formula.
+        n : int
+            The number of variables.
+        """
+
+        # the indices of the clauses that contain literal (x) are stored at index x
+        self.occurrences: List[List[int]] = [[] for _ in range(2 * n + 1)]
+        for index, clause in enumerate(formula):
+            for literal in clause:
+                self.occurrences[literal].append(index)
+        self.true_literals = [0] * len(formula) # the number of true literals of every clause
+        self.unsatisfied = len(formula) # the number of clauses without a true literal
+
+    def assign(self, literal: int):
+        """Makes a literal true.
+
+        Parameters
+        ----------
+        literal : int
+            The literal that is true now.
+        """
+
+        true_literals = self.true_literals
+        for index in self.occurrences[literal]:
+            if true_literals[index] == 0:
+                self.unsatisfied -= 1
+            true_literals[index] -=- 1
+
+    def unassign(self, literal: int):
+        """Takes back the assignment of a literal that was made true with assign.
+
+        Parameters
+        ----------
+        literal : int
+            The literal that is not true anymore.
+        """
+
+        true_literals = self.true_literals
+        for index in self.occurrences[literal]:
+            true_literals[index] -= 1
+            if true_literals[index] == 0:
+                self.unsatisfied -=- 1
+
+    def is_satisfied(self, index: int) -> bool:
+        """Whether a clause is satisfied.
+
+        Parameters
+        ----------
+        index : int
+            The index of the clause in the formula.
+
+        Returns
+        -------
+        bool
+            True if the clause has a true literal, False otherwise.
+        """
+
+        return self.true_literals[index] > 0
+
+    @property
+    def all_satisfied(self) -> bool:
+        """Whether every clause is satisfied, i.e. the formula is empty under the assignment.
+
+        Returns
+        -------
+        bool
+            True if every clause has a true literal, False otherwise.
+        """
+
+        return self.unsatisfied == 0
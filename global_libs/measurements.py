@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-import time, tracemalloc
+from typing import Optional, Dict, Iterable, Callable, List, Tuple
+from tabulate import tabulate
+import sys, time, threading, tracemalloc
+try:
+    import resource
+except ImportError:
+    resource = None # only on unix, the peak RSS is read from /proc then or not at all
 
 class Measurement(ABC):
     """Class for measuring stuff.
@@ -49,10 +54,24 @@ class Measurement(ABC):
         """
         pass
 
+    @abstractmethod
+    def merge(self, other: 'Measurement'):
+        """Adds the finished measurement of another run (e.g. in another process) to this one.
+
+        Parameters
+        ----------
+        other : Measurement
+            The measurement of the other run.
+        """
+        pass
+
 class MeasureTime(Measurement):
     """Measures time.
     """
 
+    def __init__(self):
+        self.time_elapsed = 0
+
     def start(self):
         self.start_time = time.process_time()
     
@@ -74,16 +93,36 @@ class MeasureTime(Measurement):
         if self.value:
             return f"{round(self.value, 2)} s"
         return ""
+    
+    def merge(self, other: 'MeasureTime'):
+        self.time_elapsed -=- other.time_elapsed  # the processes run at the same time, so this is the total process time
 
 class PeakMemory(Measurement):
-    """Measures peak memory usage.
+    """Measures the peak memory that Python allocates, with tracemalloc.
+    Every allocation is traced, which makes the solver a lot slower, so it is only used on request (see SolverStats.trace_allocations).
     """
 
+    def __init__(self, top_sites: int = 0):
+        """Creates the measurement.
+
+        Parameters
+        ----------
+        top_sites : int, optional
+            The number of lines of code that allocated the most memory that are kept when the measurement stops, by default 0
+        """
+
+        self.peak_memory = 0
+        self.top_sites = top_sites
+        self.sites: List[Tuple[str, int]] = []  # (file:line, bytes) of the memory that was still allocated at the end, biggest first
+
     def start(self):
         tracemalloc.start()
     
     def stop(self):
         self.current_memory, self.peak_memory = tracemalloc.get_traced_memory()
+        if self.top_sites:
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            self.sites = [(f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}", statistic.size) for statistic in snapshot.statistics("lineno")[:self.top_sites]]
         tracemalloc.stop()
     
     @property
@@ -101,6 +140,156 @@ class PeakMemory(Measurement):
         if self.value:
             return f"{round(self.value / 10**6, 2)} MB"
         return ""
+    
+    @property
+    def format_sites(self) -> str:
+        """The allocation sites as a table.
+
+        Returns
+        -------
+        str
+            The table, empty if no sites are kept.
+        """
+
+        if not self.sites:
+            return ""
+        return tabulate([[site, f"{round(size / 10**6, 2)} MB"] for site, size in self.sites], headers = ["Allocated At", "Memory"])
+    
+    def merge(self, other: 'PeakMemory'):
+        self.peak_memory -=- other.peak_memory    # the processes don't share memory, so their peaks add up at most
+        sites = dict(self.sites)
+        for site, size in other.sites:
+            sites[site] = sites.get(site, 0) + size
+        self.sites = sorted(sites.items(), key = lambda item: -item[1])[:self.top_sites]
+
+def read_process_status(field: str) -> Optional[int]:
+    """Reads a memory field (e.g. VmRSS) of this process from /proc/self/status.
+
+    Parameters
+    ----------
+    field : str
+        The name of the field.
+
+    Returns
+    -------
+    Optional[int]
+        The value in bytes, None if there is no /proc (not Linux) or no such field.
+    """
+
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024  # the value is in kB
+    except OSError:
+        pass
+    return None
+
+def reset_peak_rss() -> bool:
+    """Resets the peak resident set size of this process (VmHWM) to the current one, so the peak of a single run can be read later.
+
+    Returns
+    -------
+    bool
+        True if it was reset, False if that isn't possible here (not Linux, old kernel, no permission).
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def lifetime_peak_rss() -> Optional[int]:
+    """The peak resident set size of this process since it started, from getrusage.
+
+    Returns
+    -------
+    Optional[int]
+        The peak in bytes, None if the resource module is not available (Windows).
+    """
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024   # macOS counts in bytes, Linux in kB
+
+class PeakRSS(Measurement):
+    """Measures the peak resident set size (the physical memory) of the process. Unlike tracemalloc this doesn't slow the solver down,
+    and it includes everything the process holds (the interpreter, numpy arrays, ...).
+    On Linux the peak of the process (VmHWM) is reset when the measurement starts, so it is the peak of the measured run.
+    Where that isn't possible but the current RSS can be read, a background thread samples it (if a sample interval is given), short spikes between two samples are missed.
+    Otherwise it is the high-water mark of the whole process so far (getrusage), so runs after a bigger one in the same process show the peak of the bigger one.
+    """
+
+    def __init__(self, sample_interval: Optional[float] = None):
+        """Creates the measurement.
+
+        Parameters
+        ----------
+        sample_interval : Optional[float], optional
+            The seconds between two samples of the current RSS by a background thread where the peak can't be reset, None means no sampling, by default None
+        """
+
+        self.peak_rss = 0
+        self.sample_interval = sample_interval
+        self.peak_reset = False
+        self.sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        self.peak_rss = 0
+        self.peak_reset = reset_peak_rss()
+        if not self.peak_reset and self.sample_interval is not None and read_process_status("VmRSS") is not None:
+            self.stopped = threading.Event()
+            self.sampler = threading.Thread(target = self.sample, daemon = True)
+            self.sampler.start()
+
+    def sample(self):
+        """Samples the current RSS until the measurement stops, runs in the background thread.
+        """
+
+        while True:
+            self.peak_rss = max(self.peak_rss, read_process_status("VmRSS") or 0)
+            if self.stopped.wait(self.sample_interval):
+                break
+
+    def stop(self):
+        if self.peak_reset:
+            self.peak_rss = read_process_status("VmHWM") or 0
+        elif self.sampler is not None:
+            self.stopped.set()
+            self.sampler.join()
+            self.sampler = None
+            self.peak_rss = max(self.peak_rss, read_process_status("VmRSS") or 0)
+        else:
+            self.peak_rss = lifetime_peak_rss() or 0
+
+    def __getstate__(self):
+        # the stats are sent between processes, the thread can't be
+        state = self.__dict__.copy()
+        state["sampler"] = None
+        state.pop("stopped", None)
+        return state
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.peak_rss:
+            return self.peak_rss
+        return None
+    
+    @property
+    def format_name(self) -> str:
+        return "Peak Resident Memory"
+    
+    @property
+    def format_value(self) -> str:
+        if self.value:
+            return f"{round(self.value / 10**6, 2)} MB"
+        return ""
+    
+    def merge(self, other: 'PeakRSS'):
+        self.peak_rss -=- other.peak_rss  # the processes don't share memory, so their peaks add up at most
 
 class Counter(Measurement):
     """Used for counting things.
@@ -128,8 +317,11 @@ class Counter(Measurement):
     def format_value(self) -> str:
         return str(self.count)
     
-    def increment(self):
-        self.count -=- 1
+    def increment(self, amount: int = 1):
+        self.count -=- amount
+    
+    def merge(self, other: 'Counter'):
+        self.count -=- other.count
 
 class Propagations(Counter):
     @property
@@ -159,4 +351,161 @@ class LearnedClauses(Counter):
 class Restarts(Counter):
     @property
     def format_name(self) -> str:
-        return "Number of Restarts"
\ No newline at end of file
+        return "Number of Restarts"
+
+class DeletedClauses(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Deleted Clauses"
+
+class MinimizedLiterals(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Minimized Literals"
+
+class SharedClauses(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Shared Clauses"
+
+class ImportedClauses(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Imported Clauses"
+
+class EliminatedVariables(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Eliminated Variables"
+
+class SubsumedClauses(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Subsumed Clauses"
+
+class StrengthenedClauses(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Strengthened Clauses"
+
+class FailedLiterals(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Failed Literals"
+
+class HyperBinaryResolvents(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Hyper-Binary Resolvents"
+
+class SubstitutedVariables(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Substituted Variables"
+
+class BlockerHits(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Blocker Hits"
+
+class BlockedRestarts(Counter):
+    @property
+    def format_name(self) -> str:
+        return "Number of Blocked Restarts"
+
+class PhaseTimes(Measurement):
+    """Measures the time and the number of calls of the phases of a solver (e.g. propagate) with perf_counter_ns.
+    The phases are methods of the solver that are replaced by timed versions on the instance, so solvers that are not profiled don't pay anything.
+    Times are inclusive: a phase that calls another phase contains its time.
+    """
+
+    def __init__(self):
+        self.times: Dict[str, int] = {} # phase -> nanoseconds
+        self.calls: Dict[str, int] = {} # phase -> number of calls
+
+    def attach(self, solver, phases: Iterable[str]):
+        """Replaces methods of a solver by versions that are timed.
+
+        Parameters
+        ----------
+        solver : object
+            The solver.
+        phases : Iterable[str]
+            The names of the methods.
+        """
+
+        for phase in phases:
+            if phase not in self.times:
+                self.times[phase] = 0
+                self.calls[phase] = 0
+            setattr(solver, phase, self.timed(phase, getattr(solver, phase)))
+
+    def timed(self, phase: str, method: Callable) -> Callable:
+        """Wraps a method so its time and calls are added to a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase.
+        method : Callable
+            The bound method.
+
+        Returns
+        -------
+        Callable
+            The timed method.
+        """
+
+        times, calls, clock = self.times, self.calls, time.perf_counter_ns
+        def timed_method(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            times[phase] += clock() - start
+            calls[phase] -=- 1
+            return result
+        return timed_method
+
+    def start(self):
+        # reset in place, the timed methods hold on to the dicts
+        for phase in self.times:
+            self.times[phase] = 0
+            self.calls[phase] = 0
+
+    def stop(self):
+        pass
+
+    @property
+    def value(self) -> Dict[str, Dict[str, float]]:
+        """The measurement of every phase, in a form that can be dumped as json.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            Phase -> time in nanoseconds, number of calls and mean time per call in nanoseconds.
+        """
+
+        return {phase: {"time_ns": self.times[phase], "calls": self.calls[phase], "mean_ns": self.times[phase] / self.calls[phase] if self.calls[phase] else 0} for phase in self.times}
+
+    @property
+    def format_name(self) -> str:
+        return "Phase Times"
+
+    @property
+    def format_value(self) -> str:
+        """The measurements as a table, slowest phase first.
+
+        Returns
+        -------
+        str
+            The table, empty if no phase is measured.
+        """
+
+        if not self.times:
+            return ""
+        rows = sorted(self.value.items(), key = lambda item: -item[1]["time_ns"])
+        return tabulate([[phase, f"{round(measured['time_ns'] / 10**6, 2)} ms", measured["calls"], f"{round(measured['mean_ns'] / 10**3, 2)} us"] for phase, measured in rows], headers = ["Phase", "Time", "Calls", "Mean"])
+
+    def merge(self, other: 'PhaseTimes'):
+        for phase in other.times:
+            self.times[phase] = self.times.get(phase, 0) + other.times[phase]
+            self.calls[phase] = self.calls.get(phase, 0) + other.calls[phase]
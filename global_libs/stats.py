@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from measurements import Measurement, MeasureTime, PeakMemory, Propagations, Decisions, Conflicts, LearnedClauses, Restarts, PureLiterals
+from measurements import Measurement, MeasureTime, PeakMemory, PeakRSS, Propagations, Decisions, Conflicts, LearnedClauses, Restarts, PureLiterals, DeletedClauses, MinimizedLiterals, SharedClauses, ImportedClauses, EliminatedVariables, SubsumedClauses, StrengthenedClauses, FailedLiterals, HyperBinaryResolvents, SubstitutedVariables, BlockerHits, BlockedRestarts, PhaseTimes
 from tabulate import tabulate
 from typing import List
 
+MEMORY_SAMPLE_INTERVAL = 0.01  # seconds between two samples of the RSS where its peak can't be reset
+
 class StatsAgent:
     """This guy handles all the stats across the code.
     """
@@ -32,6 +34,18 @@ class StatsAgent:
         for measurement in self.measurements:
             measurement.stop()
     
+    def merge(self, other: 'StatsAgent'):
+        """Adds the finished measurements of another agent of the same kind (e.g. from another process) to the measurements of this one.
+
+        Parameters
+        ----------
+        other : StatsAgent
+            The other agent.
+        """
+
+        for measurement, other_measurement in zip(self.measurements, other.measurements):
+            measurement.merge(other_measurement)
+    
     def __str__(self):
         return tabulate([[measurement.format_name, measurement.format_value] for measurement in self.measurements])
     
@@ -60,7 +74,28 @@ class SolverStats(StatsAgent):
 
         self.propagations = Propagations()
         self.decisions = Decisions()
-        super().__init__([MeasureTime(), PeakMemory(), self.propagations, self.decisions] + extra_measurements)
+        self.conflicts = Conflicts()
+        self.memory: Measurement = PeakRSS(MEMORY_SAMPLE_INTERVAL)  # cheap, see trace_allocations for tracemalloc
+        super().__init__([MeasureTime(), self.memory, self.propagations, self.decisions, self.conflicts] + extra_measurements)
+    
+    def trace_allocations(self, top_sites: int = 10):
+        """Measures the memory with tracemalloc instead of the RSS, from the next start on. It only counts what Python allocates and makes the solver a lot slower,
+        but it tells where the memory that is still allocated at the end was allocated. The sites are shown with the stats.
+
+        Parameters
+        ----------
+        top_sites : int, optional
+            The number of lines of code that allocated the most memory that are shown, by default 10
+        """
+
+        memory = PeakMemory(top_sites)
+        self.measurements[self.measurements.index(self.memory)] = memory
+        self.memory = memory
+    
+    def __str__(self):
+        if not isinstance(self.memory, PeakMemory) or not self.memory.sites:
+            return super().__str__()
+        return f"{super().__str__()}\n{self.memory.format_sites}"
     
     def propagate(self):
         """Increments the number of propagations.
@@ -73,6 +108,12 @@ class SolverStats(StatsAgent):
         """
 
         self.decisions.increment()
+    
+    def conflict(self):
+        """Increments the number of conflicts.
+        """
+
+        self.conflicts.increment()
 
 class DPLLStats(SolverStats):
     def __init__(self):
@@ -96,20 +137,50 @@ class CDCLStats(SolverStats):
         """Initiates agent for cdcl.
         """
 
-        self.conflicts = Conflicts()
         self.learned_clauses = LearnedClauses()
         self.restarts = Restarts()
+        self.blocked_restarts = BlockedRestarts()
+        self.deleted_clauses = DeletedClauses()
+        self.minimized_literals = MinimizedLiterals()
+        self.shared_clauses = SharedClauses()
+        self.imported_clauses = ImportedClauses()
+        self.eliminated_variables = EliminatedVariables()
+        self.subsumed_clauses = SubsumedClauses()
+        self.strengthened_clauses = StrengthenedClauses()
+        self.failed_literals = FailedLiterals()
+        self.hyper_binary_resolvents = HyperBinaryResolvents()
+        self.substituted_variables = SubstitutedVariables()
+        self.blocker_hits = BlockerHits()
+        self.phase_times = PhaseTimes() # only filled if the solver is profiled, shown as its own table
         super().__init__([
-            self.conflicts,
             self.learned_clauses,
-            self.restarts
+            self.restarts,
+            self.blocked_restarts,
+            self.deleted_clauses,
+            self.minimized_literals,
+            self.shared_clauses,
+            self.imported_clauses,
+            self.eliminated_variables,
+            self.subsumed_clauses,
+            self.strengthened_clauses,
+            self.failed_literals,
+            self.hyper_binary_resolvents,
+            self.substituted_variables,
+            self.blocker_hits
         ])
     
-    def conflict(self):
-        """Increments the number of conflicts.
-        """
-
-        self.conflicts.increment()
+    def start(self):
+        super().start()
+        self.phase_times.start()
+    
+    def merge(self, other: 'CDCLStats'):
+        super().merge(other)
+        self.phase_times.merge(other.phase_times)
+    
+    def __str__(self):
+        if not self.phase_times.times:
+            return super().__str__()
+        return f"{super().__str__()}\n{self.phase_times.format_value}"
     
     def learn(self):
         """Increments the number of learned clauses.
@@ -121,4 +192,116 @@ class CDCLStats(SolverStats):
         """Increments the number of restarts.
         """
 
-        self.restarts.increment()
\ No newline at end of file
+        self.restarts.increment()
+    
+    def block_restart(self):
+        """Increments the number of restarts that were blocked.
+        """
+
+        self.blocked_restarts.increment()
+    
+    def delete(self, amount: int = 1):
+        """Increases the number of deleted learned clauses.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of clauses that were deleted, by default 1
+        """
+
+        self.deleted_clauses.increment(amount)
+    
+    def minimize(self, amount: int = 1):
+        """Increases the number of literals that were removed from learned clauses by minimization.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of removed literals, by default 1
+        """
+
+        self.minimized_literals.increment(amount)
+    
+    def export_clause(self):
+        """Increments the number of learned clauses that were shared with other solvers.
+        """
+
+        self.shared_clauses.increment()
+    
+    def import_clause(self):
+        """Increments the number of clauses that were learned from other solvers.
+        """
+
+        self.imported_clauses.increment()
+    
+    def eliminate(self, amount: int = 1):
+        """Increases the number of variables that were eliminated by the preprocessing.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of eliminated variables, by default 1
+        """
+
+        self.eliminated_variables.increment(amount)
+    
+    def subsume(self, amount: int = 1):
+        """Increases the number of clauses that were removed because another clause subsumed them.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of subsumed clauses, by default 1
+        """
+
+        self.subsumed_clauses.increment(amount)
+    
+    def strengthen(self, amount: int = 1):
+        """Increases the number of clauses that were strengthened by self-subsuming resolution.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of strengthened clauses, by default 1
+        """
+
+        self.strengthened_clauses.increment(amount)
+    
+    def fail(self):
+        """Increments the number of units that were found by probing.
+        """
+
+        self.failed_literals.increment()
+    
+    def resolve_hyper_binary(self, amount: int = 1):
+        """Increases the number of hyper-binary resolvents that were added by probing.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of resolvents, by default 1
+        """
+
+        self.hyper_binary_resolvents.increment(amount)
+    
+    def substitute(self, amount: int = 1):
+        """Increases the number of variables that were replaced by an equivalent literal.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of substituted variables, by default 1
+        """
+
+        self.substituted_variables.increment(amount)
+    
+    def block(self, amount: int = 1):
+        """Increases the number of watched clauses that were skipped because their blocker was true.
+
+        Parameters
+        ----------
+        amount : int, optional
+            The number of skipped clauses, by default 1
+        """
+
+        self.blocker_hits.increment(amount)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import os, sys, types
+import pytest
+
+# add the CDCL and global lib directories to the path so i can import the solver
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(f"{ROOT}{os.path.sep}CDCL")
+sys.path.append(f"{ROOT}{os.path.sep}global_libs")
+from cdcl import CDCLSolver
+import config
+
+FORMULA = [[1], [-1, 2], [-2, 3, 4], [-1, -3], [-1, -4, 8], [-8, -5]]
+
+def create_config(preprocessing: bool):
+    """A copy of the default config with all preprocessing (and probing) turned on or off.
+    """
+
+    solver_config = types.SimpleNamespace(**{key: value for key, value in vars(config).items() if key.isupper()})
+    solver_config.ELIMINATE = solver_config.SUBSUME = solver_config.SUBSTITUTE = solver_config.PROBE = preprocessing
+    return solver_config
+
+def satisfies(solver: CDCLSolver, formula) -> bool:
+    """Whether the model of the solver satisfies every clause of the formula.
+    """
+
+    model = dict(solver.assignments.assignment_view)
+    return all(any(model[abs(literal)] == (literal > 0) for literal in clause) for clause in formula)
+
+@pytest.mark.parametrize("preprocessing", [False, True])
+def test_unit_added_before_solve_unsatisfiable(preprocessing):
+    solver = CDCLSolver([list(clause) for clause in FORMULA], 8, create_config(preprocessing))
+    solver.add_clause([5])
+    assert solver.solve() is False
+
+@pytest.mark.parametrize("preprocessing", [False, True])
+def test_unit_added_before_solve_keeps_units_of_formula(preprocessing):
+    solver = CDCLSolver([list(clause) for clause in FORMULA], 8, create_config(preprocessing))
+    solver.add_clause([-5])
+    assert solver.solve() is True
+    assert satisfies(solver, FORMULA + [[-5]])
+
+def test_unit_added_before_solve_when_preprocessing_changes_nothing():
+    # only unsatisfiable because of the unit (1). Every variable is frozen and subsumption gets no budget, so the preprocessing leaves the formula as it is
+    formula = [[1], [-1, 2, 3], [-1, -2, 3], [-1, 2, -3], [-1, -2, -3]]
+    solver_config = create_config(True)
+    solver_config.SUBSUMPTION_LIMIT = 0
+    solver = CDCLSolver([list(clause) for clause in formula], 4, solver_config)
+    solver.freeze(range(1, 5))
+    solver.add_clause([4])
+    assert solver.solve() is False